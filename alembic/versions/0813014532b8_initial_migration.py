@@ -21,12 +21,148 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.create_table('destination',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('country', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('image_url', sa.String(length=255), nullable=True),
+    sa.Column('popularity_score', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_destination_country'), 'destination', ['country'], unique=False)
+    op.create_index(op.f('ix_destination_id'), 'destination', ['id'], unique=False)
+    op.create_index(op.f('ix_destination_name'), 'destination', ['name'], unique=False)
+    op.create_table('attraction',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('image_url', sa.String(length=255), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('price_range', sa.Integer(), nullable=False),
+    sa.Column('visit_duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('opening_hours', sa.JSON(), nullable=True),
+    sa.Column('is_must_visit', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['destination_id'], ['destination.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attraction_category'), 'attraction', ['category'], unique=False)
+    op.create_index(op.f('ix_attraction_id'), 'attraction', ['id'], unique=False)
+    op.create_index(op.f('ix_attraction_name'), 'attraction', ['name'], unique=False)
+    op.create_table('hotel',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('image_url', sa.String(length=255), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('price_per_night', sa.Float(), nullable=False),
+    sa.Column('amenities', sa.JSON(), nullable=True),
+    sa.Column('has_restaurant', sa.Boolean(), nullable=False),
+    sa.Column('has_pool', sa.Boolean(), nullable=False),
+    sa.Column('has_spa', sa.Boolean(), nullable=False),
+    sa.Column('has_gym', sa.Boolean(), nullable=False),
+    sa.Column('has_free_wifi', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['destination_id'], ['destination.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hotel_id'), 'hotel', ['id'], unique=False)
+    op.create_index(op.f('ix_hotel_name'), 'hotel', ['name'], unique=False)
+    op.create_table('itinerarytemplate',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('num_days', sa.SmallInteger(), nullable=False),
+    sa.Column('suggested_season', sa.String(length=50), nullable=True),
+    sa.Column('interests', sa.JSON(), nullable=True),
+    sa.Column('template_data', sa.JSON(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['destination_id'], ['destination.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_itinerarytemplate_id'), 'itinerarytemplate', ['id'], unique=False)
+    op.create_table('itinerary',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('hotel_id', sa.Integer(), nullable=True),
+    sa.Column('is_recommended', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['destination_id'], ['destination.id'], ),
+    sa.ForeignKeyConstraint(['hotel_id'], ['hotel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_itinerary_id'), 'itinerary', ['id'], unique=False)
+    op.create_index(op.f('ix_itinerary_user_id'), 'itinerary', ['user_id'], unique=False)
+    op.create_table('itineraryday',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('itinerary_id', sa.Integer(), nullable=False),
+    sa.Column('day_number', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('hotel_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['hotel_id'], ['hotel.id'], ),
+    sa.ForeignKeyConstraint(['itinerary_id'], ['itinerary.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_itineraryday_id'), 'itineraryday', ['id'], unique=False)
+    op.create_table('itineraryactivity',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('activity_type', sa.String(length=50), nullable=False),
+    sa.Column('attraction_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_location', sa.JSON(), nullable=True),
+    sa.Column('end_location', sa.JSON(), nullable=True),
+    sa.Column('travel_mode', sa.String(length=20), nullable=True),
+    sa.Column('travel_duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['attraction_id'], ['attraction.id'], ),
+    sa.ForeignKeyConstraint(['day_id'], ['itineraryday.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_itineraryactivity_id'), 'itineraryactivity', ['id'], unique=False)
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.drop_index(op.f('ix_itineraryactivity_id'), table_name='itineraryactivity')
+    op.drop_table('itineraryactivity')
+    op.drop_index(op.f('ix_itineraryday_id'), table_name='itineraryday')
+    op.drop_table('itineraryday')
+    op.drop_index(op.f('ix_itinerary_user_id'), table_name='itinerary')
+    op.drop_index(op.f('ix_itinerary_id'), table_name='itinerary')
+    op.drop_table('itinerary')
+    op.drop_index(op.f('ix_itinerarytemplate_id'), table_name='itinerarytemplate')
+    op.drop_table('itinerarytemplate')
+    op.drop_index(op.f('ix_hotel_name'), table_name='hotel')
+    op.drop_index(op.f('ix_hotel_id'), table_name='hotel')
+    op.drop_table('hotel')
+    op.drop_index(op.f('ix_attraction_name'), table_name='attraction')
+    op.drop_index(op.f('ix_attraction_id'), table_name='attraction')
+    op.drop_index(op.f('ix_attraction_category'), table_name='attraction')
+    op.drop_table('attraction')
+    op.drop_index(op.f('ix_destination_name'), table_name='destination')
+    op.drop_index(op.f('ix_destination_id'), table_name='destination')
+    op.drop_index(op.f('ix_destination_country'), table_name='destination')
+    op.drop_table('destination')
     # ### end Alembic commands ###
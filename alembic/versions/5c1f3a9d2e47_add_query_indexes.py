@@ -0,0 +1,69 @@
+"""Add composite indexes for service query shapes
+
+Revision ID: 5c1f3a9d2e47
+Revises: 0813014532b8
+Create Date: 2026-10-18 09:12:44.185302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f3a9d2e47'
+down_revision: Union[str, None] = '0813014532b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and building
+    # concurrently avoids locking catalog tables against writes on live databases.
+    with op.get_context().autocommit_block():
+        # get_top_attractions / get_attractions: destination filter, must-visit then rating order
+        op.create_index(
+            'ix_attraction_destination_must_visit_rating',
+            'attraction',
+            ['destination_id', sa.text('is_must_visit DESC'), sa.text('rating DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # get_hotels / get_hotels_near_point: destination filter, rating order
+        op.create_index(
+            'ix_hotel_destination_rating',
+            'hotel',
+            ['destination_id', 'rating'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # get_itinerary: days of an itinerary, activities of a day
+        op.create_index(
+            op.f('ix_itineraryday_itinerary_id'),
+            'itineraryday',
+            ['itinerary_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            op.f('ix_itineraryactivity_day_id'),
+            'itineraryactivity',
+            ['day_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_itineraryactivity_day_id'), table_name='itineraryactivity', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_itineraryday_itinerary_id'), table_name='itineraryday', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_hotel_destination_rating', table_name='hotel', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_attraction_destination_must_visit_rating', table_name='attraction', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""Add catalog version
+
+Revision ID: 8e2b6d41c7f3
+Revises: 5c1f3a9d2e47
+Create Date: 2026-10-19 10:04:12.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2b6d41c7f3'
+down_revision: Union[str, None] = '5c1f3a9d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    catalogversion = op.create_table('catalogversion',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # The single row every catalog write increases; see CatalogCache.version
+    op.bulk_insert(catalogversion, [{'id': 1, 'generation': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalogversion')
@@ -0,0 +1,69 @@
+"""Client-side cache of versioned tool results."""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CacheKey = Tuple[str, str]
+
+
+class ToolCache:
+    """
+    LRU cache of tool results with a TTL and their server version tokens.
+    
+    Entries younger than ``ttl_seconds`` are served without a round trip.
+    Older entries are kept until evicted and revalidated with their version
+    token, so the server only resends data that changed.
+    """
+    
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 256):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            ttl_seconds: Seconds an entry is served without revalidation
+            max_entries: Maximum number of entries before evicting the least recently used
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(tool: str, arguments: Dict) -> CacheKey:
+        """Build the cache key of a tool call."""
+        return tool, json.dumps(arguments, sort_keys=True, default=str)
+    
+    def get(self, key: CacheKey) -> Optional[Tuple[bool, str, Any]]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Key from ``key()``
+            
+        Returns:
+            (fresh, version, data), or None if nothing is cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        stored_at, version, data = entry
+        return time.monotonic() - stored_at < self.ttl_seconds, version, data
+    
+    def put(self, key: CacheKey, version: str, data: Any):
+        """Store or refresh a result, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic(), version, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,25 +2,43 @@
 
 import asyncio
 import json
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 import re
 from datetime import datetime, timedelta
 
 from app.client.mcp_client import TravelioMCPClient
 from app.client.gemini_client import GeminiClient
+from app.client.function_calling import function_declarations
+from app.client.response_cache import ResponseCache
 
 class TravelioChatbot:
     """Chatbot for Travelio travel planning."""
     
-    def __init__(self, mcp_base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        mcp_base_url: str = "http://localhost:8000",
+        response_cache: Optional[ResponseCache] = None,
+        mcp_client: Optional[TravelioMCPClient] = None,
+        llm_http_client: Optional[Any] = None,
+        function_calling: bool = False,
+        max_tool_calls: int = 8
+    ):
         """
         Initialize the chatbot.
         
         Args:
             mcp_base_url: Base URL of the MCP server
+            response_cache: Optional cache of Gemini replies, shareable between chatbots
+            mcp_client: Optional MCP client shared between chatbots; not closed by ``close``
+            llm_http_client: Optional httpx client for Gemini shared between chatbots
+            function_calling: Let Gemini call the MCP tools itself instead of
+                matching requests to tools with patterns
+            max_tool_calls: Tool calls Gemini may make per turn with function calling
         """
-        self.mcp_client = TravelioMCPClient(mcp_base_url)
-        self.claude_client = GeminiClient()
+        # Catalog lookups repeat across turns; cache them and revalidate by version
+        self._owns_mcp_client = mcp_client is None
+        self.mcp_client = mcp_client or TravelioMCPClient(mcp_base_url, cache_ttl_seconds=300)
+        self.claude_client = GeminiClient(response_cache=response_cache, http_client=llm_http_client)
         
         # State tracking
         self.current_destination = None
@@ -28,11 +46,49 @@ class TravelioChatbot:
         self.current_hotels = None
         self.current_itinerary = None
         
+        # Background fetch of the current destination's attractions and hotels
+        self._prefetch: Optional[asyncio.Task] = None
+        
+        self.function_calling = function_calling
+        self.max_tool_calls = max_tool_calls
+        self._functions: Optional[List[Dict]] = None
+    
     async def close(self):
-        """Close all clients."""
-        await self.mcp_client.close()
+        """Close all clients, except shared ones."""
+        self._cancel_prefetch()
+        if self._owns_mcp_client:
+            await self.mcp_client.close()
         await self.claude_client.close()
     
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the conversation state as JSON-serializable data.
+        
+        Returns:
+            Current destination, attractions, hotels, itinerary and Gemini history
+        """
+        return {
+            "destination": self.current_destination,
+            "attractions": self.current_attractions,
+            "hotels": self.current_hotels,
+            "itinerary": self.current_itinerary,
+            "history": self.claude_client.history.to_dict(),
+        }
+    
+    def load_dict(self, state: Dict[str, Any]):
+        """
+        Restore the conversation state saved by ``to_dict``.
+        
+        Args:
+            state: Saved conversation state
+        """
+        self._cancel_prefetch()
+        self.current_destination = state["destination"]
+        self.current_attractions = state["attractions"]
+        self.current_hotels = state["hotels"]
+        self.current_itinerary = state["itinerary"]
+        self.claude_client.history.load_dict(state["history"])
+    
     async def process_command(self, message: str) -> str:
         """
         Process user command and return response.
@@ -43,14 +99,37 @@ class TravelioChatbot:
         Returns:
             Response message
         """
+        return "".join([chunk async for chunk in self.stream_command(message, stream=False)])
+    
+    async def stream_command(self, message: str, stream: bool = True) -> AsyncIterator[str]:
+        """
+        Process user command and yield the response as it is generated.
+        
+        Args:
+            message: User message
+            stream: Stream replies from Gemini; if False, each reply is one chunk
+            
+        Yields:
+            Chunks of the response message
+        """
         # Check for specific commands
         if message.lower().startswith("/reset"):
             self.claude_client.reset_conversation()
+            self._cancel_prefetch()
             self.current_destination = None
             self.current_attractions = None
             self.current_hotels = None
             self.current_itinerary = None
-            return "Conversation has been reset."
+            yield "Conversation has been reset."
+            return
+        
+        # Gemini picks the tools; the calls of one model response run concurrently
+        if self.function_calling:
+            try:
+                yield await self._ask_with_tools(message)
+            except Exception as e:
+                yield f"Sorry, I encountered an error: {str(e)}"
+            return
         
         # Extract potential destination search
         search_match = re.search(r"(?:find|search|looking for|about)\s+([a-zA-Z\s]+)(?:\s|$)", message.lower())
@@ -58,11 +137,14 @@ class TravelioChatbot:
             search_term = search_match.group(1).strip()
             destinations = await self.mcp_client.get_destinations(search_term)
             if destinations:
-                self.current_destination = destinations[0]
+                self._select_destination(destinations[0])
                 context = {"destinations": destinations}
-                return await self.claude_client.send_message(message, context)
+                async for chunk in self._ask(message, context, stream):
+                    yield chunk
+                return
             else:
-                return f"No destinations found matching '{search_term}'."
+                yield f"No destinations found matching '{search_term}'."
+                return
         
         # Handle listing all destinations
         if "list" in message.lower() and "destination" in message.lower():
@@ -71,46 +153,55 @@ class TravelioChatbot:
                 destinations = await self.mcp_client.get_destinations()
                 if destinations:
                     destination_names = [f"- {d['name']}, {d['country']}" for d in destinations]
-                    return (f"Here are the available destinations:\n\n" + 
-                            "\n".join(destination_names))
+                    yield (f"Here are the available destinations:\n\n" + 
+                           "\n".join(destination_names))
+                    return
                 else:
-                    return "No destinations are currently available in our system."
+                    yield "No destinations are currently available in our system."
+                    return
             except Exception as e:
-                return f"Sorry, I couldn't retrieve the destinations: {str(e)}"
+                yield f"Sorry, I couldn't retrieve the destinations: {str(e)}"
+                return
         
         # Extract potential attractions search
         if self.current_destination and "attraction" in message.lower():
-            destination_id = self.current_destination["id"]
             try:
-                attractions = await self.mcp_client.get_attractions(destination_id)
+                attractions = await self._destination_data("attractions")
                 if attractions:
                     self.current_attractions = attractions
                     context = {
                         "destination": self.current_destination,
                         "attractions": attractions[:10]  # Limit to not overwhelm Claude
                     }
-                    return await self.claude_client.send_message(message, context)
+                    async for chunk in self._ask(message, context, stream):
+                        yield chunk
+                    return
                 else:
-                    return f"No attractions found for {self.current_destination['name']}."
+                    yield f"No attractions found for {self.current_destination['name']}."
+                    return
             except Exception as e:
-                return f"Error retrieving attractions: {str(e)}"
+                yield f"Error retrieving attractions: {str(e)}"
+                return
         
         # Extract potential hotels search
         if self.current_destination and "hotel" in message.lower():
-            destination_id = self.current_destination["id"]
             try:
-                hotels = await self.mcp_client.get_hotels(destination_id)
+                hotels = await self._destination_data("hotels")
                 if hotels:
                     self.current_hotels = hotels
                     context = {
                         "destination": self.current_destination,
                         "hotels": hotels[:5]  # Limit to not overwhelm Claude
                     }
-                    return await self.claude_client.send_message(message, context)
+                    async for chunk in self._ask(message, context, stream):
+                        yield chunk
+                    return
                 else:
-                    return f"No hotels found for {self.current_destination['name']}."
+                    yield f"No hotels found for {self.current_destination['name']}."
+                    return
             except Exception as e:
-                return f"Error retrieving hotels: {str(e)}"
+                yield f"Error retrieving hotels: {str(e)}"
+                return
         
         # Extract potential itinerary creation
         itinerary_match = re.search(r"(?:create|plan|make)(?:\s+a|\s+an)?\s+itinerary", message.lower())
@@ -126,8 +217,8 @@ class TravelioChatbot:
             date_match = re.search(r"(\d{4}-\d{2}-\d{2})", message)
             start_date = date_match.group(1) if date_match else tomorrow
             
-            # Use selected attractions or get top attractions
-            attractions = self.current_attractions if self.current_attractions else None
+            # Use selected attractions or get top attractions; the server hydrates them by ID
+            attraction_ids = [a["id"] for a in self.current_attractions] if self.current_attractions else None
             
             # Create itinerary
             try:
@@ -135,31 +226,138 @@ class TravelioChatbot:
                     destination_id=destination_id,
                     num_days=num_days,
                     start_date=start_date,
-                    attractions=attractions
+                    attraction_ids=attraction_ids
                 )
                 
                 self.current_itinerary = itinerary
                 context = {"itinerary": itinerary}
-                return await self.claude_client.send_message(
+                async for chunk in self._ask(
                     f"Here's the {num_days}-day itinerary for {self.current_destination['name']} starting on {start_date}. "
                     f"Can you format this nicely and explain the plan to the user?", 
-                    context
-                )
+                    context,
+                    stream
+                ):
+                    yield chunk
+                return
             except Exception as e:
-                return f"Sorry, I couldn't create an itinerary: {str(e)}"
+                yield f"Sorry, I couldn't create an itinerary: {str(e)}"
+                return
         
         # Default: just pass to Claude
         try:
-            context = {}
-            if self.current_destination:
-                context["current_destination"] = self.current_destination
-            if self.current_attractions:
-                context["available_attractions"] = [a["name"] for a in self.current_attractions[:10]]
-            if self.current_hotels:
-                context["available_hotels"] = [h["name"] for h in self.current_hotels[:5]]
-            if self.current_itinerary:
-                context["has_itinerary"] = True
-                
-            return await self.claude_client.send_message(message, context if context else None)
+            async for chunk in self._ask(message, self._conversation_context(), stream):
+                yield chunk
         except Exception as e:
-            return f"Sorry, I encountered an error: {str(e)}"
+            yield f"Sorry, I encountered an error: {str(e)}"
+    
+    async def _ask(self, message: str, context: Optional[Dict], stream: bool) -> AsyncIterator[str]:
+        """Get Gemini's reply, streamed in chunks or as a single chunk."""
+        if stream:
+            async for chunk in self.claude_client.stream_message(message, context):
+                yield chunk
+        else:
+            yield await self.claude_client.send_message(message, context)
+    
+    async def _ask_with_tools(self, message: str) -> str:
+        """Get Gemini's reply, running the MCP tools it calls."""
+        if self._functions is None:
+            self._functions = function_declarations(await self.mcp_client.list_tools())
+        return await self.claude_client.send_message_with_tools(
+            message,
+            self._functions,
+            self._call_tool,
+            self._conversation_context(),
+            self.max_tool_calls
+        )
+    
+    async def _call_tool(self, name: str, arguments: Dict) -> Any:
+        """Run a tool Gemini called, keeping track of what the user has seen."""
+        result = await self.mcp_client.call_tool(name, arguments)
+        if name == "get_destinations" and isinstance(result, list) and len(result) == 1:
+            destination = result[0]
+            if not self.current_destination or self.current_destination["id"] != destination["id"]:
+                # Loaded data of the previous destination no longer applies; calls of the
+                # same round may already have loaded the new one's, which is kept
+                self._cancel_prefetch()
+                if not self._belongs_to(self.current_attractions, destination["id"]):
+                    self.current_attractions = None
+                if not self._belongs_to(self.current_hotels, destination["id"]):
+                    self.current_hotels = None
+            self.current_destination = destination
+        elif name == "get_attractions":
+            self.current_attractions = result
+        elif name == "get_hotels":
+            self.current_hotels = result
+        elif name == "create_itinerary":
+            self.current_itinerary = result
+        return result
+    
+    @staticmethod
+    def _belongs_to(items: Optional[List[Dict]], destination_id: int) -> bool:
+        """Check that loaded attractions or hotels are known to be the destination's."""
+        return bool(items) and all(item.get("destination_id") == destination_id for item in items)
+    
+    def _conversation_context(self) -> Optional[Dict]:
+        """Summarize what the conversation is about for Gemini; None if nothing yet."""
+        context = {}
+        if self.current_destination:
+            context["current_destination"] = self.current_destination
+        if self.current_attractions:
+            context["available_attractions"] = [a["name"] for a in self.current_attractions[:10]]
+        if self.current_hotels:
+            context["available_hotels"] = [h["name"] for h in self.current_hotels[:5]]
+        if self.current_itinerary:
+            context["has_itinerary"] = True
+        return context or None
+    
+    def _select_destination(self, destination: Dict):
+        """
+        Make a destination current and start loading its attractions and hotels.
+        
+        The prefetch runs while the user reads the reply, so follow-up questions
+        about attractions or hotels answer from data that is already loaded.
+        """
+        if self.current_destination and self.current_destination["id"] == destination["id"]:
+            self.current_destination = destination
+            return
+        
+        self._cancel_prefetch()
+        self.current_destination = destination
+        self.current_attractions = None
+        self.current_hotels = None
+        self._prefetch = asyncio.create_task(self._prefetch_destination(destination["id"]))
+    
+    async def _prefetch_destination(self, destination_id: int) -> Dict[str, Any]:
+        """Fetch attractions and hotels concurrently; failures are returned rather than raised."""
+        attractions, hotels = await asyncio.gather(
+            self.mcp_client.get_attractions(destination_id),
+            self.mcp_client.get_hotels(destination_id),
+            return_exceptions=True
+        )
+        return {"attractions": attractions, "hotels": hotels}
+    
+    async def _destination_data(self, kind: str) -> List[Dict]:
+        """
+        Get the current destination's attractions or hotels from the prefetch.
+        
+        Args:
+            kind: "attractions" or "hotels"
+            
+        Returns:
+            The prefetched list, waiting for the prefetch if it is still running
+        """
+        if self._prefetch is None:
+            self._prefetch = asyncio.create_task(self._prefetch_destination(self.current_destination["id"]))
+        
+        data = (await self._prefetch)[kind]
+        if isinstance(data, BaseException):
+            # Fetch again on the next turn rather than keep the failure
+            self._prefetch = None
+            raise data
+        return data
+    
+    def _cancel_prefetch(self):
+        """Cancel the prefetch of a destination that is no longer current."""
+        if self._prefetch is not None and not self._prefetch.done():
+            self._prefetch.cancel()
+        self._prefetch = None
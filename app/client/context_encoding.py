@@ -0,0 +1,159 @@
+"""Compact text encoding of the data sent to the LLM as context."""
+
+import json
+from typing import Any, Dict, FrozenSet, List, Optional
+
+# Fields the model does not use to answer; coordinates alone are most of an itinerary
+DEFAULT_DROP_KEYS = frozenset({"latitude", "longitude", "start_location", "end_location", "image_url"})
+
+# Foreign keys and dates a nested record repeats from the record holding it; ids are always kept
+DEFAULT_INHERITED_KEYS = frozenset({"destination_id", "hotel_id", "user_id", "itinerary_id", "date"})
+
+# Explains the encoding to the model, once per prompt
+ENCODING_NOTE = (
+    "Lists of records are tables: name[count]{col|col}: then one row per line with cells "
+    "separated by |; columns with the same value in every row are given once as col=value."
+)
+
+INDENT = "  "
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _scalar(value: Any) -> str:
+    """Encode a scalar for a ``key: value`` line or a table cell."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return repr(round(value, 4))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    text = str(value)
+    if "|" in text or "\n" in text:
+        return json.dumps(text)
+    return text
+
+
+def _header_value(value: Any) -> str:
+    """Encode a hoisted column value, quoted if it would read as several values."""
+    text = _scalar(value)
+    return json.dumps(text) if " " in text and not text.startswith('"') else text
+
+
+class ContextEncoder:
+    """
+    Encodes context dictionaries as compact, indented text for prompts.
+    
+    Compared to ``json.dumps(context, indent=2)``, the encoding:
+    
+    - writes lists of records as tables with one header, not repeated keys
+    - drops null and empty values and the fields in ``drop_keys``
+    - drops fields in ``inherited_keys`` repeating the enclosing record's
+      value, like a day's hotel_id matching the itinerary's
+    - hoists table columns with the same value in every row into the header
+    - rounds floats to four decimals
+    """
+    
+    def __init__(
+        self,
+        drop_keys: FrozenSet[str] = DEFAULT_DROP_KEYS,
+        inherited_keys: FrozenSet[str] = DEFAULT_INHERITED_KEYS
+    ):
+        """
+        Initialize the encoder.
+        
+        Args:
+            drop_keys: Field names left out at any depth
+            inherited_keys: Field names left out where they repeat the enclosing record's value
+        """
+        self.drop_keys = drop_keys
+        self.inherited_keys = inherited_keys
+    
+    def encode(self, context: Dict) -> str:
+        """
+        Encode a context dictionary.
+        
+        Args:
+            context: Context data, as sent to the model
+            
+        Returns:
+            Compact text encoding
+        """
+        return "\n".join(self._encode_dict(context, 0, None))
+    
+    def _fields(self, record: Dict, parent: Optional[Dict]) -> Dict:
+        """Get the fields of a record worth sending."""
+        return {
+            key: value for key, value in record.items()
+            if key not in self.drop_keys
+            and not _is_empty(value)
+            and not (key in self.inherited_keys and parent is not None and parent.get(key) == value)
+        }
+    
+    def _encode_dict(self, record: Dict, depth: int, parent: Optional[Dict]) -> List[str]:
+        lines = []
+        indent = INDENT * depth
+        for key, value in self._fields(record, parent).items():
+            if isinstance(value, dict):
+                lines.append(f"{indent}{key}:")
+                lines.extend(self._encode_dict(value, depth + 1, record))
+            elif isinstance(value, list) and all(isinstance(item, dict) for item in value):
+                lines.extend(self._encode_list(key, value, depth, record))
+            else:
+                lines.append(f"{indent}{key}: {_scalar(value)}")
+        return lines
+    
+    def _flatten(self, record: Dict, parent: Optional[Dict], prefix: str = "") -> Optional[Dict]:
+        """Flatten a record into table cells, or None if it holds lists of records."""
+        cells = {}
+        for key, value in self._fields(record, parent).items():
+            if isinstance(value, dict):
+                nested = self._flatten(value, None, f"{prefix}{key}.")
+                if nested is None:
+                    return None
+                cells.update(nested)
+            elif isinstance(value, list) and any(isinstance(item, dict) for item in value):
+                return None
+            else:
+                cells[f"{prefix}{key}"] = value
+        return cells
+    
+    def _encode_list(self, key: str, records: List[Dict], depth: int, parent: Dict) -> List[str]:
+        indent = INDENT * depth
+        rows = [self._flatten(record, parent) for record in records]
+        
+        if any(row is None for row in rows):
+            # Records holding lists of records, like days with activities, are written one by one
+            lines = []
+            for index, record in enumerate(records):
+                lines.append(f"{indent}{key}[{index}]:")
+                lines.extend(self._encode_dict(record, depth + 1, parent))
+            return lines
+        
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        constant = {}
+        if len(rows) > 1:
+            for column in columns:
+                values = [row.get(column) for row in rows]
+                if all(value is not None and value == values[0] for value in values):
+                    constant[column] = values[0]
+        columns = [column for column in columns if column not in constant]
+        
+        header = f"{indent}{key}[{len(rows)}]{{{'|'.join(columns)}}}:"
+        if constant:
+            header += " " + " ".join(f"{column}={_header_value(value)}" for column, value in constant.items())
+        lines = [header]
+        for row in rows:
+            cells = ["" if row.get(column) is None else _scalar(row[column]) for column in columns]
+            lines.append(f"{indent}{INDENT}{'|'.join(cells)}")
+        return lines
+
+
+_default_encoder = ContextEncoder()
+
+
+def encode_context(context: Dict) -> str:
+    """Encode a context dictionary with the default encoder."""
+    return _default_encoder.encode(context)
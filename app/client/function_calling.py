@@ -0,0 +1,110 @@
+"""Gemini function declarations built from the MCP server's tool schemas."""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Arguments of the client-server protocol rather than for the model to choose
+HIDDEN_PARAMETERS = frozenset({"if_none_match"})
+
+SCALAR_TYPES = frozenset({"string", "integer", "number", "boolean"})
+
+
+def _split_description(description: str) -> Tuple[str, Dict[str, str]]:
+    """Split a tool docstring into its summary and the descriptions in its Args section."""
+    summary, _, section = (description or "").partition("Args:")
+    descriptions = {}
+    name = None
+    indent = None
+    for line in section.splitlines():
+        if not line.strip():
+            continue
+        width = len(line) - len(line.lstrip())
+        match = re.match(r"(\w+):\s*(.*)", line.strip())
+        if match and (indent is None or width <= indent):
+            indent = width
+            name = match.group(1)
+            descriptions[name] = match.group(2)
+        elif name is not None and width > indent:
+            descriptions[name] += " " + line.strip()
+        else:
+            break
+    return " ".join(summary.split()), descriptions
+
+
+def convert_schema(schema: Dict) -> Optional[Dict]:
+    """
+    Convert a JSON schema to the OpenAPI subset Gemini accepts.
+    
+    Optional values become ``nullable``; titles and defaults are dropped.
+    
+    Args:
+        schema: JSON schema, as generated by pydantic for a tool's arguments
+        
+    Returns:
+        Gemini schema, or None if it has no equivalent, like a free-form object
+    """
+    variants = schema.get("anyOf")
+    if variants is not None:
+        present = [variant for variant in variants if variant.get("type") != "null"]
+        if len(present) != 1:
+            return None
+        converted = convert_schema(present[0])
+        if converted is not None and len(present) < len(variants):
+            converted["nullable"] = True
+        return converted
+    
+    kind = schema.get("type")
+    if kind == "object":
+        properties = {}
+        for name, property_schema in schema.get("properties", {}).items():
+            converted = convert_schema(property_schema)
+            if converted is not None:
+                properties[name] = converted
+        if not properties:
+            return None
+        result = {"type": "object", "properties": properties}
+        required = [name for name in schema.get("required", []) if name in properties]
+        if required:
+            result["required"] = required
+        return result
+    if kind == "array":
+        items = convert_schema(schema.get("items", {}))
+        return {"type": "array", "items": items} if items is not None else None
+    if kind in SCALAR_TYPES:
+        result = {"type": kind}
+        if "enum" in schema:
+            result["enum"] = schema["enum"]
+        return result
+    return None
+
+
+def function_declaration(tool: Dict) -> Dict:
+    """
+    Build the Gemini function declaration of an MCP tool.
+    
+    Args:
+        tool: Tool dictionary with name, description and inputSchema, as listed by the server
+        
+    Returns:
+        Function declaration with name, description and, if it takes any, parameters
+    """
+    summary, descriptions = _split_description(tool.get("description", ""))
+    input_schema = tool.get("inputSchema", {})
+    schema = dict(input_schema, properties={
+        name: property_schema for name, property_schema in input_schema.get("properties", {}).items()
+        if name not in HIDDEN_PARAMETERS
+    })
+    
+    declaration = {"name": tool["name"], "description": summary}
+    parameters = convert_schema(schema)
+    if parameters is not None:
+        for name, property_schema in parameters["properties"].items():
+            if name in descriptions:
+                property_schema["description"] = descriptions[name]
+        declaration["parameters"] = parameters
+    return declaration
+
+
+def function_declarations(tools: List[Dict]) -> List[Dict]:
+    """Build the Gemini function declarations of the MCP server's tools."""
+    return [function_declaration(tool) for tool in tools]
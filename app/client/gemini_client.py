@@ -1,50 +1,89 @@
 """Gemini AI API integration for Travelio chatbot."""
 
 import os
-import httpx
 import json
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
+import asyncio
+import time
+from inspect import cleandoc
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Set
 
-# Load environment variables
-load_dotenv()
+from app.client.context_encoding import ENCODING_NOTE, encode_context
+from app.client.history import ConversationHistory
+from app.client.metrics import TurnBreakdown
+from app.client.response_cache import ResponseCache
+
+DEFAULT_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "maxOutputTokens": 1000,
+}
 
 class GeminiClient:
     """Client for interacting with Google's Gemini API."""
     
-    def __init__(self):
-        """Initialize the Gemini client."""
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        history_max_tokens: Optional[int] = 4000,
+        response_cache: Optional[ResponseCache] = None,
+        http_client: Optional[Any] = None,
+        transport: Optional[Any] = None
+    ):
+        """
+        Initialize the Gemini client.
+        
+        Args:
+            api_url: generateContent endpoint; defaults to GEMINI_API_URL or Gemini 2.0 Flash
+            history_max_tokens: Token budget of verbatim conversation turns; None for unbounded
+            response_cache: Optional cache answering repeated questions without calling Gemini
+            http_client: Optional httpx client shared between sessions; not closed by ``close``
+            transport: Optional httpx transport, e.g. a stub LLM in tests
+        """
+        # Imported here rather than at module level to keep client start-up fast
+        import httpx
+        from dotenv import load_dotenv
+        
+        # Load environment variables
+        load_dotenv()
+        
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
-            
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-        self.client = httpx.AsyncClient(timeout=60.0)
         
-        # Set up the system prompt for travel assistant
-        self.system_prompt = """
+        self.api_url = api_url or os.getenv("GEMINI_API_URL", DEFAULT_API_URL)
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(timeout=60.0, transport=transport)
+        
+        # Set up the system prompt for travel assistant; cleandoc drops the indentation sent with every call
+        self.system_prompt = cleandoc("""
         You are a helpful travel assistant for a service called Travelio. 
         Your job is to help users plan their trips by suggesting destinations, attractions, 
         hotels, and creating customized travel itineraries.
-
+        
         Use the tools provided to fetch real data about destinations, attractions, and hotels.
         When creating itineraries, be specific about dates, attractions, and logistics.
-
+        
         Always be polite, helpful, and concise in your responses. 
         If you don't know something or if the data isn't available, be honest about it.
-
+        
         When users request an itinerary, make sure to get:
         1. The destination they want to visit
         2. The dates or duration of their trip
         3. Any specific attractions they want to include
         4. Any preferences (e.g., hotels, activities, budget)
-        """
+        """)
         
-        self.conversation_history = []
+        self.history = ConversationHistory(max_tokens=history_max_tokens)
+        self.response_cache = response_cache
         
+        # Timing of the last turn with function calling
+        self.last_turn: Optional[TurnBreakdown] = None
+    
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP client, unless it is shared."""
+        if self._owns_client:
+            await self.client.aclose()
     
     async def send_message(self, message: str, context: Optional[Dict] = None) -> str:
         """
@@ -57,27 +96,12 @@ class GeminiClient:
         Returns:
             Gemini's response
         """
-        # Add user message to conversation history
-        self.conversation_history.append({"role": "user", "parts": [{"text": message}]})
-        
-        # Build the context information if provided
-        context_str = ""
-        if context:
-            context_str = "Available data:\n" + json.dumps(context, indent=2)
+        key = self._cache_key(message, context)
+        cached = await self._cached_reply(key, message)
+        if cached is not None:
+            return cached
         
-        # Prepare the request payload
-        payload = {
-            "contents": [
-                {
-                    "role": "user",
-                    "parts": [{"text": self.system_prompt + ("\n\n" + context_str if context else "")}]
-                }
-            ] + self.conversation_history,
-            "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 1000,
-            }
-        }
+        payload = self._build_payload(message, context)
         
         # Send request to Gemini API
         url = f"{self.api_url}?key={self.api_key}"
@@ -89,10 +113,202 @@ class GeminiClient:
         assistant_message = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{"text": "Sorry, I couldn't process your request."}])[0].get("text")
         
         # Add assistant response to conversation history
-        self.conversation_history.append({"role": "model", "parts": [{"text": assistant_message}]})
+        self.history.add("model", assistant_message)
+        if key is not None:
+            await self.response_cache.put(key, assistant_message)
+        
+        return assistant_message
+    
+    async def stream_message(self, message: str, context: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Send a message to Gemini and yield the response as it is generated.
+        
+        Uses the streamGenerateContent endpoint with server-sent events, so the
+        first words can be shown long before the full response is complete.
+        
+        Args:
+            message: User message
+            context: Optional context information about available data
+            
+        Yields:
+            Chunks of Gemini's response text
+        """
+        key = self._cache_key(message, context)
+        cached = await self._cached_reply(key, message)
+        if cached is not None:
+            yield cached
+            return
+        
+        payload = self._build_payload(message, context)
+        
+        url = self.api_url.replace(":generateContent", ":streamGenerateContent")
+        chunks = []
+        complete = False
+        try:
+            async with self.client.stream("POST", url, params={"alt": "sse", "key": self.api_key}, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    result = json.loads(line[len("data:"):])
+                    for part in result.get("candidates", [{}])[0].get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            chunks.append(part["text"])
+                            yield part["text"]
+            complete = True
+        finally:
+            # Keep what the user saw, even if they stopped reading early
+            if chunks:
+                self.history.add("model", "".join(chunks))
+            if complete and chunks and key is not None:
+                await self.response_cache.put(key, "".join(chunks))
+    
+    async def send_message_with_tools(
+        self,
+        message: str,
+        functions: List[Dict],
+        call_tool: Callable[[str, Dict], Awaitable[Any]],
+        context: Optional[Dict] = None,
+        max_tool_calls: int = 8,
+        concurrent: bool = True
+    ) -> str:
+        """
+        Send a message to Gemini, running the tools it calls until it answers.
+        
+        The function calls of one model response are independent of each
+        other, so they run concurrently. Once ``max_tool_calls`` calls have
+        run, further calls are answered with an error and the model is asked
+        to answer without tools. Only the message and the final answer join
+        the history; tool results are fresh data, so replies are not cached.
+        The timing of the turn is kept in ``last_turn``.
+        
+        Args:
+            message: User message
+            functions: Gemini function declarations of the tools
+            call_tool: Coroutine function running a tool by name with arguments
+            context: Optional context information about available data
+            max_tool_calls: Tool calls allowed in this turn
+            concurrent: Run the calls of one response concurrently; False runs them in order
+            
+        Returns:
+            Gemini's response
+        """
+        breakdown = TurnBreakdown()
+        self.last_turn = breakdown
+        start = time.perf_counter()
         
+        payload = self._build_payload(message, context)
+        payload["tools"] = [{"functionDeclarations": functions}]
+        contents = payload["contents"]
+        names = {function["name"] for function in functions}
+        budget = max_tool_calls
+        url = f"{self.api_url}?key={self.api_key}"
+        
+        try:
+            while True:
+                if budget <= 0:
+                    payload["toolConfig"] = {"functionCallingConfig": {"mode": "NONE"}}
+                
+                llm_start = time.perf_counter()
+                response = await self.client.post(url, json=payload)
+                response.raise_for_status()
+                breakdown.llm_seconds.append(time.perf_counter() - llm_start)
+                
+                parts = response.json().get("candidates", [{}])[0].get("content", {}).get("parts", [])
+                calls = [part["functionCall"] for part in parts if "functionCall" in part]
+                text = "".join(part.get("text", "") for part in parts)
+                if not calls or budget <= 0:
+                    break
+                
+                allowed, skipped = calls[:budget], calls[budget:]
+                budget -= len(allowed)
+                breakdown.skipped_calls += len(skipped)
+                
+                round_start = time.perf_counter()
+                if concurrent:
+                    results = await asyncio.gather(
+                        *(self._run_tool(call, names, call_tool, breakdown) for call in allowed)
+                    )
+                else:
+                    results = [await self._run_tool(call, names, call_tool, breakdown) for call in allowed]
+                breakdown.tool_round_seconds.append(time.perf_counter() - round_start)
+                
+                results += [
+                    {"functionResponse": {"name": call["name"], "response": {"error": "Tool call budget of this turn exhausted"}}}
+                    for call in skipped
+                ]
+                contents.append({"role": "model", "parts": parts})
+                contents.append({"role": "user", "parts": results})
+        finally:
+            breakdown.total_seconds = time.perf_counter() - start
+        
+        assistant_message = text or "Sorry, I couldn't process your request."
+        self.history.add("model", assistant_message)
         return assistant_message
     
+    async def _run_tool(
+        self,
+        call: Dict,
+        names: Set[str],
+        call_tool: Callable[[str, Dict], Awaitable[Any]],
+        breakdown: TurnBreakdown
+    ) -> Dict:
+        """Run one function call; failures are reported to the model rather than raised."""
+        name = call.get("name", "")
+        start = time.perf_counter()
+        try:
+            if name not in names:
+                raise ValueError(f"Unknown tool: {name}")
+            result = await call_tool(name, call.get("args") or {})
+            response = {"content": encode_context({name: result})}
+            error = False
+        except Exception as e:
+            response = {"error": str(e) or type(e).__name__}
+            error = True
+        breakdown.observe_tool(name, time.perf_counter() - start, error)
+        return {"functionResponse": {"name": name, "response": response}}
+    
+    def _cache_key(self, message: str, context: Optional[Dict]) -> Optional[str]:
+        """Get the response cache key of a request, or None without a cache."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.key(
+            self.system_prompt,
+            message,
+            encode_context(context) if context else "",
+            {"model": self.api_url, **GENERATION_CONFIG}
+        )
+    
+    async def _cached_reply(self, key: Optional[str], message: str) -> Optional[str]:
+        """Answer from the response cache, recording the exchange in the history."""
+        if key is None:
+            return None
+        reply = await self.response_cache.get(key)
+        if reply is not None:
+            self.history.add("user", message)
+            self.history.add("model", reply)
+        return reply
+    
+    def _build_payload(self, message: str, context: Optional[Dict]) -> Dict:
+        """Add the user message to the history and build the request payload."""
+        # Add user message to conversation history
+        self.history.add("user", message)
+        
+        # Only this turn's context is sent; it supersedes the context of earlier turns
+        preamble = [self.system_prompt, self.history.summary_text()]
+        if context:
+            preamble.append(f"Available data ({ENCODING_NOTE}):\n" + encode_context(context))
+        
+        return {
+            "contents": [
+                {
+                    "role": "user",
+                    "parts": [{"text": "\n\n".join(part for part in preamble if part)}]
+                }
+            ] + self.history.turns,
+            "generationConfig": GENERATION_CONFIG
+        }
+    
     def reset_conversation(self):
         """Reset the conversation history."""
-        self.conversation_history = []
+        self.history.clear()
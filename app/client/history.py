@@ -0,0 +1,96 @@
+"""Token-budgeted conversation history for the chatbot's LLM calls."""
+
+import re
+from typing import Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text at about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def first_sentence(text: str, max_chars: int = 160) -> str:
+    """Get the first sentence of text, shortened to at most ``max_chars``."""
+    sentence = re.split(r"(?<=[.!?])\s", " ".join(text.split()), maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars - 3].rstrip() + "..."
+
+
+class ConversationHistory:
+    """
+    Conversation turns kept within a token budget.
+    
+    Recent turns are sent verbatim. Once they exceed ``max_tokens``, the
+    oldest turns are folded into a running summary of their first
+    sentences, which itself keeps only its newest ``summary_max_tokens``.
+    Summarizing locally adds no LLM round trip, unlike asking the model.
+    """
+    
+    def __init__(self, max_tokens: Optional[int] = 4000, summary_max_tokens: int = 400, min_turns: int = 2):
+        """
+        Initialize an empty history.
+        
+        Args:
+            max_tokens: Budget of verbatim turns; None keeps every turn verbatim
+            summary_max_tokens: Budget of the summary of older turns
+            min_turns: Most recent turns always kept verbatim
+        """
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.min_turns = min_turns
+        self.turns: List[Dict] = []
+        self.summary: List[str] = []
+        self._tokens = 0
+    
+    def add(self, role: str, text: str):
+        """
+        Append a turn, then fold old turns into the summary if over budget.
+        
+        Args:
+            role: "user" or "model"
+            text: Text of the turn
+        """
+        self.turns.append({"role": role, "parts": [{"text": text}]})
+        self._tokens += estimate_tokens(text)
+        self._compact()
+    
+    def summary_text(self) -> str:
+        """Get the summary of turns no longer sent verbatim, empty if none."""
+        if not self.summary:
+            return ""
+        return "Earlier in this conversation:\n" + "\n".join(self.summary)
+    
+    def tokens(self) -> int:
+        """Estimate the tokens of the verbatim turns and the summary."""
+        return self._tokens + estimate_tokens(self.summary_text())
+    
+    def clear(self):
+        """Forget all turns and the summary."""
+        self.turns = []
+        self.summary = []
+        self._tokens = 0
+    
+    def to_dict(self) -> Dict:
+        """Get the turns and summary as JSON-serializable data."""
+        return {"turns": self.turns, "summary": self.summary}
+    
+    def load_dict(self, data: Dict):
+        """Replace the turns and summary with data from ``to_dict``."""
+        self.turns = data["turns"]
+        self.summary = data["summary"]
+        self._tokens = sum(estimate_tokens(turn["parts"][0]["text"]) for turn in self.turns)
+    
+    def _compact(self):
+        """Fold the oldest turns into the summary until within budget."""
+        if self.max_tokens is None:
+            return
+        
+        # Keep the verbatim history starting with a user turn
+        while len(self.turns) > self.min_turns and (self._tokens > self.max_tokens or self.turns[0]["role"] != "user"):
+            turn = self.turns.pop(0)
+            text = turn["parts"][0]["text"]
+            speaker = "User" if turn["role"] == "user" else "Assistant"
+            self.summary.append(f"- {speaker}: {first_sentence(text)}")
+            self._tokens -= estimate_tokens(text)
+        
+        while len(self.summary) > 1 and estimate_tokens(self.summary_text()) > self.summary_max_tokens:
+            del self.summary[0]
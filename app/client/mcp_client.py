@@ -2,27 +2,209 @@
 
 from typing import Dict, List, Any, Optional
 import os
-import httpx
 import json
 import asyncio
+import random
+import time
+
+from app.client.cache import ToolCache
+from app.client.metrics import ClientMetrics
+
+# Tools that only read, so a call can be repeated safely after any failure
+IDEMPOTENT_TOOLS = frozenset({"get_destinations", "get_attractions", "get_hotels", "get_itinerary"})
+
+# Tools whose results carry version tokens and can be cached
+CACHEABLE_TOOLS = IDEMPOTENT_TOOLS
+
+# Responses worth retrying: upstream unavailable, or admission control shedding load
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
 
 class TravelioMCPClient:
     """Client for connecting to Travelio MCP Server."""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        cache_ttl_seconds: Optional[float] = None,
+        cache_max_entries: int = 256,
+        transport: Optional[Any] = None
+    ):
         """
         Initialize the MCP client.
         
         Args:
             base_url: Base URL of the MCP server
+            timeout: Seconds allowed per HTTP request
+            max_connections: Maximum open connections to the server
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Multiplex calls over HTTP/2; needs the ``h2`` package and a
+                server or proxy speaking HTTP/2 (uvicorn itself only speaks HTTP/1.1)
+            max_retries: Retries of a failed call of an idempotent tool
+            backoff_base: Backoff before the first retry in seconds, doubled per retry
+            backoff_max: Upper bound of the backoff in seconds
+            cache_ttl_seconds: Cache read tool results for this many seconds,
+                then revalidate them by version; None disables the cache
+            cache_max_entries: Maximum number of cached results
+            transport: Optional httpx transport, e.g. a stub server in tests
         """
-        self.base_url = base_url
-        self.client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+        # Imported here rather than at module level to keep client start-up fast
+        import httpx
         
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = ClientMetrics()
+        self.cache = ToolCache(cache_ttl_seconds, cache_max_entries) if cache_ttl_seconds is not None else None
+        self._tools: Optional[List[Dict]] = None
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            http2=http2,
+            transport=transport
+        )
+    
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
+    
+    async def list_tools(self) -> List[Dict]:
+        """
+        List the server's tools, fetched once per client.
+        
+        Returns:
+            Tool dictionaries with name, description and JSON inputSchema
+        """
+        if self._tools is None:
+            response = await self.client.get("/tools")
+            response.raise_for_status()
+            self._tools = response.json()
+        return self._tools
+    
+    async def call_tool(self, name: str, arguments: Dict) -> Any:
+        """
+        Call a tool, answering from the cache where enabled.
+        
+        A fresh cached result is returned without a round trip. A stale one is
+        revalidated with its version token and only refetched if it changed.
+        
+        Args:
+            name: Name of the tool
+            arguments: Tool arguments
+            
+        Returns:
+            Decoded tool result
+        """
+        if self.cache is None or name not in CACHEABLE_TOOLS:
+            return await self._call(name, arguments)
+        
+        key = self.cache.key(name, arguments)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0]:
+            self.cache.hits += 1
+            return cached[2]
+        
+        version = cached[1] if cached is not None else ""
+        result = await self._call(name, {**arguments, "if_none_match": version})
+        if result.get("not_modified"):
+            self.cache.revalidations += 1
+            data = cached[2]
+        else:
+            self.cache.misses += 1
+            data = result["data"]
+        self.cache.put(key, result["version"], data)
+        return data
+    
+    async def _call(self, name: str, arguments: Dict) -> Any:
+        """
+        Call a tool over the REST route, retrying where it is safe.
+        
+        Idempotent tools are retried on transport errors and retryable status
+        codes. Other tools are only retried if the connection could not be
+        established, since the server has then not seen the call.
+        
+        Args:
+            name: Name of the tool
+            arguments: Tool arguments
+            
+        Returns:
+            Decoded tool result
+            
+        Raises:
+            httpx.HTTPError: If the call still fails after the allowed retries
+        """
+        import httpx
+        
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                retry_after = None
+                try:
+                    response = await self.client.post(f"/tool/{name}", json=arguments)
+                    if response.status_code not in RETRY_STATUS_CODES or name not in IDEMPOTENT_TOOLS \
+                            or attempt >= self.max_retries:
+                        self._raise_for_status(name, response)
+                        result = response.json()
+                        break
+                    retry_after = response.headers.get("Retry-After")
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                    if attempt >= self.max_retries:
+                        raise
+                except httpx.TransportError:
+                    if name not in IDEMPOTENT_TOOLS or attempt >= self.max_retries:
+                        raise
+                
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+                attempt += 1
+                self.metrics.retried(name)
+        except Exception:
+            self.metrics.observe(name, time.perf_counter() - start, error=True)
+            raise
+        
+        self.metrics.observe(name, time.perf_counter() - start)
+        return result
+    
+    @staticmethod
+    def _raise_for_status(name: str, response: Any):
+        """Raise an error carrying the server's detail, like a missing itinerary, for an error response."""
+        import httpx
         
+        if response.is_success:
+            return
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise httpx.HTTPStatusError(
+            f"{name} failed with {response.status_code}: {detail}", request=response.request, response=response
+        )
+    
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get a jittered exponential backoff, at least the server's Retry-After."""
+        # Full jitter keeps clients that failed together from retrying together
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass
+        return delay
+    
     async def get_destinations(self, search_term: Optional[str] = None) -> List[Dict]:
         """
         Get destinations matching the search term.
@@ -36,10 +218,8 @@ class TravelioMCPClient:
         params = {}
         if search_term:
             params["search_term"] = search_term
-            
-        response = await self.client.post("/tool/get_destinations", json=params)
-        response.raise_for_status()
-        return response.json()
+        
+        return await self.call_tool("get_destinations", params)
     
     async def get_attractions(self, destination_id: int, filters: Optional[Dict] = None) -> List[Dict]:
         """
@@ -55,10 +235,8 @@ class TravelioMCPClient:
         params = {"destination_id": destination_id}
         if filters:
             params["filters"] = filters
-            
-        response = await self.client.post("/tool/get_attractions", json=params)
-        response.raise_for_status()
-        return response.json()
+        
+        return await self.call_tool("get_attractions", params)
     
     async def get_hotels(self, destination_id: int, filters: Optional[Dict] = None) -> List[Dict]:
         """
@@ -74,17 +252,15 @@ class TravelioMCPClient:
         params = {"destination_id": destination_id}
         if filters:
             params["filters"] = filters
-            
-        response = await self.client.post("/tool/get_hotels", json=params)
-        response.raise_for_status()
-        return response.json()
+        
+        return await self.call_tool("get_hotels", params)
     
     async def create_itinerary(
         self, 
         destination_id: int, 
         num_days: int, 
         start_date: str,
-        attractions: Optional[List[Dict]] = None,
+        attraction_ids: Optional[List[int]] = None,
         user_id: Optional[int] = None,
         hotel_id: Optional[int] = None
     ) -> Dict:
@@ -95,7 +271,7 @@ class TravelioMCPClient:
             destination_id: ID of the destination
             num_days: Number of days for the itinerary
             start_date: Start date in format YYYY-MM-DD
-            attractions: Optional list of attractions to include
+            attraction_ids: Optional IDs of the attractions to include
             user_id: Optional user ID
             hotel_id: Optional hotel ID
             
@@ -108,16 +284,14 @@ class TravelioMCPClient:
             "start_date": start_date
         }
         
-        if attractions:
-            params["attractions"] = attractions
+        if attraction_ids:
+            params["attraction_ids"] = attraction_ids
         if user_id:
             params["user_id"] = user_id
         if hotel_id:
             params["hotel_id"] = hotel_id
-            
-        response = await self.client.post("/tool/create_itinerary", json=params)
-        response.raise_for_status()
-        return response.json()
+        
+        return await self.call_tool("create_itinerary", params)
     
     async def get_itinerary(self, itinerary_id: int) -> Dict:
         """
@@ -130,6 +304,4 @@ class TravelioMCPClient:
             Itinerary dictionary
         """
         params = {"itinerary_id": itinerary_id}
-        response = await self.client.post("/tool/get_itinerary", json=params)
-        response.raise_for_status()
-        return response.json()
+        return await self.call_tool("get_itinerary", params)
@@ -0,0 +1,112 @@
+"""Client-side latency metrics of MCP tool calls and chatbot turns."""
+
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get a percentile of already sorted values by the nearest-rank method."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class ClientMetrics:
+    """
+    Per-tool call counts and latencies as seen by the client.
+    
+    Latencies cover the whole call including retries and backoff, which is
+    what the caller waits for. Only the most recent ``window`` samples per
+    tool are kept for percentiles.
+    """
+    
+    def __init__(self, window: int = 1000):
+        """
+        Initialize empty metrics.
+        
+        Args:
+            window: Number of recent latency samples kept per tool
+        """
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+    
+    def observe(self, tool: str, seconds: float, error: bool = False):
+        """Record a finished call of a tool."""
+        self.calls[tool] += 1
+        if error:
+            self.errors[tool] += 1
+        self.latencies[tool].append(seconds)
+    
+    def retried(self, tool: str):
+        """Record a retry of a tool call."""
+        self.retries[tool] += 1
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize each tool's calls.
+        
+        Returns:
+            Mapping of tool name to calls, errors, retries, and mean, p50, p95
+            and p99 latency in milliseconds
+        """
+        summary = {}
+        for tool, samples in self.latencies.items():
+            ordered = sorted(samples)
+            summary[tool] = {
+                "calls": self.calls[tool],
+                "errors": self.errors[tool],
+                "retries": self.retries[tool],
+                "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+            }
+        return summary
+
+
+class TurnBreakdown:
+    """
+    Where the time of one chatbot turn with function calling went.
+    
+    A turn alternates model calls and rounds of tool calls; the tool calls
+    of a round run concurrently, so a round takes as long as its slowest call.
+    """
+    
+    def __init__(self):
+        """Initialize an empty breakdown."""
+        self.llm_seconds: List[float] = []
+        self.tool_round_seconds: List[float] = []
+        self.tool_calls: List[Tuple[str, float, bool]] = []
+        self.skipped_calls = 0
+        self.total_seconds = 0.0
+    
+    def observe_tool(self, tool: str, seconds: float, error: bool = False):
+        """Record a finished tool call."""
+        self.tool_calls.append((tool, seconds, not error))
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the turn.
+        
+        Returns:
+            Model calls, tool calls, calls skipped over the budget, and total,
+            model, tool and other time in milliseconds; ``tool_call_ms`` is
+            the sum of the tool calls, which is more than ``tool_ms`` when
+            calls ran concurrently
+        """
+        llm = sum(self.llm_seconds)
+        tools = sum(self.tool_round_seconds)
+        return {
+            "llm_calls": len(self.llm_seconds),
+            "tool_calls": len(self.tool_calls),
+            "tool_errors": sum(1 for _, _, ok in self.tool_calls if not ok),
+            "skipped_calls": self.skipped_calls,
+            "total_ms": self.total_seconds * 1000,
+            "llm_ms": llm * 1000,
+            "tool_ms": tools * 1000,
+            "tool_call_ms": sum(seconds for _, seconds, _ in self.tool_calls) * 1000,
+            "other_ms": max(self.total_seconds - llm - tools, 0.0) * 1000,
+        }
@@ -0,0 +1,148 @@
+"""Cache of LLM replies keyed on the normalized prompt and context."""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_message(message: str) -> str:
+    """Normalize a user message so trivially different phrasings share a key."""
+    return re.sub(r"\s+", " ", message).strip().lower().rstrip("?!. ")
+
+
+class ResponseCache:
+    """
+    LRU cache of LLM replies with a TTL, optionally backed by SQLite on disk.
+    
+    Replies are keyed on the system prompt, the normalized user message, the
+    encoded context and the generation parameters. Conversation history is
+    deliberately not part of the key, so sessions asking the same question
+    about the same data share replies; the context carries the state that
+    matters, like the current destination.
+    
+    The disk store lets replies survive restarts and be shared by processes
+    on one machine. Its queries and commits run in the default executor, off
+    the event loop, one at a time; rows beyond ``max_entries`` are trimmed,
+    oldest first, only once a new reply takes the store over capacity.
+    """
+    
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 1000, path: Optional[str] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: Seconds a reply is served from the cache
+            max_entries: Maximum number of replies kept, in memory and on disk
+            path: Optional SQLite file to persist replies to
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        self._db = None
+        # Serializes the executor threads sharing the connection
+        self._db_lock = threading.Lock()
+        self._rows = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created_at REAL, response TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+            self._db.commit()
+            self._rows = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def key(system_prompt: str, message: str, context: str, parameters: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a request.
+        
+        Args:
+            system_prompt: System prompt sent with the request
+            message: User message, normalized here
+            context: Encoded context, empty if none
+            parameters: Model and generation parameters
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        material = json.dumps(
+            [system_prompt, normalize_message(message), context, parameters],
+            sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get a fresh cached reply, counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._load, key)
+            if entry is not None:
+                self._remember(key, entry)
+        
+        if entry is None or time.time() - entry[0] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    async def put(self, key: str, response: str):
+        """Store a reply."""
+        entry = (time.time(), response)
+        self._remember(key, entry)
+        if self._db is not None:
+            await asyncio.to_thread(self._store, key, entry)
+    
+    def hit_rate(self) -> float:
+        """Get the share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def close(self):
+        """Close the disk store, if any."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def _remember(self, key: str, entry: Tuple[float, str]):
+        """Keep an entry in memory, evicting the least recently used."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _load(self, key: str) -> Optional[Tuple[float, str]]:
+        """Read an entry from the disk store; runs in the executor."""
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT created_at, response FROM responses WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row is not None else None
+    
+    def _store(self, key: str, entry: Tuple[float, str]):
+        """Write an entry to the disk store, trimming the oldest once over capacity; runs in the executor."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            known = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone() is not None
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, *entry))
+            if not known:
+                self._rows += 1
+            if self._rows > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY created_at LIMIT ?)",
+                    (self._rows - self.max_entries,)
+                )
+                self._rows = self.max_entries
+            self._db.commit()
@@ -0,0 +1,352 @@
+"""
+Chatbot service hosting many concurrent sessions over shared connection pools.
+
+Every session is a ``TravelioChatbot`` holding its own conversation state,
+while all of them share one MCP client, with its pool and tool cache, and
+one HTTP pool to Gemini. At most ``max_sessions`` stay in memory; the least
+recently used idle sessions beyond that are evicted, their state spilled to
+an optional SQLite file and restored on their next message.
+
+Usage:
+  python -m app.client.session_service [--port 8100] [--max-sessions 1000] [--spill-path sessions.sqlite]
+
+Then chat with
+  curl -N -X POST localhost:8100/sessions/<id>/messages -H 'Content-Type: application/json' -d '{"message": "..."}'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.client.chatbot import TravelioChatbot
+from app.client.mcp_client import TravelioMCPClient
+from app.client.response_cache import ResponseCache
+
+
+class _Session:
+    """A resident session and the turns using it."""
+    
+    __slots__ = ("chatbot", "lock", "users", "ended")
+    
+    def __init__(self, chatbot: TravelioChatbot):
+        self.chatbot = chatbot
+        # Turns of one session run one at a time, in arrival order
+        self.lock = asyncio.Lock()
+        self.users = 0
+        # Ended while in use; closed once its last turn finishes
+        self.ended = False
+
+
+class ChatSessionService:
+    """
+    Hosts chatbot sessions keyed by session ID.
+    
+    Sessions with a turn in progress or waiting are never evicted, so the
+    number of resident sessions can briefly exceed ``max_sessions`` while
+    more than that many are busy. Each session's Gemini history is bounded
+    by its token budget, so resident memory is bounded by the session count.
+    
+    The spill store runs on a single worker thread, off the event loop, so
+    its reads, writes and commits happen in the order the loop issued them:
+    a session evicted and then asked for again is read back only after its
+    spill is written. Ending a session with turns in progress or waiting
+    forgets it at once but closes it only when its last turn finishes, so
+    the prefetch a turn may be awaiting is not cancelled under it.
+    """
+    
+    def __init__(
+        self,
+        mcp_base_url: str = "http://localhost:8000",
+        max_sessions: int = 1000,
+        spill_path: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        max_connections: int = 100,
+        max_concurrent_turns: int = 50,
+        function_calling: bool = False,
+        mcp_transport: Optional[object] = None,
+        llm_transport: Optional[object] = None
+    ):
+        """
+        Initialize the service.
+        
+        Args:
+            mcp_base_url: Base URL of the MCP server
+            max_sessions: Idle sessions kept in memory before evicting the least recently used
+            spill_path: Optional SQLite file keeping evicted sessions; without it they are dropped
+            response_cache: Optional cache of Gemini replies shared by all sessions
+            max_connections: Size of each of the MCP and Gemini connection pools
+            max_concurrent_turns: Turns processed at once; later turns wait their turn
+            function_calling: Let Gemini call the MCP tools itself in every session
+            mcp_transport: Optional httpx transport to the MCP server, e.g. in tests
+            llm_transport: Optional httpx transport to Gemini, e.g. a stub LLM in tests
+        """
+        # Imported here rather than at module level to keep client start-up fast
+        import httpx
+        
+        self.max_sessions = max_sessions
+        self.response_cache = response_cache
+        self.function_calling = function_calling
+        self.mcp_client = TravelioMCPClient(
+            mcp_base_url,
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            cache_ttl_seconds=300,
+            transport=mcp_transport
+        )
+        self.llm_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=llm_transport
+        )
+        self.sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        # Turns beyond the limit wait here, in order, rather than in the
+        # connection pools, whose scheduling slows down with many waiting requests
+        self._turns = asyncio.Semaphore(max_concurrent_turns)
+        self.created = 0
+        self.evicted = 0
+        self.restored = 0
+        
+        self._db = None
+        self._db_executor = None
+        self._spilled = 0
+        if spill_path is not None:
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state TEXT)")
+            self._db.commit()
+            self._spilled = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            # One worker keeps the store's operations in issue order
+            self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-spill")
+    
+    async def process_command(self, session_id: str, message: str) -> str:
+        """
+        Process a message of a session and return the response.
+        
+        Args:
+            session_id: Session the message belongs to; created on first use
+            message: User message
+            
+        Returns:
+            Response message
+        """
+        return "".join([chunk async for chunk in self.stream_command(session_id, message, stream=False)])
+    
+    async def stream_command(self, session_id: str, message: str, stream: bool = True) -> AsyncIterator[str]:
+        """
+        Process a message of a session and yield the response as it is generated.
+        
+        Args:
+            session_id: Session the message belongs to; created on first use
+            message: User message
+            stream: Stream replies from Gemini; if False, each reply is one chunk
+            
+        Yields:
+            Chunks of the response message
+        """
+        session = await self._checkout(session_id)
+        try:
+            async with session.lock, self._turns:
+                async for chunk in session.chatbot.stream_command(message, stream):
+                    yield chunk
+        finally:
+            session.users -= 1
+            if session.ended and not session.users:
+                await session.chatbot.close()
+            await self._evict()
+    
+    async def end_session(self, session_id: str):
+        """Forget a session, in memory and in the spill store, closing it once no turn uses it."""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            if session.users:
+                session.ended = True
+            else:
+                await session.chatbot.close()
+        await self._run_store(self._delete, session_id)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get session counts since start-up."""
+        return {
+            "resident": len(self.sessions),
+            "spilled": self._spilled,
+            "created": self.created,
+            "evicted": self.evicted,
+            "restored": self.restored,
+        }
+    
+    async def close(self):
+        """Spill every resident session, if there is a store, and close the pools and the response cache."""
+        for session_id, session in list(self.sessions.items()):
+            await self._run_store(self._spill, session_id, self._encode(session))
+            await session.chatbot.close()
+        self.sessions.clear()
+        await self.mcp_client.close()
+        await self.llm_client.aclose()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        if self._db is not None:
+            await self._run_store(self._db.close)
+            self._db = None
+            self._db_executor.shutdown()
+            self._db_executor = None
+    
+    async def _checkout(self, session_id: str) -> _Session:
+        """Get a session for a turn, restoring or creating it, and mark it in use."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            state = await self._run_store(self._load, session_id)
+            # A turn of the same session may have restored or created it meanwhile;
+            # only the first load found the state, so theirs is the one to keep
+            session = self.sessions.get(session_id)
+        if session is None:
+            session = _Session(TravelioChatbot(
+                response_cache=self.response_cache,
+                mcp_client=self.mcp_client,
+                llm_http_client=self.llm_client,
+                function_calling=self.function_calling
+            ))
+            if state is not None:
+                session.chatbot.load_dict(state)
+                self.restored += 1
+            else:
+                self.created += 1
+            self.sessions[session_id] = session
+        
+        self.sessions.move_to_end(session_id)
+        session.users += 1
+        await self._evict()
+        return session
+    
+    async def _evict(self):
+        """Evict the least recently used idle sessions beyond ``max_sessions``."""
+        excess = len(self.sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        
+        # Pick and remove the victims before awaiting, so concurrent turns see a consistent store
+        idle = ((session_id, session) for session_id, session in self.sessions.items() if not session.users)
+        victims = list(islice(idle, excess))
+        spills = []
+        for session_id, session in victims:
+            del self.sessions[session_id]
+            # Issued before any await, so a later load of the session runs after it
+            spills.append(self._run_store(self._spill, session_id, self._encode(session)))
+        self.evicted += len(victims)
+        
+        await asyncio.gather(*spills)
+        for _, session in victims:
+            # Only drops the prefetch; the pools are shared
+            await session.chatbot.close()
+    
+    def _run_store(self, function: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        """Queue a spill store operation on its worker thread; resolves to None without a store."""
+        if self._db_executor is None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+            return future
+        return asyncio.get_running_loop().run_in_executor(self._db_executor, function, *args)
+    
+    @staticmethod
+    def _encode(session: _Session) -> str:
+        """Encode a session's state for the spill store; on the event loop, which owns the state."""
+        return json.dumps(session.chatbot.to_dict(), separators=(",", ":"))
+    
+    def _spill(self, session_id: str, state: str):
+        """Write a session's state to the spill store; runs on the store's worker thread."""
+        known = self._db.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+        self._db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)", (session_id, state))
+        self._db.commit()
+        if not known:
+            self._spilled += 1
+    
+    def _load(self, session_id: str) -> Optional[Dict]:
+        """Take a session's state out of the spill store, if it is there; runs on the store's worker thread."""
+        row = self._db.execute("SELECT state FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        # The resident session is the only copy from now on
+        self._delete(session_id)
+        return json.loads(row[0])
+    
+    def _delete(self, session_id: str):
+        """Drop a session from the spill store; runs on the store's worker thread."""
+        if self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount:
+            self._spilled -= 1
+        self._db.commit()
+
+
+class MessageRequest(BaseModel):
+    message: str
+
+
+def create_session_app(service: ChatSessionService) -> FastAPI:
+    """
+    Create an HTTP application serving the sessions of a service.
+    
+    Args:
+        service: Service hosting the sessions; closed on shutdown
+        
+    Returns:
+        FastAPI application with ``POST /sessions/{id}/messages`` streaming
+        the reply as plain text, ``DELETE /sessions/{id}`` and ``GET /stats``
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await service.close()
+    
+    app = FastAPI(lifespan=lifespan)
+    
+    @app.post("/sessions/{session_id}/messages")
+    async def post_message(session_id: str, request: MessageRequest):
+        return StreamingResponse(service.stream_command(session_id, request.message), media_type="text/plain")
+    
+    @app.delete("/sessions/{session_id}")
+    async def delete_session(session_id: str):
+        await service.end_session(session_id)
+        return {"deleted": session_id}
+    
+    @app.get("/stats")
+    async def stats():
+        return service.stats()
+    
+    return app
+
+
+def main():
+    import uvicorn
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--spill-path")
+    parser.add_argument("--max-connections", type=int, default=100)
+    args = parser.parse_args()
+    
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    service = ChatSessionService(
+        os.getenv("MCP_SERVER_URL", "http://localhost:8000"),
+        max_sessions=args.max_sessions,
+        spill_path=args.spill_path,
+        response_cache=ResponseCache(path=cache_path) if cache_path else None,
+        max_connections=args.max_connections
+    )
+    uvicorn.run(create_session_app(service), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
 from typing import List, Dict, Any
-import numpy as np
-from sklearn.cluster import KMeans
 from math import radians, sin, cos, sqrt, atan2
 
 class AttractionClusterer:
@@ -24,6 +22,10 @@ class AttractionClusterer:
             # If fewer attractions than clusters, adjust the number of clusters
             num_clusters = max(1, len(attractions))
         
+        # Imported on first use; sklearn dominates the server's import time
+        import numpy as np
+        from sklearn.cluster import KMeans
+        
         # Extract coordinates for clustering
         coordinates = np.array([[a["latitude"], a["longitude"]] for a in attractions])
         
@@ -0,0 +1,142 @@
+"""Per-request deadlines propagated through context variables."""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Deadline of the request running in the current context
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs out of time or was cancelled."""
+
+
+class Deadline:
+    """
+    Time budget of a request, shared by everything it runs.
+    
+    Context variables are copied into executor threads, so blocking work can
+    poll ``check()`` between stages and stop once the request has timed out or
+    was cancelled by its caller.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None, parent: Optional["Deadline"] = None):
+        """
+        Initialize the deadline.
+        
+        Args:
+            timeout: Seconds from now; None for no limit of its own
+            parent: Enclosing deadline, which also bounds this one
+        """
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+        self.parent = parent
+        self.cancelled = False
+        
+        if parent is not None and parent.expires_at is not None:
+            if self.expires_at is None or parent.expires_at < self.expires_at:
+                self.expires_at = parent.expires_at
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left, never negative, or None without a time limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def is_cancelled(self) -> bool:
+        """Whether this request or an enclosing one was cancelled."""
+        return self.cancelled or (self.parent is not None and self.parent.is_cancelled())
+    
+    def expired(self) -> bool:
+        """Whether the request should stop."""
+        return self.is_cancelled() or self.remaining() == 0.0
+    
+    def cancel(self):
+        """Tell remaining stages of the request to stop."""
+        self.cancelled = True
+    
+    def check(self):
+        """
+        Raise if the request should stop.
+        
+        Raises:
+            DeadlineExceeded: If the deadline passed or the request was cancelled
+        """
+        if self.is_cancelled():
+            raise DeadlineExceeded("Request was cancelled")
+        if self.remaining() == 0.0:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the current request, if any."""
+    return _current_deadline.get()
+
+
+def check_deadline():
+    """Raise ``DeadlineExceeded`` if the current request should stop."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float] = None):
+    """
+    Run the enclosed block under a deadline, nested within the current one.
+    
+    The scope's deadline is cancelled on exit, so executor work still running
+    for an abandoned request stops at its next ``check_deadline()``.
+    
+    Args:
+        timeout: Seconds allowed for the block; None inherits the enclosing limit
+        
+    Yields:
+        The scope's Deadline
+    """
+    deadline = Deadline(timeout, _current_deadline.get())
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        deadline.cancel()
+        _current_deadline.reset(token)
+
+
+async def run_with_deadline(awaitable):
+    """
+    Await within the current deadline.
+    
+    Raises:
+        DeadlineExceeded: If the deadline passes first
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return await awaitable
+    
+    try:
+        deadline.check()
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+    
+    try:
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+async def run_in_executor(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking work in a thread without blocking the event loop.
+    
+    The thread sees the caller's context, including its deadline, and the
+    caller stops waiting once the deadline passes.
+    """
+    check_deadline()
+    return await run_with_deadline(asyncio.to_thread(fn, *args, **kwargs))
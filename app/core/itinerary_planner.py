@@ -4,6 +4,8 @@ import json
 from math import radians, sin, cos, sqrt, atan2
 
 from app.core.config import settings
+from app.core.tracing import traced
+from app.core.deadline import check_deadline
 
 class ItineraryPlanner:
     """
@@ -59,6 +61,9 @@ class ItineraryPlanner:
         
         # Create day plans
         for day_number in range(1, num_days + 1):
+            # Stop planning for requests that timed out or were cancelled
+            check_deadline()
+            
             day_date = start_date_obj + timedelta(days=day_number - 1)
             cluster_idx = day_number - 1
             
@@ -88,6 +93,7 @@ class ItineraryPlanner:
         
         return itinerary
     
+    @traced(kind="cpu")
     def _create_day_activities(self, attractions: List[Dict], day_date: date) -> List[Dict]:
         """
         Create a sequence of activities for a day based on attractions.
@@ -0,0 +1,153 @@
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from bisect import bisect_left
+
+RankKey = Tuple[bool, float, int]
+
+
+class AttractionRanking:
+    """
+    Attractions of one destination kept sorted by must-visit status and rating.
+    
+    Writes insert or remove single entries with binary search, so top-N
+    lookups are a prefix read and never re-sort the destination's attractions.
+    A sorted list per category backs the category-diverse variant.
+    """
+    
+    def __init__(self, attractions: Iterable[Dict[str, Any]] = ()):
+        """
+        Build the ranking.
+        
+        Args:
+            attractions: Attraction dictionaries of a single destination
+        """
+        entries = sorted((self.rank_key(a), a) for a in attractions)
+        
+        self._keys: List[RankKey] = [key for key, _ in entries]
+        self._items: List[Dict[str, Any]] = [attraction for _, attraction in entries]
+        self._entries_by_id: Dict[int, Tuple[RankKey, str]] = {}
+        self._category_keys: Dict[str, List[RankKey]] = {}
+        self._category_items: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for key, attraction in entries:
+            category = attraction.get("category")
+            self._entries_by_id[attraction["id"]] = (key, category)
+            self._category_keys.setdefault(category, []).append(key)
+            self._category_items.setdefault(category, []).append(attraction)
+    
+    @staticmethod
+    def rank_key(attraction: Dict[str, Any]) -> RankKey:
+        """Sort key: must-visit first, then by rating (descending), then by ID."""
+        return (not attraction.get("is_must_visit"), -(attraction.get("rating") or 0.0), attraction["id"])
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __contains__(self, attraction_id: int) -> bool:
+        return attraction_id in self._entries_by_id
+    
+    def get(self, attraction_id: int) -> Optional[Dict[str, Any]]:
+        """Get an attraction in the ranking by ID."""
+        entry = self._entries_by_id.get(attraction_id)
+        if entry is None:
+            return None
+        return self._items[bisect_left(self._keys, entry[0])]
+    
+    def upsert(self, attraction: Dict[str, Any]):
+        """
+        Insert an attraction, or move it to its new position if it is already ranked.
+        
+        Args:
+            attraction: Attraction dictionary
+        """
+        self.remove(attraction["id"])
+        
+        key = self.rank_key(attraction)
+        category = attraction.get("category")
+        self._insert(self._keys, self._items, key, attraction)
+        self._insert(
+            self._category_keys.setdefault(category, []),
+            self._category_items.setdefault(category, []),
+            key,
+            attraction
+        )
+        self._entries_by_id[attraction["id"]] = (key, category)
+    
+    def remove(self, attraction_id: int) -> bool:
+        """
+        Remove an attraction from the ranking.
+        
+        Args:
+            attraction_id: ID of the attraction
+            
+        Returns:
+            True if the attraction was ranked
+        """
+        entry = self._entries_by_id.pop(attraction_id, None)
+        if entry is None:
+            return False
+        
+        key, category = entry
+        self._delete(self._keys, self._items, key)
+        self._delete(self._category_keys[category], self._category_items[category], key)
+        if not self._category_keys[category]:
+            del self._category_keys[category]
+            del self._category_items[category]
+        return True
+    
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the top attractions.
+        
+        Args:
+            limit: Maximum number of attractions to return
+            
+        Returns:
+            List of attraction dictionaries, best first
+        """
+        return self._items[:limit]
+    
+    def top_diverse(self, limit: int, max_per_category: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get top attractions spread across categories.
+        
+        Categories take turns: each round contributes the next-best attraction
+        of every category, in rank order, so a destination with many highly
+        rated beaches still surfaces its best temples and museums.
+        
+        Args:
+            limit: Maximum number of attractions to return
+            max_per_category: Optional cap on attractions per category
+            
+        Returns:
+            List of attraction dictionaries
+        """
+        selected = []
+        depth = 0
+        while len(selected) < limit and (max_per_category is None or depth < max_per_category):
+            round_entries = sorted(
+                (keys[depth], category)
+                for category, keys in self._category_keys.items()
+                if len(keys) > depth
+            )
+            if not round_entries:
+                break
+            
+            for _, category in round_entries[:limit - len(selected)]:
+                selected.append(self._category_items[category][depth])
+            depth += 1
+        
+        return selected
+    
+    @staticmethod
+    def _insert(keys: List[RankKey], items: List[Dict[str, Any]], key: RankKey, item: Dict[str, Any]):
+        """Insert an item into parallel sorted key/item lists."""
+        index = bisect_left(keys, key)
+        keys.insert(index, key)
+        items.insert(index, item)
+    
+    @staticmethod
+    def _delete(keys: List[RankKey], items: List[Dict[str, Any]], key: RankKey):
+        """Delete an item from parallel sorted key/item lists."""
+        index = bisect_left(keys, key)
+        del keys[index]
+        del items[index]
@@ -0,0 +1,130 @@
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+from collections import Counter, defaultdict
+from math import ceil
+import heapq
+import re
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split text into pg_trgm-style trigrams.
+    
+    Each lowercased word is padded with two leading spaces and one trailing
+    space, so short words and word starts still produce trigrams.
+    
+    Args:
+        text: Text to split
+        
+    Returns:
+        Set of trigrams
+    """
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    In-memory trigram index for fuzzy substring search over documents.
+    
+    Each indexed field of each document gets an inverted posting list per
+    trigram, so a query only touches documents sharing at least one trigram
+    with the search term instead of scanning the whole catalog.
+    """
+    
+    def __init__(
+        self,
+        documents: Sequence[Dict[str, Any]],
+        fields: Sequence[str],
+        rank_field: Optional[str] = None,
+        threshold: float = 0.3
+    ):
+        """
+        Build the index.
+        
+        Args:
+            documents: Documents (dictionaries) to index
+            fields: Names of the text fields to index
+            rank_field: Optional numeric field used to break similarity ties
+            threshold: Minimum word similarity for a document to match
+        """
+        self.documents = list(documents)
+        self.fields = tuple(fields)
+        self.rank_field = rank_field
+        self.threshold = threshold
+        
+        # Entries are (document, field) pairs numbered document_index * len(fields) + field_index
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._sizes: List[int] = []
+        self._texts: List[str] = []
+        
+        for document in self.documents:
+            for field in self.fields:
+                entry = len(self._sizes)
+                text = (document.get(field) or "").lower()
+                grams = trigrams(text)
+                
+                self._sizes.append(len(grams))
+                self._texts.append(text)
+                for gram in grams:
+                    self._postings[gram].append(entry)
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def search(self, term: str, limit: Optional[int] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Find documents matching a search term, tolerating typos.
+        
+        A field's score is the fraction of the term's trigrams it contains
+        (pg_trgm's word similarity), or 1.0 when it contains the term verbatim.
+        Documents are ranked by their best field score, then by ``rank_field``.
+        
+        Args:
+            term: Search term
+            limit: Optional maximum number of results
+            
+        Returns:
+            List of (score, document) tuples, best match first
+        """
+        query = term.lower().strip()
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        
+        shared = Counter()
+        for gram in query_grams:
+            postings = self._postings.get(gram)
+            if postings:
+                shared.update(postings)
+        
+        # Entries sharing too few trigrams can never reach the threshold
+        num_query_grams = len(query_grams)
+        min_shared = max(1, ceil(self.threshold * num_query_grams - 1e-9))
+        num_fields = len(self.fields)
+        scores: Dict[int, float] = {}
+        
+        for entry in [entry for entry, count in shared.items() if count >= min_shared]:
+            score = 1.0 if query in self._texts[entry] else shared[entry] / num_query_grams
+            doc_index = entry // num_fields
+            if score > scores.get(doc_index, 0.0):
+                scores[doc_index] = score
+        
+        rank_field = self.rank_field
+        documents = self.documents
+        
+        def rank(item: Tuple[int, float]):
+            doc_index, score = item
+            popularity = (documents[doc_index].get(rank_field) or 0) if rank_field else 0
+            return (-round(score, 2), -popularity)
+        
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, scores.items(), key=rank)
+        else:
+            ranked = sorted(scores.items(), key=rank)
+        
+        return [(score, documents[doc_index]) for doc_index, score in ranked]
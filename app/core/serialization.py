@@ -0,0 +1,41 @@
+"""Fast JSON serialization of tool results."""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+# Cluster results are keyed by int; numpy scalars come out of the clusterer
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact JSON bytes.
+    
+    ``date``, ``time`` and ``datetime`` values are written natively as ISO 8601
+    strings, so results can carry them unconverted.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON bytes or text."""
+    return orjson.loads(data)
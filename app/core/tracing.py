@@ -0,0 +1,241 @@
+"""Lightweight hierarchical tracing exported as JSON lines."""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Innermost open span of the current context
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+    
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes", "start", "_start_counter", "duration_ms", "error")
+    
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(64):016x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start = time.time()
+        self._start_counter = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+    
+    def finish(self, error: Optional[BaseException] = None):
+        """Record the span's duration and outcome."""
+        self.duration_ms = (time.perf_counter() - self._start_counter) * 1000
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable dictionary."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class JsonLinesExporter:
+    """
+    Append finished spans to a file, one JSON object per line.
+    
+    Spans are buffered per trace and handed to a writer thread when the
+    trace's root span finishes, so each trace's spans are written together
+    however many requests interleave, and no file I/O runs on the event
+    loop. ``flush`` writes out what is buffered and waits for the writes.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+        
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+        self.pid = os.getpid()
+        self._buffers: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+    
+    def export(self, span: Span):
+        """Buffer a finished span, queueing its trace for writing after the root span."""
+        record = span.to_dict()
+        record["pid"] = self.pid
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._buffers.setdefault(span.trace_id, []).append(line)
+            if span.parent_id is None:
+                self._submit(self._buffers.pop(span.trace_id))
+    
+    def flush(self):
+        """Write out buffered spans, including those of unfinished traces, and wait for the writes."""
+        with self._lock:
+            for lines in self._buffers.values():
+                self._submit(lines)
+            self._buffers.clear()
+        self._queue.join()
+    
+    def _submit(self, lines: List[str]):
+        """Queue one trace's lines for the writer thread, starting it on first use; called under the lock."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="trace-export", daemon=True)
+            self._writer.start()
+        self._queue.put("\n".join(lines) + "\n")
+    
+    def _run(self):
+        """Append queued traces to the file, each batch of waiting ones with a single write."""
+        while True:
+            chunks = [self._queue.get()]
+            while not self._queue.empty():
+                chunks.append(self._queue.get_nowait())
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(chunks))
+            except OSError as e:
+                logger.warning("Dropped %d traces: %s", len(chunks), e)
+            finally:
+                for _ in chunks:
+                    self._queue.task_done()
+
+
+class Tracer:
+    """
+    Creates nested spans and hands finished ones to an exporter.
+    
+    Without an exporter tracing is disabled and spans cost one attribute check.
+    """
+    
+    def __init__(self, exporter: Optional[JsonLinesExporter] = None):
+        """
+        Initialize the tracer.
+        
+        Args:
+            exporter: Exporter for finished spans; None disables tracing
+        """
+        self.exporter = exporter
+    
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+    
+    def start_span(self, name: str, kind: str = "internal", **attributes) -> Optional[Span]:
+        """Start a child of the current span without making it current."""
+        if self.exporter is None:
+            return None
+        return Span(name, kind, _current_span.get(), attributes)
+    
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        """Finish and export a span started with ``start_span``."""
+        if span is not None and self.exporter is not None:
+            span.finish(error)
+            self.exporter.export(span)
+    
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes):
+        """Trace the enclosed block as a child of the current span."""
+        span = self.start_span(name, kind, **attributes)
+        if span is None:
+            yield None
+            return
+        
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+    
+    def traced(self, kind: str = "service", name: Optional[str] = None) -> Callable:
+        """
+        Decorate a function or coroutine function so each call is traced.
+        
+        Args:
+            kind: Span kind, e.g. "service" or "cpu"
+            name: Span name; defaults to the function's qualified name
+        """
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+            
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if self.exporter is None:
+                        return await fn(*args, **kwargs)
+                    with self.span(span_name, kind):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+            
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.exporter is None:
+                    return fn(*args, **kwargs)
+                with self.span(span_name, kind):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def attach_sql(self, engine: Engine):
+        """
+        Trace every SQL statement executed on an engine.
+        
+        Args:
+            engine: Engine to instrument; use ``AsyncEngine.sync_engine`` for async engines
+        """
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+    
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.exporter is not None:
+            span = self.start_span("sql", "sql", statement=statement[:500], executemany=executemany)
+            conn.info.setdefault("trace_spans", []).append(span)
+    
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            self.end_span(spans.pop())
+    
+    def _handle_error(self, exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            self.end_span(spans.pop(), exception_context.original_exception)
+
+
+tracer = Tracer(JsonLinesExporter(settings.TRACE_EXPORT_PATH) if settings.TRACE_EXPORT_PATH else None)
+traced = tracer.traced
@@ -0,0 +1,100 @@
+"""Row mappers for ORM-free catalog reads.
+
+Catalog reads select explicit columns and turn each result row straight into a
+dictionary, so no ORM instances are hydrated or tracked in the identity map.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from app.db.models.attraction import Attraction
+from app.db.models.destination import Destination
+from app.db.models.hotel import Hotel
+
+
+class RowMapper:
+    """
+    Precompiled mapper from a fixed column list to dictionaries.
+
+    The mapping function is generated once as a dict literal indexed by
+    position, which is roughly twice as fast as ``dict(zip(keys, row))``.
+    """
+
+    def __init__(self, *columns: Any):
+        """
+        Initialize the mapper.
+
+        Args:
+            columns: Mapped columns to select, in output key order
+        """
+        self.columns = tuple(columns)
+        self.keys = tuple(column.key for column in self.columns)
+        self._map_row = self._compile(self.keys)
+
+    @staticmethod
+    def _compile(keys: Sequence[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        """Generate the row-to-dict function for the given keys."""
+        items = ", ".join(f"{key!r}: row[{index}]" for index, key in enumerate(keys))
+        return eval(f"lambda row: {{{items}}}", {})
+
+    def select(self) -> Select:
+        """Build a SELECT over the mapper's columns."""
+        return select(*self.columns)
+
+    def __call__(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Map a single row to a dictionary."""
+        return self._map_row(row)
+
+    def map_all(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Map all rows to dictionaries."""
+        map_row = self._map_row
+        return [map_row(row) for row in rows]
+
+
+destination_mapper = RowMapper(
+    Destination.id,
+    Destination.name,
+    Destination.country,
+    Destination.description,
+    Destination.latitude,
+    Destination.longitude,
+    Destination.image_url,
+    Destination.popularity_score,
+)
+
+attraction_mapper = RowMapper(
+    Attraction.id,
+    Attraction.name,
+    Attraction.description,
+    Attraction.destination_id,
+    Attraction.category,
+    Attraction.latitude,
+    Attraction.longitude,
+    Attraction.image_url,
+    Attraction.rating,
+    Attraction.price_range,
+    Attraction.visit_duration_minutes,
+    Attraction.opening_hours,
+    Attraction.is_must_visit,
+)
+
+hotel_mapper = RowMapper(
+    Hotel.id,
+    Hotel.name,
+    Hotel.description,
+    Hotel.destination_id,
+    Hotel.address,
+    Hotel.latitude,
+    Hotel.longitude,
+    Hotel.image_url,
+    Hotel.rating,
+    Hotel.price_per_night,
+    Hotel.amenities,
+    Hotel.has_restaurant,
+    Hotel.has_pool,
+    Hotel.has_spa,
+    Hotel.has_gym,
+    Hotel.has_free_wifi,
+)
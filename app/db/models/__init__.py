@@ -2,4 +2,5 @@ from app.db.models.destination import Destination
 from app.db.models.attraction import Attraction
 from app.db.models.hotel import Hotel
 from app.db.models.itinerary import Itinerary, ItineraryDay, ItineraryActivity
-from app.db.models.itinerary_template import ItineraryTemplate
\ No newline at end of file
+from app.db.models.itinerary_template import ItineraryTemplate
+from app.db.models.catalog_version import CatalogVersion
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, JSON, Time, Boolean
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, JSON, Time, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -21,4 +21,13 @@ class Attraction(Base):
     is_must_visit = Column(Boolean, default=False, nullable=False)  # Flag for must-visit attractions
     
     # Relationships
-    destination = relationship("Destination", backref="attractions")
\ No newline at end of file
+    destination = relationship("Destination", backref="attractions")
+
+
+# Serves get_top_attractions/get_attractions: filter by destination, ordered by must-visit then rating
+Index(
+    "ix_attraction_destination_must_visit_rating",
+    Attraction.destination_id,
+    Attraction.is_must_visit.desc(),
+    Attraction.rating.desc()
+)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, BigInteger
+from app.db.base import Base
+
+
+class CatalogVersion(Base):
+    """Single-row generation of the catalog, increased by every committed catalog write."""
+    
+    id = Column(Integer, primary_key=True)
+    generation = Column(BigInteger, default=0, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -24,4 +24,8 @@ class Hotel(Base):
     has_free_wifi = Column(Boolean, default=True, nullable=False)
     
     # Relationships
-    destination = relationship("Destination", backref="hotels")
\ No newline at end of file
+    destination = relationship("Destination", backref="hotels")
+
+
+# Serves get_hotels/get_hotels_near_point: filter by destination, ordered by rating
+Index("ix_hotel_destination_rating", Hotel.destination_id, Hotel.rating)
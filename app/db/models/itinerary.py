@@ -29,7 +29,7 @@ class ItineraryDay(Base):
     """Itinerary day model."""
     
     id = Column(Integer, primary_key=True, index=True)
-    itinerary_id = Column(Integer, ForeignKey("itinerary.id"), nullable=False)
+    itinerary_id = Column(Integer, ForeignKey("itinerary.id"), index=True, nullable=False)
     day_number = Column(Integer, nullable=False)  # Day 1, Day 2, etc.
     date = Column(Date, nullable=False)
     hotel_id = Column(Integer, ForeignKey("hotel.id"), nullable=True)  # Optional different hotel for this day
@@ -44,7 +44,7 @@ class ItineraryActivity(Base):
     """Itinerary activity model."""
     
     id = Column(Integer, primary_key=True, index=True)
-    day_id = Column(Integer, ForeignKey("itineraryday.id"), nullable=False)
+    day_id = Column(Integer, ForeignKey("itineraryday.id"), index=True, nullable=False)
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
     activity_type = Column(String(50), nullable=False)  # 'attraction', 'transfer', 'meal', 'free_time'
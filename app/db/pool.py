@@ -0,0 +1,49 @@
+"""Connection pool instrumentation."""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_seconds += elapsed
+            self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """
+    Return size, usage and wait stats of a connection pool.
+
+    Pools without queue semantics (e.g. ``StaticPool``) report no usage stats.
+    """
+    stats: Dict[str, Any] = {}
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, TimedAsyncQueuePool):
+        stats.update(
+            checkouts_total=pool.wait_count,
+            wait_seconds_total=round(pool.wait_seconds, 6),
+            max_wait_seconds=round(pool.max_wait_seconds, 6),
+        )
+    return stats
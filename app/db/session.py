@@ -1,9 +1,13 @@
 # app/db/session.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from app.core.config import settings
+from app.core.deadline import current_deadline
+from app.core.tracing import tracer
+from app.db.pool import TimedAsyncQueuePool
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -14,6 +18,33 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory used by the services
+async_engine = create_async_engine(
+    settings.DATABASE_URI,
+    pool_pre_ping=True,
+    poolclass=TimedAsyncQueuePool,  # Records checkout wait time for /metrics
+)
+tracer.attach_sql(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def apply_statement_timeout(session, transaction, connection):
+    """
+    Bound the transaction's statements by the current request deadline.
+    
+    On PostgreSQL the remaining budget becomes a ``SET LOCAL statement_timeout``,
+    so abandoned queries are stopped by the server and release their connection.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return
+    
+    deadline.check()
+    remaining = deadline.remaining()
+    if remaining is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}")
+
+event.listen(Session, "after_begin", apply_statement_timeout)
+
 # Database dependency to be used in FastAPI endpoints
 def get_db():
     """
@@ -0,0 +1,122 @@
+"""Prebuilt statements for hot queries and SQL compile-cache instrumentation."""
+
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.sql import Executable
+
+from app.db.session import async_engine
+
+ShapeT = TypeVar("ShapeT", bound=Hashable)
+StatementT = TypeVar("StatementT", bound=Executable)
+
+
+class StatementRegistry:
+    """
+    Registry of prebuilt statements keyed on query name and filter shape.
+
+    Statements are built once per shape with bound parameters, so repeated
+    calls reuse the same statement object and hit SQLAlchemy's compiled cache
+    instead of rebuilding the filter chain.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._statements: Dict[Tuple[str, Hashable], Executable] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        name: str,
+        shape: ShapeT,
+        build: Callable[[ShapeT], StatementT]
+    ) -> StatementT:
+        """
+        Get the statement for a query shape, building it on first use.
+
+        Args:
+            name: Name of the query
+            shape: Hashable description of the filters present
+            build: Function building the statement for the shape
+
+        Returns:
+            The cached statement
+        """
+        key = (name, shape)
+        statement = self._statements.get(key)
+        if statement is None:
+            with self._lock:
+                statement = self._statements.get(key)
+                if statement is None:
+                    built = build(shape)
+                    self._statements[key] = built
+                    self.misses += 1
+                    return built
+
+        # Also a hit when another thread built the statement while this one
+        # waited; the builders of a name all return one statement type
+        self.hits += 1
+        return cast(StatementT, statement)
+
+    def items(self):
+        """Return the registered ((name, shape), statement) pairs."""
+        return list(self._statements.items())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return registry size and hit rate."""
+        total = self.hits + self.misses
+        return {
+            "statements": len(self._statements),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class CompileCacheStats:
+    """Count SQLAlchemy compiled-cache hits and misses for an engine."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def attach(self, engine: Engine):
+        """
+        Listen to statement executions on a (sync) engine.
+
+        Args:
+            engine: Engine to instrument; use ``AsyncEngine.sync_engine`` for async engines
+        """
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """Record the cache outcome of one execution."""
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit == CACHE_HIT:
+            self.hits += 1
+        elif cache_hit == CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate over cacheable statements."""
+        cacheable = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": self.hits / cacheable if cacheable else 0.0
+        }
+
+
+statement_registry = StatementRegistry()
+compile_cache_stats = CompileCacheStats()
+compile_cache_stats.attach(async_engine.sync_engine)
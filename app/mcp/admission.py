@@ -0,0 +1,207 @@
+"""Admission control for MCP tool calls."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.deadline import current_deadline
+from app.mcp.metrics import Histogram
+
+# Global queue priorities; lower is served first
+READ_PRIORITY = 0
+WRITE_PRIORITY = 1
+
+
+class ToolRejected(Exception):
+    """Raised when a tool call is not admitted because the server is saturated."""
+    
+    def __init__(self, tool: str, reason: str):
+        super().__init__(f"Server busy, {tool} call rejected ({reason}); retry later")
+        self.tool = tool
+        self.reason = reason
+
+
+class PriorityLimiter:
+    """
+    Concurrency limiter whose waiters are served by priority, then in arrival order.
+    
+    A released slot is handed directly to the next waiter, so late arrivals
+    cannot overtake queued calls.
+    """
+    
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+        
+        Args:
+            limit: Maximum number of concurrent holders
+        """
+        self.limit = limit
+        self.active = 0
+        self._waiters: List[list] = []
+        self._sequence = itertools.count()
+    
+    async def acquire(self, priority: int = 0, timeout: Optional[float] = None):
+        """
+        Acquire a slot, waiting at most ``timeout`` seconds.
+        
+        Raises:
+            asyncio.TimeoutError: If no slot became free in time
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), future])
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # The slot was handed over while we were giving up
+                self.release()
+            else:
+                future.cancel()
+            raise
+    
+    def release(self):
+        """Release a slot, handing it to the first live waiter if any."""
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Per-tool concurrency limits in front of a global limit with a bounded queue.
+    
+    A call first takes a slot of its tool's limiter, then a global slot. Read
+    tools are queued ahead of other tools for global slots, so bursts of
+    expensive planning calls cannot starve cheap reads. Calls are rejected
+    at once when ``max_queue`` calls are already waiting, and after
+    ``queue_timeout`` seconds without a slot.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int,
+        tool_limits: Dict[str, int],
+        default_tool_limit: int,
+        max_queue: int,
+        queue_timeout: float
+    ):
+        """
+        Initialize the controller.
+        
+        Args:
+            max_concurrency: Maximum tool calls running at once
+            tool_limits: Concurrency limits of specific tools
+            default_tool_limit: Concurrency limit of other tools
+            max_queue: Maximum calls waiting for a slot
+            queue_timeout: Seconds a call may wait for a slot; 0 rejects instead of queuing
+        """
+        self.tool_limits = dict(tool_limits)
+        self.default_tool_limit = default_tool_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.global_limiter = PriorityLimiter(max_concurrency)
+        self._tool_limiters: Dict[str, PriorityLimiter] = {}
+        self.waiting: Dict[str, int] = {}
+        self.rejections: Dict[tuple, int] = {}
+        self.queue_wait: Dict[str, Histogram] = {}
+    
+    @asynccontextmanager
+    async def admit(self, tool: str, read_only: bool = False):
+        """
+        Hold a slot for a tool call for the duration of the block.
+        
+        Args:
+            tool: Name of the tool
+            read_only: Whether the tool is a cheap read served with priority
+            
+        Raises:
+            ToolRejected: If the call is not admitted
+        """
+        if sum(self.waiting.values()) >= self.max_queue:
+            self._reject(tool, "queue_full")
+        
+        tool_limiter = self._tool_limiters.get(tool)
+        if tool_limiter is None:
+            limit = self.tool_limits.get(tool, self.default_tool_limit)
+            tool_limiter = self._tool_limiters[tool] = PriorityLimiter(limit)
+        
+        # Never queue past the request's own deadline
+        queue_timeout = self.queue_timeout
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() is not None:
+            queue_timeout = min(queue_timeout, deadline.remaining())
+        
+        start = time.perf_counter()
+        self.waiting[tool] = self.waiting.get(tool, 0) + 1
+        try:
+            try:
+                await tool_limiter.acquire(timeout=queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject(tool, "timeout")
+            
+            remaining = max(0.0, queue_timeout - (time.perf_counter() - start))
+            priority = READ_PRIORITY if read_only else WRITE_PRIORITY
+            try:
+                await self.global_limiter.acquire(priority, timeout=remaining)
+            except BaseException as e:
+                tool_limiter.release()
+                if isinstance(e, asyncio.TimeoutError):
+                    self._reject(tool, "timeout")
+                raise
+        finally:
+            self.waiting[tool] -= 1
+        
+        histogram = self.queue_wait.get(tool)
+        if histogram is None:
+            histogram = self.queue_wait[tool] = Histogram()
+        histogram.observe(time.perf_counter() - start)
+        
+        try:
+            yield
+        finally:
+            self.global_limiter.release()
+            tool_limiter.release()
+    
+    def _reject(self, tool: str, reason: str):
+        key = (tool, reason)
+        self.rejections[key] = self.rejections.get(key, 0) + 1
+        raise ToolRejected(tool, reason)
+    
+    def render(self) -> str:
+        """Render queue depth, rejections and queue wait in the Prometheus text format."""
+        lines = [
+            "# TYPE travelio_admission_active gauge",
+            f"travelio_admission_active {self.global_limiter.active}",
+            "# TYPE travelio_admission_queue_depth gauge",
+        ]
+        lines += [f'travelio_admission_queue_depth{{tool="{tool}"}} {count}' for tool, count in sorted(self.waiting.items())]
+        lines.append("# TYPE travelio_admission_rejections_total counter")
+        lines += [
+            f'travelio_admission_rejections_total{{tool="{tool}",reason="{reason}"}} {count}'
+            for (tool, reason), count in sorted(self.rejections.items())
+        ]
+        lines.append("# TYPE travelio_admission_queue_wait_seconds histogram")
+        for tool, histogram in sorted(self.queue_wait.items()):
+            lines += histogram.render("travelio_admission_queue_wait_seconds", f'tool="{tool}"')
+        return "\n".join(lines) + "\n"
+
+
+admission = AdmissionController(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    tool_limits=settings.ADMISSION_TOOL_LIMITS,
+    default_tool_limit=settings.ADMISSION_DEFAULT_TOOL_LIMIT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
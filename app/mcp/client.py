@@ -1,10 +1,12 @@
 import asyncio
 import os
-from dotenv import load_dotenv
-import google.generativeai as genai  # Use Google Generative AI library
 import subprocess
 
 async def main():
+    # Imported on use; google.generativeai alone takes seconds to import
+    from dotenv import load_dotenv
+    import google.generativeai as genai  # Use Google Generative AI library
+
     # Load environment variables
     load_dotenv()
 
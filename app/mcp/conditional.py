@@ -0,0 +1,23 @@
+"""Conditional tool results keyed on version tokens."""
+
+from typing import Any, Awaitable, Callable, Dict
+
+
+async def conditional_result(version: str, if_none_match: str, load: Callable[[], Awaitable[Any]]) -> Dict:
+    """
+    Return versioned data, or a short reply if the caller's copy is current.
+    
+    Read the version before loading: if the data changes in between, the
+    caller holds newer data under an older token and simply refetches once.
+    
+    Args:
+        version: Current version token of the data
+        if_none_match: Version token of the caller's copy; empty if it has none
+        load: Coroutine function loading the data, only called if it changed
+        
+    Returns:
+        ``{"version", "not_modified": True}`` if unchanged, else ``{"version", "data"}``
+    """
+    if if_none_match == version:
+        return {"version": version, "not_modified": True}
+    return {"version": version, "data": await load()}
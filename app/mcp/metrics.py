@@ -0,0 +1,190 @@
+"""Per-tool call metrics rendered in the Prometheus text format."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.tracing import tracer
+from app.db.pool import pool_stats
+from app.db.session import async_engine
+
+# Latency bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Phase durations of the tool call running in the current context
+_current_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("tool_phases", default=None)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Bucket upper bounds in ascending order
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def render(self, name: str, labels: str) -> List[str]:
+        """Render the histogram's sample lines."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ToolMetrics:
+    """
+    Call counts, error counts and phase latency histograms per MCP tool.
+
+    A tool call's ``total`` latency is broken down into phases: ``db`` is
+    accumulated from SQL statement executions, ``clustering`` and ``planning``
+    from ``phase()`` blocks, and ``serialization`` is observed where results
+    are encoded. Phases a call never entered are not observed for it.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+
+    @contextmanager
+    def track_call(self, tool: str):
+        """Count a tool call and observe its latency and phase breakdown."""
+        phases: Dict[str, float] = {}
+        token = _current_phases.set(phases)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_phases.reset(token)
+            self.calls[tool] = self.calls.get(tool, 0) + 1
+            self.observe(tool, "total", elapsed)
+            for name, seconds in phases.items():
+                self.observe(tool, name, seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Attribute the time spent in the block to a phase of the current tool call, tracing it as a CPU stage."""
+        start = time.perf_counter()
+        try:
+            with tracer.span(name, "cpu"):
+                yield
+        finally:
+            self.add_phase_time(name, time.perf_counter() - start)
+
+    def add_phase_time(self, name: str, seconds: float):
+        """Add time to a phase of the current tool call, if any."""
+        phases = _current_phases.get()
+        if phases is not None:
+            phases[name] = phases.get(name, 0.0) + seconds
+
+    def observe(self, tool: str, phase: str, seconds: float):
+        """Record a latency observation for a tool phase."""
+        histogram = self.latency.get((tool, phase))
+        if histogram is None:
+            histogram = self.latency[(tool, phase)] = Histogram()
+        histogram.observe(seconds)
+
+    def attach_db_timing(self, engine: Engine):
+        """
+        Attribute SQL execution time on an engine to the ``db`` phase.
+
+        Args:
+            engine: Engine to instrument; use ``AsyncEngine.sync_engine`` for async engines
+        """
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.add_phase_time("db", time.perf_counter() - conn.info["query_start"].pop())
+
+    def _handle_error(self, context):
+        # A failed statement never reaches after_cursor_execute; drop its start
+        # so the stack stays balanced, counting the time it took
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            self.add_phase_time("db", time.perf_counter() - starts.pop())
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format."""
+        lines = [
+            "# HELP travelio_tool_calls_total MCP tool calls.",
+            "# TYPE travelio_tool_calls_total counter",
+        ]
+        lines += [f'travelio_tool_calls_total{{tool="{tool}"}} {count}' for tool, count in sorted(self.calls.items())]
+        lines += [
+            "# HELP travelio_tool_errors_total MCP tool calls that raised.",
+            "# TYPE travelio_tool_errors_total counter",
+        ]
+        lines += [f'travelio_tool_errors_total{{tool="{tool}"}} {count}' for tool, count in sorted(self.errors.items())]
+        lines += [
+            "# HELP travelio_tool_latency_seconds MCP tool latency by phase.",
+            "# TYPE travelio_tool_latency_seconds histogram",
+        ]
+        for (tool, phase), histogram in sorted(self.latency.items()):
+            lines += histogram.render("travelio_tool_latency_seconds", f'tool="{tool}",phase="{phase}"')
+        return "\n".join(lines) + "\n"
+
+
+def render_pool_metrics(pool) -> str:
+    """Render connection pool stats in the Prometheus text format."""
+    lines = []
+    for name, value in pool_stats(pool).items():
+        metric = f"travelio_db_pool_{name}"
+        kind = "counter" if name.endswith("_total") else "gauge"
+        lines += [f"# TYPE {metric} {kind}", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def render_compile_cache_metrics(compile_stats: Dict, registry_stats: Dict) -> str:
+    """Render SQL compile-cache and statement registry stats in the Prometheus text format."""
+    metrics = [
+        ("travelio_sql_compile_cache_hits_total", "counter", compile_stats["hits"]),
+        ("travelio_sql_compile_cache_misses_total", "counter", compile_stats["misses"]),
+        ("travelio_sql_compile_uncached_total", "counter", compile_stats["uncached"]),
+        ("travelio_sql_compile_cache_hit_ratio", "gauge", round(compile_stats["hit_rate"], 6)),
+        ("travelio_sql_statements", "gauge", registry_stats["statements"]),
+        ("travelio_sql_statement_registry_hits_total", "counter", registry_stats["hits"]),
+        ("travelio_sql_statement_registry_misses_total", "counter", registry_stats["misses"]),
+    ]
+    lines = []
+    for metric, kind, value in metrics:
+        lines += [f"# TYPE {metric} {kind}", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+tool_metrics = ToolMetrics()
+tool_metrics.attach_db_timing(async_engine.sync_engine)
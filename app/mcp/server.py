@@ -1,15 +1,37 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Union
+from datetime import date
+import functools
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent
+from app.core.config import settings
+from app.mcp.wrapper import InFlightTracker, create_asgi_app, serialize_result
+from app.mcp.metrics import tool_metrics, render_pool_metrics, render_compile_cache_metrics
+from app.mcp.admission import admission
+from app.mcp.warmup import Warmup, warm_pool
+from app.mcp.conditional import conditional_result
+from app.core.tracing import tracer
+from app.core.deadline import deadline_scope, run_with_deadline, run_in_executor
+from app.db.session import async_engine
+from app.db.statements import compile_cache_stats, statement_registry
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 from app.services.destination_service import DestinationService
 from app.services.attraction_service import AttractionService
 from app.services.hotel_service import HotelService
 from app.services.itinerary_service import ItineraryService
+from app.services.catalog_cache import catalog_cache
 from app.core.clustering import AttractionClusterer
 from app.core.itinerary_planner import ItineraryPlanner
 
-# Initialize FastMCP server
-mcp = FastMCP("Travelio")
+# Initialize FastMCP server; stateless so any worker process can serve any request
+mcp = FastMCP(
+    "Travelio",
+    host=settings.SERVER_HOST,
+    port=settings.SERVER_PORT,
+    stateless_http=True,
+    json_response=True
+)
 
 # Initialize services
 destination_service = DestinationService()
@@ -19,51 +41,97 @@ itinerary_service = ItineraryService()
 clusterer = AttractionClusterer()
 planner = ItineraryPlanner()
 
-@mcp.tool()
-async def get_destinations(search_term: Optional[str] = None) -> List[Dict]:
+# Registered tools by name, and the calls currently running
+tools: Dict[str, Callable[..., Awaitable[Any]]] = {}
+in_flight = InFlightTracker()
+
+def tool(read_only: bool = False):
+    """Register a coroutine as an MCP tool whose calls are tracked for draining, admission, metrics and tracing.
+    
+    Args:
+        read_only: Whether the tool is a cheap read, admitted ahead of other tools
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            # The deadline covers queueing too; leaving the scope stops abandoned executor work
+            with deadline_scope(settings.TOOL_TIMEOUT_SECONDS):
+                async with in_flight.track(), admission.admit(fn.__name__, read_only):
+                    with tool_metrics.track_call(fn.__name__), tracer.span(fn.__name__, "tool"):
+                        return await run_with_deadline(fn(*args, **kwargs))
+        
+        @functools.wraps(fn)
+        async def mcp_wrapper(*args, **kwargs):
+            # Serialize here rather than in FastMCP, which pretty-prints via pydantic
+            result = await wrapper(*args, **kwargs)
+            return TextContent(type="text", text=serialize_result(fn.__name__, result).decode())
+        
+        tools[fn.__name__] = wrapper
+        mcp.tool(structured_output=False)(mcp_wrapper)
+        return wrapper
+    return decorator
+
+async def catalog_result(if_none_match: Optional[str], load: Callable[[], Awaitable[Any]]) -> Any:
+    """Load catalog data, versioned by the catalog version if the caller asked for a conditional result."""
+    if if_none_match is None:
+        return await load()
+    return await conditional_result(await catalog_cache.version(), if_none_match, load)
+
+@tool(read_only=True)
+async def get_destinations(search_term: Optional[str] = None, if_none_match: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Get all destinations or search by name.
     
     Args:
         search_term: Optional search term to filter destinations
+        if_none_match: Optional version from a previous result ("" if none); the result
+            is then {"version", "data"}, or {"version", "not_modified": true} if unchanged
     """
-    return await destination_service.get_destinations(search_term)
+    return await catalog_result(if_none_match, lambda: destination_service.get_destinations(search_term))
 
-@mcp.tool()
-async def get_attractions(destination_id: int, filters: Dict = {}) -> List[Dict]:
+@tool(read_only=True)
+async def get_attractions(destination_id: int, filters: Dict = {}, if_none_match: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Get attractions for a destination.
     
     Args:
         destination_id: ID of the destination
         filters: Optional filters to apply (categories, ratings, etc.)
+        if_none_match: Optional version from a previous result ("" if none); the result
+            is then {"version", "data"}, or {"version", "not_modified": true} if unchanged
     """
-    return await attraction_service.get_attractions(destination_id, filters)
+    return await catalog_result(if_none_match, lambda: attraction_service.get_attractions(destination_id, filters))
 
-@mcp.tool()
-async def get_hotels(destination_id: int, filters: Dict = {}) -> List[Dict]:
+@tool(read_only=True)
+async def get_hotels(destination_id: int, filters: Dict = {}, if_none_match: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Get hotels in a destination area.
     
     Args:
         destination_id: ID of the destination
         filters: Optional filters to apply (price, ratings, amenities, etc.)
+        if_none_match: Optional version from a previous result ("" if none); the result
+            is then {"version", "data"}, or {"version", "not_modified": true} if unchanged
     """
-    return await hotel_service.get_hotels(destination_id, filters)
+    return await catalog_result(if_none_match, lambda: hotel_service.get_hotels(destination_id, filters))
 
-@mcp.tool()
-async def cluster_attractions(attractions: List[Dict], num_days: int) -> Dict[int, List[Dict]]:
+@tool()
+async def cluster_attractions(attraction_ids: List[int], num_days: int) -> Dict[int, List[Dict]]:
     """Cluster attractions based on proximity for multi-day planning.
     
     Args:
-        attractions: List of attraction objects
+        attraction_ids: IDs of the attractions to cluster
         num_days: Number of days for the trip
     """
-    return clusterer.cluster_attractions(attractions, num_days)
+    attractions = await attraction_service.get_attractions_by_ids(attraction_ids)
+    if not attractions:
+        return {}
+    with tool_metrics.phase("clustering"):
+        return await run_in_executor(clusterer.cluster_attractions, attractions, num_days)
 
-@mcp.tool()
+@tool()
 async def create_itinerary(
     destination_id: int,
     num_days: int,
     start_date: str,
-    attractions: List[Dict] = None,
+    attraction_ids: Optional[List[int]] = None,
     user_id: Optional[int] = None,
     hotel_id: Optional[int] = None
 ) -> Dict:
@@ -73,20 +141,27 @@ async def create_itinerary(
         destination_id: ID of the destination
         num_days: Number of days for the trip
         start_date: Start date of the trip (format: YYYY-MM-DD)
-        attractions: Optional list of attractions to include
+        attraction_ids: Optional IDs of the attractions to include
         user_id: Optional user ID
         hotel_id: Optional hotel ID
     """
+    # Hydrate the requested attractions from the catalog, never from client data
+    attractions = []
+    if attraction_ids:
+        attractions = await attraction_service.get_attractions_by_ids(attraction_ids, destination_id)
+    
     # If no attractions provided, get top attractions
     if not attractions:
         attractions = await attraction_service.get_top_attractions(destination_id, num_days * 3)
     
     # Cluster attractions by day
-    clustered_attractions = clusterer.cluster_attractions(attractions, num_days)
+    with tool_metrics.phase("clustering"):
+        clustered_attractions = await run_in_executor(clusterer.cluster_attractions, attractions, num_days)
     
     # Find optimal hotel if not specified
     if not hotel_id:
-        optimal_location = clusterer.find_central_point(attractions)
+        with tool_metrics.phase("clustering"):
+            optimal_location = clusterer.find_central_point(attractions)
         hotels = await hotel_service.get_hotels_near_point(
             destination_id, 
             optimal_location["latitude"], 
@@ -96,14 +171,16 @@ async def create_itinerary(
             hotel_id = hotels[0]["id"]
     
     # Generate the itinerary
-    itinerary = planner.create_itinerary(
-        destination_id=destination_id,
-        start_date=start_date,
-        num_days=num_days,
-        clustered_attractions=clustered_attractions,
-        hotel_id=hotel_id,
-        user_id=user_id
-    )
+    with tool_metrics.phase("planning"):
+        itinerary = await run_in_executor(
+            planner.create_itinerary,
+            destination_id=destination_id,
+            start_date=start_date,
+            num_days=num_days,
+            clustered_attractions=clustered_attractions,
+            hotel_id=hotel_id,
+            user_id=user_id
+        )
     
     # Save to database
     itinerary_id = await itinerary_service.save_itinerary(itinerary)
@@ -111,20 +188,84 @@ async def create_itinerary(
     
     return itinerary
 
-@mcp.tool()
-async def get_itinerary(itinerary_id: int) -> Dict:
+@tool(read_only=True)
+async def get_itinerary(itinerary_id: int, if_none_match: Optional[str] = None) -> Dict:
     """Get an existing itinerary by ID.
     
     Args:
         itinerary_id: ID of the itinerary to retrieve
+        if_none_match: Optional version from a previous result ("" if none); the result
+            is then {"version", "data"}, or {"version", "not_modified": true} if unchanged
     """
-    return await itinerary_service.get_itinerary(itinerary_id)
+    if if_none_match is None:
+        return await itinerary_service.get_itinerary(itinerary_id)
+    
+    # Only the update time is read when the caller's copy is current
+    version = await itinerary_service.get_itinerary_version(itinerary_id)
+    return await conditional_result(version, if_none_match, lambda: itinerary_service.get_itinerary(itinerary_id))
 
 @mcp.resource("greeting://{name}")
 def get_greeting(name: str) -> str:
     """Get a personalized greeting."""
     return f"Hello, {name}!"
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose tool, connection pool and SQL compile-cache metrics of this worker process."""
+    body = (
+        tool_metrics.render()
+        + admission.render()
+        + render_pool_metrics(async_engine.pool)
+        + render_compile_cache_metrics(compile_cache_stats.stats(), statement_registry.stats())
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """Report readiness of this worker process; 503 until warm-up has finished."""
+    return JSONResponse(warmup.report(), status_code=200 if warmup.ready else 503)
+
+# Startup warm-up of this worker process
+warmup = Warmup()
+
+async def warm_up():
+    """Move first-request costs (connections, catalog loads, SQL compilation, sklearn) to startup."""
+    hot_destinations: List[Dict] = []
+    
+    async def warm_catalog():
+        destinations = await destination_service.get_destinations()
+        hot_destinations.extend(destinations[:settings.WARMUP_DESTINATIONS])
+        await destination_service.preload_search_index()
+        for destination in hot_destinations:
+            await attraction_service.get_top_attractions(destination["id"])
+            await hotel_service.get_hotels(destination["id"])
+    
+    async def warm_planning():
+        # Imports sklearn and runs the clusterer and planner once per hot destination
+        for destination in hot_destinations:
+            attractions = await attraction_service.get_top_attractions(destination["id"], 9)
+            if attractions:
+                clustered = await run_in_executor(clusterer.cluster_attractions, attractions, 3)
+                await run_in_executor(planner.create_itinerary, destination["id"], date.today().isoformat(), 3, clustered)
+    
+    async def warm_statements():
+        # Compiles the itinerary query; no itinerary has ID 0
+        try:
+            await itinerary_service.get_itinerary(0)
+        except ValueError:
+            pass
+    
+    stages = [
+        ("pool", lambda: warm_pool(async_engine, settings.WARMUP_POOL_CONNECTIONS)),
+        ("catalog", warm_catalog),
+        ("planning", warm_planning),
+        ("statements", warm_statements),
+    ]
+    await warmup.run(stages if settings.WARMUP_ENABLED else [])
+
+# ASGI application served by main.py
+asgi_app = create_asgi_app(mcp, tools, in_flight, settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS, startup=warm_up)
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='stdio')
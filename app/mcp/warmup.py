@@ -0,0 +1,72 @@
+"""Startup warm-up and readiness of the MCP server."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+WarmupStage = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+class Warmup:
+    """
+    Runs warm-up stages once at startup and reports readiness.
+    
+    Stages run in order; a failing stage is logged and recorded but does not
+    block readiness, since warm-up only moves first-request costs earlier.
+    """
+    
+    def __init__(self):
+        """Initialize a server that is not ready yet."""
+        self.ready = False
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+    
+    async def run(self, stages: List[WarmupStage]):
+        """
+        Run the warm-up stages, then mark the server ready.
+        
+        Args:
+            stages: (name, coroutine function) pairs
+        """
+        for name, stage in stages:
+            start = time.perf_counter()
+            try:
+                await stage()
+            except Exception as e:
+                logger.warning("Warm-up stage %s failed: %s", name, e)
+                self.errors[name] = f"{type(e).__name__}: {e}"
+            finally:
+                self.durations[name] = round(time.perf_counter() - start, 4)
+        self.ready = True
+    
+    def report(self) -> Dict[str, Any]:
+        """Return readiness, stage durations in seconds and stage errors."""
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "stages": self.durations,
+            "errors": self.errors,
+        }
+
+
+async def warm_pool(engine: AsyncEngine, connections: int):
+    """
+    Open pool connections ahead of the first requests.
+    
+    Args:
+        engine: Engine whose pool to fill
+        connections: Number of connections to establish
+    """
+    async def open_connection():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+    
+    opened = await asyncio.gather(*(open_connection() for _ in range(connections)))
+    for conn in opened:
+        await conn.close()
@@ -1,29 +1,194 @@
 """ASGI wrapper for FastMCP."""
 
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Body, FastAPI, Header, HTTPException, Request, Response
 from mcp.server.fastmcp import FastMCP
+from pydantic import BaseModel, ValidationError
+
+from app.core.deadline import DeadlineExceeded, deadline_scope
+from app.core.serialization import dumps
+from app.mcp.admission import ToolRejected
+from app.mcp.metrics import tool_metrics
+from app.services.errors import NotFoundError
+
+class InFlightTracker:
+    """Count tool calls in progress so shutdown can wait for them."""
+    
+    def __init__(self):
+        """Initialize the tracker."""
+        self.active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+    
+    @asynccontextmanager
+    async def track(self):
+        """Mark a tool call as in flight for the duration of the block."""
+        self.active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            if self.active == 0:
+                self._idle.set()
+    
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait for in-flight tool calls to finish.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            True if every call finished in time
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+def serialize_result(tool: str, result: Any) -> bytes:
+    """
+    Serialize a tool result to JSON, recording the time as its serialization phase.
+    
+    Args:
+        tool: Name of the tool
+        result: Result returned by the tool
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    start = time.perf_counter()
+    body = dumps(result)
+    tool_metrics.observe(tool, "serialization", time.perf_counter() - start)
+    return body
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[Any]) -> Any:
+    """
+    Await a tool call, cancelling it if the client disconnects first.
+    
+    Args:
+        request: Request whose body has already been read
+        awaitable: The tool call
+        
+    Returns:
+        The tool call's result
+    """
+    task = asyncio.ensure_future(awaitable)
+    
+    async def watch():
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                task.cancel()
+                return
+    
+    watcher = asyncio.ensure_future(watch())
+    try:
+        return await task
+    finally:
+        watcher.cancel()
 
-def create_asgi_app(mcp_instance: FastMCP) -> FastAPI:
+def create_asgi_app(
+    mcp_instance: FastMCP,
+    tools: Dict[str, Callable[..., Awaitable[Any]]],
+    in_flight: InFlightTracker,
+    drain_timeout: float = 30.0,
+    startup: Optional[Callable[[], Awaitable[Any]]] = None
+) -> FastAPI:
     """
     Create an ASGI compatible application from a FastMCP instance.
     
+    The MCP protocol is served over streamable HTTP at ``/mcp``; each tool is
+    also exposed as ``POST /tool/{name}`` with the arguments as a JSON body,
+    which is what ``TravelioMCPClient`` calls, and ``GET /tools`` lists the
+    tools with their input schemas. Tool arguments are validated against the
+    argument models FastMCP builds, answering 422 if they do not fit, and a
+    tool's ``NotFoundError`` or other ``ValueError`` becomes a 404 or 400 with
+    its message. ``startup`` runs in the
+    background once the app starts, so the server accepts connections while
+    it warms up. On shutdown, in-flight tool calls get up to ``drain_timeout``
+    seconds to finish before the MCP session manager cancels its tasks.
+    
     Args:
         mcp_instance: An instance of FastMCP
+        tools: Tool functions by name
+        in_flight: Tracker of the tool calls in progress
+        drain_timeout: Seconds to wait for in-flight tool calls on shutdown
+        startup: Optional coroutine function run in the background at startup
         
     Returns:
-        A FastAPI application or the FastMCP instance itself if ASGI-compatible
+        A FastAPI application
     """
-    # Check if the FastMCP instance has an app attribute
-    if hasattr(mcp_instance, 'app'):
-        return mcp_instance.app
+    mcp_app = mcp_instance.streamable_http_app()
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        startup_task = asyncio.create_task(startup()) if startup else None
+        async with mcp_instance.session_manager.run():
+            yield
+            if startup_task is not None and not startup_task.done():
+                startup_task.cancel()
+            await in_flight.drain(drain_timeout)
+    
+    app = FastAPI(title=mcp_instance.name, lifespan=lifespan)
+    arg_models: Dict[str, type[BaseModel]] = {}
+    
+    def arg_model(name: str) -> type[BaseModel]:
+        """Get the pydantic model FastMCP validates a tool's arguments with."""
+        if name not in arg_models:
+            # FastMCP keeps its tools' metadata private
+            arg_models[name] = mcp_instance._tool_manager.get_tool(name).fn_metadata.arg_model
+        return arg_models[name]
     
-    # If FastMCP is itself a FastAPI app or has a method to get the app
-    if hasattr(mcp_instance, 'get_app'):
-        return mcp_instance.get_app()
+    @app.get("/tools")
+    async def list_tools():
+        """List the tools with their descriptions and JSON input schemas."""
+        return [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.inputSchema}
+            for tool in await mcp_instance.list_tools()
+            if tool.name in tools
+        ]
     
-    # If FastMCP is ASGI-compatible, return it directly
-    if hasattr(mcp_instance, "__call__"):
-        return mcp_instance
+    @app.post("/tool/{name}")
+    async def call_tool(
+        name: str,
+        request: Request,
+        arguments: Dict[str, Any] = Body(default_factory=dict),
+        timeout: Optional[float] = Header(default=None, alias="X-Timeout-Seconds")
+    ):
+        """Call a tool with JSON arguments and return its result as JSON."""
+        tool = tools.get(name)
+        if tool is None:
+            raise HTTPException(status_code=404, detail=f"Unknown tool: {name}")
+        
+        model = arg_model(name)
+        unknown = sorted(set(arguments) - set(model.model_fields))
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown arguments of {name}: {', '.join(unknown)}")
+        try:
+            arguments = model.model_validate(arguments).model_dump_one_level()
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+        
+        try:
+            with deadline_scope(timeout):
+                result = await cancel_on_disconnect(request, tool(**arguments))
+        except ToolRejected as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=504, detail=str(e))
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return Response(serialize_result(name, result), media_type="application/json")
     
-    # If we can't find a suitable ASGI app, raise an error
-    raise TypeError("Cannot extract FastAPI app from FastMCP instance")
+    app.mount("/", mcp_app)
+    return app
@@ -2,10 +2,12 @@ from app.services.destination_service import DestinationService
 from app.services.attraction_service import AttractionService
 from app.services.hotel_service import HotelService
 from app.services.itinerary_service import ItineraryService
+from app.services.errors import NotFoundError
 
 __all__ = [
     "DestinationService",
     "AttractionService",
     "HotelService",
-    "ItineraryService"
+    "ItineraryService",
+    "NotFoundError"
 ]
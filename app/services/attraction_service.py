@@ -1,14 +1,20 @@
-from typing import List, Dict, Optional, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import and_, or_
+import copy
+from typing import List, Dict, Optional, Any, Tuple
+from sqlalchemy import bindparam
+from sqlalchemy.sql import Select
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
 from app.db.models.attraction import Attraction
+from app.db.mappers import attraction_mapper
+from app.db.statements import statement_registry
+from app.core.ranking import AttractionRanking
+from app.core.tracing import traced
+from app.services.catalog_cache import catalog_cache
 
 class AttractionService:
     """Service for attraction-related operations."""
     
+    @traced()
     async def get_attractions(self, destination_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Get attractions for a destination with optional filters.
@@ -20,85 +26,124 @@ class AttractionService:
         Returns:
             List of attraction dictionaries
         """
-        async with AsyncSession(next(get_db())) as session:
-            query = select(Attraction).filter(Attraction.destination_id == destination_id)
-            
-            if filters:
-                # Apply category filter if provided
-                if "category" in filters:
-                    categories = filters["category"] if isinstance(filters["category"], list) else [filters["category"]]
-                    query = query.filter(Attraction.category.in_(categories))
-                
-                # Apply price range filter if provided
-                if "max_price_range" in filters:
-                    query = query.filter(Attraction.price_range <= filters["max_price_range"])
-                
-                # Apply must-visit filter if provided
-                if "must_visit" in filters and filters["must_visit"]:
-                    query = query.filter(Attraction.is_must_visit == True)
-            
-            # Order by rating (descending) and then by is_must_visit
-            query = query.order_by(Attraction.is_must_visit.desc(), Attraction.rating.desc())
+        params: Dict[str, Any] = {"destination_id": destination_id}
+        shape = []
+        
+        if filters:
+            # Apply category filter if provided
+            if "category" in filters:
+                shape.append("category")
+                params["categories"] = filters["category"] if isinstance(filters["category"], list) else [filters["category"]]
             
-            result = await session.execute(query)
-            attractions = result.scalars().all()
+            # Apply price range filter if provided
+            if "max_price_range" in filters:
+                shape.append("max_price_range")
+                params["max_price_range"] = filters["max_price_range"]
             
-            return [
-                {
-                    "id": attr.id,
-                    "name": attr.name,
-                    "description": attr.description,
-                    "destination_id": attr.destination_id,
-                    "category": attr.category,
-                    "latitude": attr.latitude,
-                    "longitude": attr.longitude,
-                    "image_url": attr.image_url,
-                    "rating": attr.rating,
-                    "price_range": attr.price_range,
-                    "visit_duration_minutes": attr.visit_duration_minutes,
-                    "opening_hours": attr.opening_hours,
-                    "is_must_visit": attr.is_must_visit
-                }
-                for attr in attractions
-            ]
+            # Apply must-visit filter if provided
+            if "must_visit" in filters and filters["must_visit"]:
+                shape.append("must_visit")
+        
+        query = statement_registry.get("attractions", tuple(shape), self._build_attractions_query)
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(query, params)
+            return attraction_mapper.map_all(result.all())
     
-    async def get_top_attractions(self, destination_id: int, limit: int = 10) -> List[Dict]:
+    @traced()
+    async def get_top_attractions(self, destination_id: int, limit: int = 10, diverse: bool = False) -> List[Dict]:
         """
         Get top attractions for a destination based on rating and must-visit status.
         
+        Served from the destination's materialized ranking, which is loaded once
+        and then kept current by committed writes.
+        
         Args:
             destination_id: ID of the destination
             limit: Maximum number of attractions to return
+            diverse: Spread the results across attraction categories
             
         Returns:
             List of attraction dictionaries
         """
-        async with AsyncSession(next(get_db())) as session:
-            query = (
-                select(Attraction)
-                .filter(Attraction.destination_id == destination_id)
-                .order_by(Attraction.is_must_visit.desc(), Attraction.rating.desc())
-                .limit(limit)
-            )
+        ranking = await self._get_ranking(destination_id)
+        attractions = ranking.top_diverse(limit) if diverse else ranking.top(limit)
+        
+        # Copies, so callers can annotate results without touching the cache
+        return [self._copy(attraction) for attraction in attractions]
+    
+    @traced()
+    async def get_attractions_by_ids(self, attraction_ids: List[int], destination_id: Optional[int] = None) -> List[Dict]:
+        """
+        Hydrate attractions from their IDs.
+        
+        Attractions are taken from the cached rankings where possible and the
+        rest are loaded in one query. Unknown IDs are skipped.
+        
+        Args:
+            attraction_ids: IDs of the attractions, in the order to return them
+            destination_id: Optional destination the attractions must belong to
             
-            result = await session.execute(query)
-            attractions = result.scalars().all()
+        Returns:
+            List of attraction dictionaries
+        """
+        found: Dict[int, Dict] = {}
+        
+        if destination_id is not None:
+            ranking = await self._get_ranking(destination_id)
+            for attraction_id in attraction_ids:
+                attraction = ranking.get(attraction_id)
+                if attraction is not None:
+                    found[attraction_id] = attraction
+        else:
+            for attraction_id in attraction_ids:
+                attraction = catalog_cache.get_attraction(attraction_id)
+                if attraction is not None:
+                    found[attraction_id] = attraction
             
-            return [
-                {
-                    "id": attr.id,
-                    "name": attr.name,
-                    "description": attr.description,
-                    "destination_id": attr.destination_id,
-                    "category": attr.category,
-                    "latitude": attr.latitude,
-                    "longitude": attr.longitude,
-                    "image_url": attr.image_url,
-                    "rating": attr.rating,
-                    "price_range": attr.price_range,
-                    "visit_duration_minutes": attr.visit_duration_minutes,
-                    "opening_hours": attr.opening_hours,
-                    "is_must_visit": attr.is_must_visit
-                }
-                for attr in attractions
-            ]
+            missing = list({attraction_id for attraction_id in attraction_ids if attraction_id not in found})
+            if missing:
+                query = statement_registry.get("attractions_by_id", (), self._build_attractions_by_id_query)
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(query, {"attraction_ids": missing})
+                    for attraction in attraction_mapper.map_all(result.all()):
+                        found[attraction["id"]] = attraction
+        
+        return [self._copy(found[attraction_id]) for attraction_id in dict.fromkeys(attraction_ids) if attraction_id in found]
+    
+    @staticmethod
+    def _copy(attraction: Dict) -> Dict:
+        """Copy a cached attraction, including nested values like its opening hours."""
+        return {
+            key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+            for key, value in attraction.items()
+        }
+    
+    async def _get_ranking(self, destination_id: int) -> AttractionRanking:
+        """Get the cached ranking of a destination, loading it on a miss."""
+        ranking = catalog_cache.get_ranking(destination_id)
+        if ranking is None:
+            generation = catalog_cache.generation
+            ranking = AttractionRanking(await self.get_attractions(destination_id))
+            catalog_cache.set_ranking(destination_id, ranking, generation)
+        return ranking
+    
+    @staticmethod
+    def _build_attractions_query(shape: Tuple[str, ...]) -> Select:
+        """Build the filtered attractions query for a filter shape."""
+        query = attraction_mapper.select().filter(Attraction.destination_id == bindparam("destination_id"))
+        
+        if "category" in shape:
+            query = query.filter(Attraction.category.in_(bindparam("categories", expanding=True)))
+        if "max_price_range" in shape:
+            query = query.filter(Attraction.price_range <= bindparam("max_price_range"))
+        if "must_visit" in shape:
+            query = query.filter(Attraction.is_must_visit == True)
+        
+        # Order by rating (descending) and then by is_must_visit
+        return query.order_by(Attraction.is_must_visit.desc(), Attraction.rating.desc())
+    
+    @staticmethod
+    def _build_attractions_by_id_query(shape: Tuple[str, ...]) -> Select:
+        """Build the attractions-by-ID lookup query."""
+        return attraction_mapper.select().filter(Attraction.id.in_(bindparam("attraction_ids", expanding=True)))
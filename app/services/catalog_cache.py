@@ -0,0 +1,218 @@
+"""Process-wide catalog cache kept in step with committed catalog writes."""
+
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.ranking import AttractionRanking
+from app.db.mappers import attraction_mapper
+from app.db.models.attraction import Attraction
+from app.db.models.catalog_version import CatalogVersion
+from app.db.models.destination import Destination
+from app.db.models.hotel import Hotel
+from app.db.session import AsyncSessionLocal
+from app.db.statements import statement_registry
+
+CATALOG_MODELS = (Destination, Attraction, Hotel)
+
+
+class CatalogCache:
+    """
+    Cache of per-destination attraction rankings.
+    
+    ORM writes to catalog models are collected on flush and applied to the
+    cached rankings once the transaction commits, so rankings stay current
+    without being rebuilt. ``generation`` increases on every applied change.
+    Rankings also expire after ``CATALOG_CACHE_TTL_SECONDS`` to pick up writes
+    made by other processes. Callbacks registered with
+    ``on_destination_change`` run after commits that wrote a destination.
+    
+    Every flush writing the catalog also increases the catalog generation
+    stored in the database, in the same transaction, which ``version`` reads.
+    """
+    
+    def __init__(self, ttl_seconds: float = settings.CATALOG_CACHE_TTL_SECONDS):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            ttl_seconds: Maximum age of a cached ranking
+        """
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._rankings: Dict[int, Tuple[float, AttractionRanking]] = {}
+        self._destination_listeners: List[weakref.WeakMethod] = []
+    
+    async def version(self) -> str:
+        """
+        Get the version token of the catalog.
+        
+        The token is the committed catalog generation, so it only changes when
+        the catalog does, and every process and worker serving the same
+        database hands out the same token.
+        """
+        async with AsyncSessionLocal() as session:
+            query = statement_registry.get("catalog_version", (), self._build_version_query)
+            result = await session.execute(query)
+            generation = result.scalar_one_or_none()
+        
+        return f"catalog.{generation or 0}"
+    
+    def get_ranking(self, destination_id: int) -> Optional[AttractionRanking]:
+        """Get the cached ranking of a destination, if present and fresh."""
+        cached = self._rankings.get(destination_id)
+        if cached is None:
+            return None
+        
+        loaded_at, ranking = cached
+        if time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._rankings[destination_id]
+            return None
+        return ranking
+    
+    def set_ranking(self, destination_id: int, ranking: AttractionRanking, generation: Optional[int] = None) -> bool:
+        """
+        Cache a freshly loaded ranking.
+        
+        Args:
+            destination_id: ID of the destination
+            ranking: Ranking to cache
+            generation: Generation observed before loading; the ranking is not
+                cached if catalog writes were applied since then
+                
+        Returns:
+            True if the ranking was cached
+        """
+        if generation is not None and generation != self.generation:
+            return False
+        self._rankings[destination_id] = (time.monotonic(), ranking)
+        return True
+    
+    def get_attraction(self, attraction_id: int) -> Optional[Dict]:
+        """Find an attraction in any fresh cached ranking."""
+        for destination_id in list(self._rankings):
+            ranking = self.get_ranking(destination_id)
+            if ranking is not None and attraction_id in ranking:
+                return ranking.get(attraction_id)
+        return None
+    
+    def upsert_attraction(self, attraction: Dict):
+        """Apply an inserted or updated attraction to its destination's ranking."""
+        cached = self._rankings.get(attraction["destination_id"])
+        if cached is not None:
+            cached[1].upsert(attraction)
+        self.generation += 1
+    
+    def remove_attraction(self, destination_id: int, attraction_id: int):
+        """Apply a deleted attraction to its destination's ranking."""
+        cached = self._rankings.get(destination_id)
+        if cached is not None:
+            cached[1].remove(attraction_id)
+        self.generation += 1
+    
+    def invalidate(self, destination_id: Optional[int] = None):
+        """Drop the cached ranking of one destination, or of all destinations."""
+        if destination_id is None:
+            self._rankings.clear()
+        else:
+            self._rankings.pop(destination_id, None)
+        self.generation += 1
+    
+    def on_destination_change(self, callback: Callable[[], None]):
+        """
+        Register a method to call after every commit that wrote a destination.
+        
+        Args:
+            callback: Bound method taking no arguments; held weakly, so
+                registering does not keep its object alive
+        """
+        self._destination_listeners.append(weakref.WeakMethod(callback))
+    
+    def listen(self):
+        """Register session listeners that apply committed catalog writes."""
+        event.listen(Session, "after_flush", self._collect_changes)
+        event.listen(Session, "after_commit", self._apply_changes)
+        event.listen(Session, "after_rollback", self._discard_changes)
+    
+    def _collect_changes(self, session: Session, flush_context):
+        """Record catalog changes of a flush until the transaction commits."""
+        changes: List[Tuple] = session.info.setdefault("catalog_changes", [])
+        recorded = len(changes)
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Attraction):
+                # Flush history is still available here; a moved attraction
+                # leaves its old destination's ranking too
+                moved_from = [
+                    destination_id for destination_id in inspect(obj).attrs.destination_id.history.deleted
+                    if destination_id is not None and destination_id != obj.destination_id
+                ]
+                if moved_from:
+                    changes.extend(("invalidate", destination_id) for destination_id in moved_from)
+                    changes.append(("invalidate", obj.destination_id))
+                else:
+                    changes.append(("upsert", {key: getattr(obj, key) for key in attraction_mapper.keys}))
+            elif isinstance(obj, Destination):
+                changes.append(("destination",))
+            elif isinstance(obj, CATALOG_MODELS):
+                changes.append(("touch",))
+        for obj in session.deleted:
+            if isinstance(obj, Attraction):
+                changes.append(("remove", obj.destination_id, obj.id))
+            elif isinstance(obj, Destination):
+                changes.append(("destination",))
+            elif isinstance(obj, CATALOG_MODELS):
+                changes.append(("touch",))
+        
+        if len(changes) > recorded:
+            self._bump_version(session)
+    
+    def _apply_changes(self, session: Session):
+        """Apply the recorded catalog changes after a commit."""
+        destinations_changed = False
+        for change in session.info.pop("catalog_changes", []):
+            if change[0] == "upsert":
+                self.upsert_attraction(change[1])
+            elif change[0] == "remove":
+                self.remove_attraction(change[1], change[2])
+            elif change[0] == "invalidate":
+                self.invalidate(change[1])
+            else:
+                destinations_changed = destinations_changed or change[0] == "destination"
+                self.generation += 1
+        
+        if destinations_changed:
+            for listener in list(self._destination_listeners):
+                callback = listener()
+                if callback is None:
+                    self._destination_listeners.remove(listener)
+                else:
+                    callback()
+    
+    def _discard_changes(self, session: Session):
+        """Forget recorded changes of a rolled back transaction."""
+        session.info.pop("catalog_changes", None)
+    
+    @staticmethod
+    def _bump_version(session: Session):
+        """Increase the catalog generation in the transaction being flushed."""
+        # On the connection rather than the session, which is still flushing
+        connection = session.connection()
+        result = connection.execute(
+            update(CatalogVersion).where(CatalogVersion.id == 1).values(generation=CatalogVersion.generation + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(CatalogVersion).values(id=1, generation=1))
+    
+    @staticmethod
+    def _build_version_query(shape: Tuple[str, ...]) -> Select:
+        """Build the query for the catalog generation."""
+        return select(CatalogVersion.generation).filter(CatalogVersion.id == 1)
+
+
+catalog_cache = CatalogCache()
+catalog_cache.listen()
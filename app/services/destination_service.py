@@ -1,55 +1,100 @@
 from typing import List, Dict, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import or_
+import asyncio
+import time
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.search import TrigramIndex
+from app.core.tracing import traced
+from app.db.session import AsyncSessionLocal
 from app.db.models.destination import Destination
+from app.db.mappers import destination_mapper
+from app.services.catalog_cache import catalog_cache
+from app.services.errors import NotFoundError
 
 class DestinationService:
     """Service for destination-related operations."""
     
+    def __init__(self):
+        """Initialize the service with an empty search index, rebuilt after destination writes."""
+        self._search_index: Optional[TrigramIndex] = None
+        self._search_index_built_at = 0.0
+        # Counts invalidations, so a rebuild that raced one is not kept
+        self._search_index_generation = 0
+        self._search_index_lock = asyncio.Lock()
+        catalog_cache.on_destination_change(self.invalidate_search_index)
+    
+    @traced()
     async def get_destinations(self, search_term: Optional[str] = None) -> List[Dict]:
         """
         Get all destinations or search by name/country.
         
+        Searches go through an in-memory trigram index over destination names
+        and countries, so they tolerate typos and are ranked by similarity and
+        then popularity.
+        
         Args:
             search_term: Optional search term to filter destinations
             
         Returns:
             List of destination dictionaries
         """
-        async with AsyncSession(next(get_db())) as session:
-            query = select(Destination)
-            
-            if search_term:
-                query = query.filter(
-                    or_(
-                        Destination.name.ilike(f"%{search_term}%"),
-                        Destination.country.ilike(f"%{search_term}%")
-                    )
-                )
-            
+        if search_term:
+            index = await self._get_search_index()
+            return [destination for _, destination in index.search(search_term)]
+        
+        async with AsyncSessionLocal() as session:
             # Order by popularity score (descending)
-            query = query.order_by(Destination.popularity_score.desc())
+            query = destination_mapper.select().order_by(Destination.popularity_score.desc())
             
             result = await session.execute(query)
-            destinations = result.scalars().all()
-            
-            return [
-                {
-                    "id": dest.id,
-                    "name": dest.name,
-                    "country": dest.country,
-                    "description": dest.description,
-                    "latitude": dest.latitude,
-                    "longitude": dest.longitude,
-                    "image_url": dest.image_url,
-                    "popularity_score": dest.popularity_score
-                }
-                for dest in destinations
-            ]
+            return destination_mapper.map_all(result.all())
+    
+    async def preload_search_index(self):
+        """Build the search index ahead of the first search."""
+        await self._get_search_index()
+    
+    def invalidate_search_index(self):
+        """Drop the search index so the next search rebuilds it."""
+        self._search_index_generation += 1
+        self._search_index = None
+    
+    async def _get_search_index(self) -> TrigramIndex:
+        """
+        Get the destination search index, (re)building it when missing or stale.
+        
+        A rebuild that an invalidation overtook, because a destination write
+        committed while it was reading or indexing, serves the search that
+        started it but is not kept, so the next search rebuilds again.
+        """
+        if self._search_index is not None and not self._search_index_expired():
+            return self._search_index
+        
+        async with self._search_index_lock:
+            index = self._search_index
+            if index is None or self._search_index_expired():
+                generation = self._search_index_generation
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(destination_mapper.select())
+                    destinations = destination_mapper.map_all(result.all())
+                
+                index = await asyncio.to_thread(
+                    TrigramIndex,
+                    destinations,
+                    fields=("name", "country"),
+                    rank_field="popularity_score",
+                    threshold=settings.SEARCH_SIMILARITY_THRESHOLD
+                )
+                if generation == self._search_index_generation:
+                    self._search_index = index
+                    self._search_index_built_at = time.monotonic()
+        
+        return index
+    
+    def _search_index_expired(self) -> bool:
+        """Check whether the search index is older than its TTL."""
+        return time.monotonic() - self._search_index_built_at > settings.SEARCH_INDEX_TTL_SECONDS
     
+    @traced()
     async def get_destination(self, destination_id: int) -> Dict:
         """
         Get a single destination by ID.
@@ -60,22 +105,13 @@ class DestinationService:
         Returns:
             Destination as a dictionary
         """
-        async with AsyncSession(next(get_db())) as session:
+        async with AsyncSessionLocal() as session:
             result = await session.execute(
-                select(Destination).filter(Destination.id == destination_id)
+                destination_mapper.select().filter(Destination.id == destination_id)
             )
-            destination = result.scalars().first()
+            row = result.first()
             
-            if not destination:
-                raise ValueError(f"Destination with ID {destination_id} not found")
+            if not row:
+                raise NotFoundError(f"Destination with ID {destination_id} not found")
             
-            return {
-                "id": destination.id,
-                "name": destination.name,
-                "country": destination.country,
-                "description": destination.description,
-                "latitude": destination.latitude,
-                "longitude": destination.longitude,
-                "image_url": destination.image_url,
-                "popularity_score": destination.popularity_score
-            }
+            return destination_mapper(row)
@@ -0,0 +1,5 @@
+"""Errors raised by the services."""
+
+
+class NotFoundError(ValueError):
+    """A requested record does not exist."""
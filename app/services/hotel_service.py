@@ -1,15 +1,21 @@
-from typing import List, Dict, Optional, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import and_, or_, func
+from typing import List, Dict, Optional, Any, Tuple
 from math import radians, sin, cos, sqrt, atan2
+from sqlalchemy import bindparam
+from sqlalchemy.sql import Select
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
 from app.db.models.hotel import Hotel
+from app.db.mappers import hotel_mapper
+from app.db.statements import statement_registry
+from app.core.tracing import traced
+
+# Boolean amenity flags that can be used as hotel filters
+AMENITY_FILTERS = ("has_restaurant", "has_pool", "has_gym", "has_spa")
 
 class HotelService:
     """Service for hotel-related operations."""
     
+    @traced()
     async def get_hotels(self, destination_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Get hotels for a destination with optional filters.
@@ -21,56 +27,32 @@ class HotelService:
         Returns:
             List of hotel dictionaries
         """
-        async with AsyncSession(next(get_db())) as session:
-            query = select(Hotel).filter(Hotel.destination_id == destination_id)
-            
-            if filters:
-                # Apply rating filter if provided
-                if "min_rating" in filters:
-                    query = query.filter(Hotel.rating >= filters["min_rating"])
-                
-                # Apply price filter if provided
-                if "max_price" in filters:
-                    query = query.filter(Hotel.price_per_night <= filters["max_price"])
-                
-                # Apply amenities filters if provided
-                if "has_restaurant" in filters and filters["has_restaurant"]:
-                    query = query.filter(Hotel.has_restaurant == True)
-                if "has_pool" in filters and filters["has_pool"]:
-                    query = query.filter(Hotel.has_pool == True)
-                if "has_gym" in filters and filters["has_gym"]:
-                    query = query.filter(Hotel.has_gym == True)
-                if "has_spa" in filters and filters["has_spa"]:
-                    query = query.filter(Hotel.has_spa == True)
-            
-            # Order by rating (descending)
-            query = query.order_by(Hotel.rating.desc())
+        params: Dict[str, Any] = {"destination_id": destination_id}
+        shape = []
+        
+        if filters:
+            # Apply rating filter if provided
+            if "min_rating" in filters:
+                shape.append("min_rating")
+                params["min_rating"] = filters["min_rating"]
             
-            result = await session.execute(query)
-            hotels = result.scalars().all()
+            # Apply price filter if provided
+            if "max_price" in filters:
+                shape.append("max_price")
+                params["max_price"] = filters["max_price"]
             
-            return [
-                {
-                    "id": hotel.id,
-                    "name": hotel.name,
-                    "description": hotel.description,
-                    "destination_id": hotel.destination_id,
-                    "address": hotel.address,
-                    "latitude": hotel.latitude,
-                    "longitude": hotel.longitude,
-                    "image_url": hotel.image_url,
-                    "rating": hotel.rating,
-                    "price_per_night": hotel.price_per_night,
-                    "amenities": hotel.amenities,
-                    "has_restaurant": hotel.has_restaurant,
-                    "has_pool": hotel.has_pool,
-                    "has_spa": hotel.has_spa,
-                    "has_gym": hotel.has_gym,
-                    "has_free_wifi": hotel.has_free_wifi
-                }
-                for hotel in hotels
-            ]
+            # Apply amenities filters if provided
+            for amenity in AMENITY_FILTERS:
+                if amenity in filters and filters[amenity]:
+                    shape.append(amenity)
+        
+        query = statement_registry.get("hotels", tuple(shape), self._build_hotels_query)
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(query, params)
+            return hotel_mapper.map_all(result.all())
     
+    @traced()
     async def get_hotels_near_point(
         self, 
         destination_id: int, 
@@ -92,11 +74,11 @@ class HotelService:
         Returns:
             List of hotel dictionaries with distance
         """
-        async with AsyncSession(next(get_db())) as session:
+        async with AsyncSessionLocal() as session:
             # Get all hotels in the destination
-            query = select(Hotel).filter(Hotel.destination_id == destination_id)
-            result = await session.execute(query)
-            hotels = result.scalars().all()
+            query = statement_registry.get("hotels", (), self._build_hotels_query)
+            result = await session.execute(query, {"destination_id": destination_id})
+            hotels = hotel_mapper.map_all(result.all())
             
             # Calculate distances and filter
             hotels_with_distance = []
@@ -104,35 +86,34 @@ class HotelService:
                 distance = self._calculate_distance(
                     lat1=latitude,
                     lon1=longitude,
-                    lat2=hotel.latitude,
-                    lon2=hotel.longitude
+                    lat2=hotel["latitude"],
+                    lon2=hotel["longitude"]
                 )
                 
                 if distance <= max_distance_km:
-                    hotels_with_distance.append({
-                        "id": hotel.id,
-                        "name": hotel.name,
-                        "description": hotel.description,
-                        "destination_id": hotel.destination_id,
-                        "address": hotel.address,
-                        "latitude": hotel.latitude,
-                        "longitude": hotel.longitude,
-                        "image_url": hotel.image_url,
-                        "rating": hotel.rating,
-                        "price_per_night": hotel.price_per_night,
-                        "amenities": hotel.amenities,
-                        "has_restaurant": hotel.has_restaurant,
-                        "has_pool": hotel.has_pool,
-                        "has_spa": hotel.has_spa,
-                        "has_gym": hotel.has_gym,
-                        "has_free_wifi": hotel.has_free_wifi,
-                        "distance_km": distance
-                    })
+                    hotel["distance_km"] = distance
+                    hotels_with_distance.append(hotel)
             
             # Sort by distance and limit
             hotels_with_distance.sort(key=lambda h: h["distance_km"])
             return hotels_with_distance[:limit]
     
+    @staticmethod
+    def _build_hotels_query(shape: Tuple[str, ...]) -> Select:
+        """Build the filtered hotels query for a filter shape."""
+        query = hotel_mapper.select().filter(Hotel.destination_id == bindparam("destination_id"))
+        
+        if "min_rating" in shape:
+            query = query.filter(Hotel.rating >= bindparam("min_rating"))
+        if "max_price" in shape:
+            query = query.filter(Hotel.price_per_night <= bindparam("max_price"))
+        for amenity in AMENITY_FILTERS:
+            if amenity in shape:
+                query = query.filter(getattr(Hotel, amenity) == True)
+        
+        # Order by rating (descending)
+        return query.order_by(Hotel.rating.desc())
+    
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
         Calculate distance between two points using the Haversine formula.
@@ -1,19 +1,24 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, date
 import json
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
 from app.db.models.itinerary import Itinerary, ItineraryDay, ItineraryActivity
 from app.db.models.destination import Destination
 from app.db.models.hotel import Hotel
 from app.db.models.attraction import Attraction
+from app.db.statements import statement_registry
+from app.core.tracing import traced
+from app.services.errors import NotFoundError
 
 class ItineraryService:
     """Service for itinerary-related operations."""
     
+    @traced()
     async def save_itinerary(self, itinerary_data: Dict) -> int:
         """
         Save an itinerary to the database.
@@ -24,7 +29,7 @@ class ItineraryService:
         Returns:
             ID of the saved itinerary
         """
-        async with AsyncSession(next(get_db())) as session:
+        async with AsyncSessionLocal() as session:
             # Create itinerary object
             itinerary = Itinerary(
                 title=itinerary_data["title"],
@@ -74,6 +79,34 @@ class ItineraryService:
             await session.commit()
             return itinerary.id
     
+    @traced()
+    async def get_itinerary_version(self, itinerary_id: int) -> str:
+        """
+        Get the version token of an itinerary without loading it.
+        
+        Args:
+            itinerary_id: ID of the itinerary
+            
+        Returns:
+            Token that changes whenever the itinerary is updated
+        """
+        async with AsyncSessionLocal() as session:
+            query = statement_registry.get("itinerary_version", (), self._build_itinerary_version_query)
+            
+            result = await session.execute(query, {"itinerary_id": itinerary_id})
+            updated_at = result.scalar_one_or_none()
+            
+            if updated_at is None:
+                raise NotFoundError(f"Itinerary with ID {itinerary_id} not found")
+            
+            return self.itinerary_version(itinerary_id, updated_at)
+    
+    @staticmethod
+    def itinerary_version(itinerary_id: int, updated_at: datetime) -> str:
+        """Build the version token of an itinerary from its last update time."""
+        return f"{itinerary_id}.{updated_at.isoformat()}"
+    
+    @traced()
     async def get_itinerary(self, itinerary_id: int) -> Dict:
         """
         Get an itinerary by ID with all related data.
@@ -84,27 +117,15 @@ class ItineraryService:
         Returns:
             Itinerary as a dictionary
         """
-        async with AsyncSession(next(get_db())) as session:
+        async with AsyncSessionLocal() as session:
             # Query itinerary with relationships
-            query = (
-                select(Itinerary)
-                .options(
-                    joinedload(Itinerary.destination),
-                    joinedload(Itinerary.hotel),
-                    joinedload(Itinerary.days)
-                    .joinedload(ItineraryDay.hotel),
-                    joinedload(Itinerary.days)
-                    .joinedload(ItineraryDay.activities)
-                    .joinedload(ItineraryActivity.attraction)
-                )
-                .filter(Itinerary.id == itinerary_id)
-            )
+            query = statement_registry.get("itinerary", (), self._build_itinerary_query)
             
-            result = await session.execute(query)
-            itinerary = result.scalars().first()
+            result = await session.execute(query, {"itinerary_id": itinerary_id})
+            itinerary = result.unique().scalars().first()
             
             if not itinerary:
-                raise ValueError(f"Itinerary with ID {itinerary_id} not found")
+                raise NotFoundError(f"Itinerary with ID {itinerary_id} not found")
             
             # Build response dictionary
             itinerary_dict = {
@@ -167,6 +188,28 @@ class ItineraryService:
             
             return itinerary_dict
     
+    @staticmethod
+    def _build_itinerary_version_query(shape: Tuple[str, ...]) -> Select:
+        """Build the query for an itinerary's last update time."""
+        return select(Itinerary.updated_at).filter(Itinerary.id == bindparam("itinerary_id"))
+    
+    @staticmethod
+    def _build_itinerary_query(shape: Tuple[str, ...]) -> Select:
+        """Build the itinerary query with all relationships eagerly joined."""
+        return (
+            select(Itinerary)
+            .options(
+                joinedload(Itinerary.destination),
+                joinedload(Itinerary.hotel),
+                joinedload(Itinerary.days)
+                .joinedload(ItineraryDay.hotel),
+                joinedload(Itinerary.days)
+                .joinedload(ItineraryDay.activities)
+                .joinedload(ItineraryActivity.attraction)
+            )
+            .filter(Itinerary.id == bindparam("itinerary_id"))
+        )
+    
     def _format_hotel(self, hotel: Hotel) -> Dict:
         """Format hotel object as dictionary."""
         return {
@@ -1,16 +1,20 @@
 import uvicorn
-from app.mcp.server import asgi_app  # Direct import to avoid circular dependency
+from app.core.config import settings
 
 def main():
     """Main entry point of the application."""
-    print("Starting Travelio MCP server...")
+    print(f"Starting Travelio MCP server with {settings.SERVER_WORKERS} worker(s)...")
     
-    # Start the server using uvicorn with the FastMCP instance directly
+    # Workers import the app themselves, so it is referenced by import string
     uvicorn.run(
-        "app.mcp.server:asgi_app",  # Reference the MCP server instance
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        "app.mcp.server:asgi_app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Compare prompt context sizes of itineraries and attraction lists.
+
+Plans itineraries with ``ItineraryPlanner`` over synthetic attractions, then
+measures the context the chatbot sends in three encodings:
+
+  - json_indent: ``json.dumps(context, indent=2)``, what was sent before
+  - json_min: minified JSON
+  - compact: ``app.client.context_encoding.encode_context``
+
+Sizes are characters and estimated tokens (about four characters each).
+
+Usage:
+  python scripts/bench_context_encoding.py [--days 1 3 7 14] [--attractions 50]
+"""
+import argparse
+import json
+import random
+
+from app.client.context_encoding import encode_context
+from app.client.history import estimate_tokens
+from app.core.clustering import AttractionClusterer
+from app.core.itinerary_planner import ItineraryPlanner
+
+CATEGORIES = ["Beach", "Temple", "Museum", "Market", "Viewpoint", "Park"]
+
+
+def make_attractions(count: int, rng: random.Random):
+    """Generate attractions shaped like get_attractions results."""
+    return [
+        {
+            "id": i + 1,
+            "name": f"{rng.choice(['Wat', 'Ao', 'Khao', 'Old'])} {rng.choice(['Chalong', 'Nang', 'Rang', 'Town'])} {i}",
+            "description": "A popular spot with great views and local food stalls nearby.",
+            "destination_id": 1,
+            "category": rng.choice(CATEGORIES),
+            "latitude": 7.8 + rng.random() * 0.3,
+            "longitude": 98.2 + rng.random() * 0.3,
+            "image_url": f"https://example.com/attractions/{i + 1}.jpg",
+            "rating": round(3.5 + rng.random() * 1.5, 1),
+            "price_range": rng.randint(1, 4),
+            "visit_duration_minutes": rng.choice([60, 90, 120]),
+            "opening_hours": None,
+            "is_must_visit": rng.random() < 0.2,
+        }
+        for i in range(count)
+    ]
+
+
+def report(label: str, context: dict):
+    """Print the size of a context in each encoding."""
+    encodings = {
+        "json_indent": json.dumps(context, indent=2, default=str),
+        "json_min": json.dumps(context, separators=(",", ":"), default=str),
+        "compact": encode_context(context),
+    }
+    baseline = len(encodings["json_indent"])
+    print(label)
+    for name, text in encodings.items():
+        print(f"  {name:12s} {len(text):8d} chars  {estimate_tokens(text):7d} tokens  {len(text) / baseline:6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 3, 7, 14])
+    parser.add_argument("--attractions", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    attractions = make_attractions(args.attractions, rng)
+    clusterer = AttractionClusterer()
+    planner = ItineraryPlanner()
+
+    report(f"attractions ({args.attractions})", {"destination": {"id": 1, "name": "Phuket"}, "attractions": attractions})
+    for days in args.days:
+        selected = attractions[:days * 3]
+        clustered = clusterer.cluster_attractions(selected, days)
+        itinerary = planner.create_itinerary(1, "2024-01-01", days, clustered, hotel_id=1)
+        report(f"itinerary ({days} days)", {"itinerary": itinerary})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark request size and latency over a long chatbot session.
+
+Starts the stub LLM (``tests.stub_llm``) on a local port and runs a
+synthetic session of user turns through ``GeminiClient``, once with the
+unbounded history the client used to keep and once with the token-budgeted
+history. Every few turns carry catalog context like the chatbot sends.
+
+Usage:
+  python scripts/bench_conversation_history.py [--turns 100] [--budget 4000] [--port 8091]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import uvicorn
+
+from app.client.gemini_client import GeminiClient
+from tests.stub_llm import create_stub_llm_app
+
+MESSAGES = [
+    "I'm thinking about a beach holiday somewhere warm in Thailand next spring, what would you suggest?",
+    "Which attractions in Phuket are worth visiting if we only care about temples and local food markets?",
+    "Can you compare the hotels near Patong Beach with the ones in the old town for a family of four?",
+    "We would like a slower pace on the second day, maybe with a cooking class and an evening market.",
+    "Please make a 5 days itinerary starting next Monday and keep the travel time between stops short.",
+]
+
+CONTEXT = {
+    "destination": {"id": 1, "name": "Phuket", "country": "Thailand"},
+    "attractions": [
+        {"id": i, "name": f"Attraction {i}", "category": "Beach", "rating": 4.5, "latitude": 7.9, "longitude": 98.3}
+        for i in range(10)
+    ],
+}
+
+
+async def run_session(url: str, app, turns: int, budget):
+    """Run a session; return request bytes and latency of each turn."""
+    client = GeminiClient(api_url=url, history_max_tokens=budget)
+    app.state.requests.clear()
+    latencies = []
+    try:
+        for turn in range(turns):
+            context = CONTEXT if turn % 3 == 0 else None
+            start = time.perf_counter()
+            await client.send_message(MESSAGES[turn % len(MESSAGES)], context)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+    return [size for size, _ in app.state.requests], latencies
+
+
+async def run(args):
+    app = create_stub_llm_app(args.base_latency, args.per_token_latency)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    url = f"http://127.0.0.1:{args.port}/v1beta/models/stub:generateContent"
+    checkpoints = sorted({1, 10, args.turns // 4, args.turns // 2, args.turns})
+    try:
+        for label, budget in (("unbounded", None), (f"budget={args.budget}", args.budget)):
+            sizes, latencies = await run_session(url, app, args.turns, budget)
+            print(f"{label}:")
+            for turn in checkpoints:
+                print(f"  turn {turn:4d}: request {sizes[turn - 1] / 1024:7.1f} KB   latency {latencies[turn - 1] * 1000:7.1f} ms")
+            print(f"  total sent {sum(sizes) / 1024:8.1f} KB   mean latency {statistics.mean(latencies) * 1000:7.1f} ms")
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--budget", type=int, default=4000)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--port", type=int, default=8091)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
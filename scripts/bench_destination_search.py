@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark destination search on a synthetic global catalog.
+
+Compares the in-memory TrigramIndex against linear scans: a plain substring
+scan (what ILIKE '%term%' does without an index) and a trigram-similarity scan
+with the same typo tolerance as the index.
+
+Usage:
+  python scripts/bench_destination_search.py [--destinations 100000] [--queries 200]
+"""
+import argparse
+import random
+import time
+
+from app.core.search import TrigramIndex, trigrams
+
+CONSONANTS = ["b", "ch", "d", "f", "g", "h", "j", "k", "kr", "l", "m", "n", "p", "ph", "qu", "r", "s", "st", "t", "th", "v", "w", "z"]
+VOWELS = ["a", "e", "i", "o", "u", "ai", "ao", "ei", "ou", "ia"]
+SYLLABLES = [c + v for c in CONSONANTS for v in VOWELS] + [c + v + "n" for c in CONSONANTS for v in VOWELS[:5]]
+COUNTRIES = ["Thailand", "France", "Vietnam", "Italy", "Japan", "Brazil", "Kenya", "Peru", "Norway", "Canada"]
+
+
+def make_destinations(count: int, rng: random.Random):
+    """Generate destinations with random syllable names."""
+    return [
+        {
+            "id": i,
+            "name": "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title(),
+            "country": rng.choice(COUNTRIES),
+            "popularity_score": round(rng.uniform(0, 10), 1),
+        }
+        for i in range(count)
+    ]
+
+
+def make_queries(destinations, count: int, rng: random.Random):
+    """Pick destination names and introduce a typo in half of them."""
+    queries = []
+    for _ in range(count):
+        name = rng.choice(destinations)["name"].lower()
+        if rng.random() < 0.5 and len(name) > 3:
+            pos = rng.randrange(len(name) - 1)
+            name = name[:pos] + name[pos + 1] + name[pos] + name[pos + 2:]
+        queries.append(name)
+    return queries
+
+
+def substring_scan(destinations, term):
+    """Linear substring scan, equivalent to the old ILIKE search."""
+    term = term.lower()
+    return [d for d in destinations if term in d["name"].lower() or term in d["country"].lower()]
+
+
+def similarity_scan(destinations, term, threshold=0.3):
+    """Linear scan computing trigram similarity for every destination."""
+    query = trigrams(term)
+    matches = []
+    for d in destinations:
+        best = 0.0
+        for field in ("name", "country"):
+            grams = trigrams(d[field])
+            shared = len(query & grams)
+            if shared:
+                best = max(best, 1.0 if term in d[field].lower() else shared / len(query))
+        if best >= threshold:
+            matches.append(d)
+    return matches
+
+
+def timed(fn, queries):
+    """Run fn for every query and return (mean ms per query, mean result count)."""
+    start = time.perf_counter()
+    total = sum(len(fn(q)) for q in queries)
+    return (time.perf_counter() - start) * 1000 / len(queries), total / len(queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Destination search benchmark")
+    parser.add_argument("--destinations", type=int, default=100000, help="Catalog size")
+    parser.add_argument("--queries", type=int, default=200, help="Number of search queries")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    destinations = make_destinations(args.destinations, rng)
+    queries = make_queries(destinations, args.queries, rng)
+    
+    start = time.perf_counter()
+    index = TrigramIndex(destinations, fields=("name", "country"), rank_field="popularity_score")
+    print(f"Index build: {(time.perf_counter() - start) * 1000:.0f} ms for {len(index):,} destinations")
+    
+    index_ms, index_hits = timed(lambda q: index.search(q, limit=20), queries)
+    substring_ms, substring_hits = timed(lambda q: substring_scan(destinations, q), queries[:50])
+    scan_ms, _ = timed(lambda q: similarity_scan(destinations, q), queries[:5])
+    
+    print(f"{'trigram index (top 20)':<28} {index_ms:>9.2f} ms/query")
+    print(f"{'substring scan (ILIKE)':<28} {substring_ms:>9.2f} ms/query  (no typo tolerance, {substring_hits:.0f} hits/query)")
+    print(f"{'similarity scan':<28} {scan_ms:>9.2f} ms/query")
+    
+    typo_queries = queries[1::2]
+    found = sum(1 for q in typo_queries if index.search(q, limit=20))
+    print(f"Queries with results: {found}/{len(typo_queries)} (index, subset incl. typos)")
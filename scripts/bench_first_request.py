@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Measure first-request latency of a fresh server with and without warm-up.
+
+Seeds a synthetic catalog, starts ``main.py`` with ``WARMUP_ENABLED`` off and
+on, waits for ``GET /ready`` to return 200, then times the first call of each
+tool. Without warm-up the first calls pay for opening connections, compiling
+SQL, loading the catalog cache and importing sklearn.
+
+Usage:
+  python scripts/bench_first_request.py [--attractions 60] [--runs 3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import httpx
+
+from load_test_server import seed, start_server
+
+CALLS = [
+    ("get_destinations", {}),
+    ("get_attractions", {"destination_id": 1}),
+    ("create_itinerary", {"destination_id": 1, "num_days": 3, "start_date": "2025-01-01"}),
+]
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> float:
+    """Poll /ready until the server reports ready; return seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("Server did not become ready")
+
+
+async def first_calls(port: int, database_path: str, warmup: bool):
+    """Start a server and time its readiness and the first call of each tool."""
+    os.environ["WARMUP_ENABLED"] = str(warmup).lower()
+    process = start_server(1, port, database_path)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0) as client:
+            ready = await wait_until_ready(client)
+            timings = {}
+            for tool, arguments in CALLS:
+                start = time.perf_counter()
+                response = await client.post(f"/tool/{tool}", json=arguments)
+                response.raise_for_status()
+                timings[tool] = time.perf_counter() - start
+            return ready, timings
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run(args, database_path: str):
+    for warmup in (False, True):
+        results = [await first_calls(args.port, database_path, warmup) for _ in range(args.runs)]
+        ready = statistics.median(r[0] for r in results) * 1000
+        print(f"warmup={'on' if warmup else 'off'}: ready after {ready:7.1f} ms")
+        for tool, _ in CALLS:
+            first = statistics.median(r[1][tool] for r in results) * 1000
+            print(f"  first {tool:18s} {first:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "catalog.db")
+        seed(database_path, args.attractions)
+        asyncio.run(run(args, database_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark chatbot turns with Gemini function calling against the MCP server.
+
+Seeds a synthetic catalog, starts ``main.py`` on it and the stub LLM
+(``tests.stub_llm``) in process, scripted to call several tools in one
+response the way Gemini does for "plan my trip" questions. Runs the turns
+with the calls executed one after another and concurrently, and prints the
+latency breakdown of a turn: model calls, tool rounds, and the sum of the
+tool calls.
+
+Usage:
+  python scripts/bench_function_calling.py [--turns 20] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+
+import httpx
+import uvicorn
+
+from load_test_server import seed, start_server, wait_until_up
+
+from app.client.function_calling import function_declarations
+from app.client.gemini_client import GeminiClient
+from app.client.mcp_client import TravelioMCPClient
+from tests.stub_llm import create_stub_llm_app
+
+
+def function_calls(attractions: int):
+    """One model response asking for attractions, hotels and a day-by-day grouping at once."""
+    return [[
+        {"name": "get_attractions", "args": {"destination_id": 1}},
+        {"name": "get_hotels", "args": {"destination_id": 1}},
+        {"name": "cluster_attractions", "args": {"attraction_ids": list(range(1, attractions + 1)), "num_days": 3}},
+    ]]
+
+
+async def run_turns(url: str, mcp_client: TravelioMCPClient, turns: int, concurrent: bool):
+    """Run turns with function calling; return the breakdown summary of each."""
+    functions = function_declarations(await mcp_client.list_tools())
+    summaries = []
+    for _ in range(turns):
+        # A fresh history per turn keeps the prompt the same size
+        client = GeminiClient(api_url=url)
+        try:
+            await client.send_message_with_tools(
+                "Plan three days in Phuket with a good hotel", functions, mcp_client.call_tool, concurrent=concurrent
+            )
+        finally:
+            await client.close()
+        summaries.append(client.last_turn.summary())
+    return summaries
+
+
+async def run(args, database_path: str):
+    process = start_server(args.workers, args.port, database_path)
+    app = create_stub_llm_app(args.base_latency, args.per_token_latency, function_calls=function_calls(args.attractions))
+    llm = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.llm_port, log_level="warning"))
+    serving = asyncio.create_task(llm.serve())
+    url = f"http://127.0.0.1:{args.llm_port}/v1beta/models/stub:generateContent"
+
+    # No client cache, so every turn calls the tools
+    mcp_client = TravelioMCPClient(f"http://127.0.0.1:{args.port}")
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=60.0) as client:
+            await wait_until_up(client)
+        while not llm.started:
+            await asyncio.sleep(0.01)
+
+        # Warm the server's caches and the connection pool
+        await run_turns(url, mcp_client, 2, True)
+        for label, concurrent in (("sequential", False), ("concurrent", True)):
+            summaries = await run_turns(url, mcp_client, args.turns, concurrent)
+            mean = {key: statistics.mean(summary[key] for summary in summaries) for key in summaries[0]}
+            print(f"{label}: turn {mean['total_ms']:7.1f} ms = model {mean['llm_ms']:6.1f} ms "
+                  f"({mean['llm_calls']:.0f} calls) + tools {mean['tool_ms']:6.1f} ms + other {mean['other_ms']:5.1f} ms; "
+                  f"{mean['tool_calls']:.0f} tool calls summing to {mean['tool_call_ms']:6.1f} ms")
+    finally:
+        await mcp_client.close()
+        llm.should_exit = True
+        await serving
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--base-latency", type=float, default=0.2)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--port", type=int, default=8769)
+    parser.add_argument("--llm-port", type=int, default=8094)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "catalog.db")
+        seed(database_path, args.attractions)
+        asyncio.run(run(args, database_path))
+
+
+if __name__ == "__main__":
+    main()
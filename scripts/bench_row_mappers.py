@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark catalog row mapping: ORM hydration vs explicit columns + row mappers.
+
+Loads a synthetic attraction catalog into an in-memory SQLite database and
+compares rows/second for the old ``scalars().all()`` + dict comprehension
+approach against ``attraction_mapper``.
+
+Usage:
+  python scripts/bench_row_mappers.py [--rows 20000] [--repeat 5]
+"""
+import argparse
+import time
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Destination, Attraction
+from app.db.mappers import attraction_mapper
+
+
+def seed(session: Session, rows: int):
+    """Insert one destination with the given number of attractions."""
+    session.add(Destination(id=1, name="Phuket", country="Thailand", latitude=7.95, longitude=98.33))
+    session.add_all(
+        Attraction(
+            name=f"Attraction {i}",
+            description="A synthetic attraction used for benchmarking.",
+            destination_id=1,
+            category=("Beach", "Temple", "Museum")[i % 3],
+            latitude=7.9 + i * 1e-5,
+            longitude=98.3 + i * 1e-5,
+            rating=(i % 50) / 10,
+            opening_hours={"monday": {"open": "09:00", "close": "17:00"}},
+            is_must_visit=i % 7 == 0,
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def orm_read(session: Session):
+    """Old read path: hydrate ORM instances and copy attributes."""
+    attractions = session.execute(
+        select(Attraction).filter(Attraction.destination_id == 1)
+    ).scalars().all()
+    result = [
+        {
+            "id": attr.id,
+            "name": attr.name,
+            "description": attr.description,
+            "destination_id": attr.destination_id,
+            "category": attr.category,
+            "latitude": attr.latitude,
+            "longitude": attr.longitude,
+            "image_url": attr.image_url,
+            "rating": attr.rating,
+            "price_range": attr.price_range,
+            "visit_duration_minutes": attr.visit_duration_minutes,
+            "opening_hours": attr.opening_hours,
+            "is_must_visit": attr.is_must_visit
+        }
+        for attr in attractions
+    ]
+    session.expunge_all()
+    return result
+
+
+def mapper_read(session: Session):
+    """New read path: explicit columns mapped straight to dicts."""
+    rows = session.execute(
+        attraction_mapper.select().filter(Attraction.destination_id == 1)
+    ).all()
+    return attraction_mapper.map_all(rows)
+
+
+def bench(name: str, fn, session: Session, repeat: int):
+    """Run a read path several times and print the best rows/second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn(session)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<28} {len(rows) / best:>12,.0f} rows/s  ({best * 1000:.1f} ms)")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Row mapper benchmark")
+    parser.add_argument("--rows", type=int, default=20000, help="Number of attractions")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per read path")
+    args = parser.parse_args()
+    
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.rows)
+        session.expunge_all()
+        
+        assert orm_read(session) == mapper_read(session)
+        
+        orm_time = bench("scalars().all() + dict", orm_read, session, args.repeat)
+        mapper_time = bench("columns + row mapper", mapper_read, session, args.repeat)
+        print(f"Speedup: {orm_time / mapper_time:.2f}x")
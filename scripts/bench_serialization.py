@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Benchmark tool result serialization cost per KB of payload.
+
+Builds ``get_itinerary``-shaped results (long trips, ISO date/time strings)
+and ``get_attractions``-shaped results (large destinations), then compares:
+
+  - stdlib: ``json.dumps``
+  - fastmcp: ``pydantic_core.to_json(indent=2)``, FastMCP's default
+  - orjson: ``app.core.serialization.dumps``
+
+Usage:
+  python scripts/bench_serialization.py [--days 30] [--attractions 5000] [--repeat 20]
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+import pydantic_core
+
+from app.core.serialization import dumps
+
+
+def build_itinerary(days: int, activities_per_day: int = 8):
+    """Build an itinerary result as get_itinerary returns it, dates and times as ISO strings."""
+    start = date(2024, 1, 1)
+    return {
+        "id": 1,
+        "title": f"{days}-Day Itinerary",
+        "description": "A long trip",
+        "destination": {"id": 1, "name": "Phuket", "country": "Thailand"},
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=days - 1)).isoformat(),
+        "created_at": "2024-01-01T12:00:00",
+        "updated_at": "2024-01-01T12:00:00",
+        "days": [
+            {
+                "id": d,
+                "day_number": d + 1,
+                "date": (start + timedelta(days=d)).isoformat(),
+                "activities": [
+                    {
+                        "id": d * 100 + a,
+                        "start_time": f"{9 + a:02d}:00:00",
+                        "end_time": f"{9 + a:02d}:45:00",
+                        "activity_type": "attraction",
+                        "title": f"Visit attraction {a}",
+                        "description": "Travel from previous location to the attraction",
+                        "start_location": {"latitude": 7.9 + a * 0.01, "longitude": 98.3 + a * 0.01},
+                        "end_location": {"latitude": 7.9 + a * 0.01, "longitude": 98.3 + a * 0.01},
+                        "travel_mode": "car",
+                        "travel_duration_minutes": 15,
+                        "notes": None,
+                        "attraction": {"id": a, "name": f"Attraction {a}", "category": "Beach", "rating": 4.5},
+                    }
+                    for a in range(activities_per_day)
+                ],
+            }
+            for d in range(days)
+        ],
+    }
+
+
+def build_attractions(count: int):
+    """Build a get_attractions result."""
+    return [
+        {
+            "id": i,
+            "name": f"Attraction {i}",
+            "description": "A synthetic attraction used for benchmarking serialization.",
+            "destination_id": 1,
+            "category": ("Beach", "Temple", "Museum")[i % 3],
+            "latitude": 7.9 + i * 1e-5,
+            "longitude": 98.3 + i * 1e-5,
+            "image_url": f"https://example.com/{i}.jpg",
+            "rating": (i % 50) / 10,
+            "price_range": i % 4,
+            "visit_duration_minutes": 90,
+            "opening_hours": {"monday": {"open": "09:00", "close": "17:00"}},
+            "is_must_visit": i % 7 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+SERIALIZERS = {
+    "stdlib": lambda obj: json.dumps(obj).encode(),
+    "fastmcp": lambda obj: pydantic_core.to_json(obj, indent=2),
+    "orjson": dumps,
+}
+
+
+def bench(name: str, payload, repeat: int):
+    """Print the cost per KB of each serializer for a payload."""
+    size_kb = len(dumps(payload)) / 1024
+    print(f"{name}: {size_kb:.0f} KB compact")
+    baseline = None
+    for label, serialize in SERIALIZERS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            serialize(payload)
+            best = min(best, time.perf_counter() - start)
+        per_kb = best / size_kb * 1e6
+        baseline = baseline or per_kb
+        print(f"  {label:8s} {best * 1000:8.2f} ms  {per_kb:7.2f} us/KB  {baseline / per_kb:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--attractions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bench(f"get_itinerary ({args.days} days)", build_itinerary(args.days), args.repeat)
+    bench(f"get_attractions ({args.attractions} rows)", build_attractions(args.attractions), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
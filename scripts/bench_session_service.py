@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Benchmark chat throughput of many sessions with and without the session service.
+
+Seeds a synthetic catalog, starts ``main.py`` on it and the stub LLM
+(``tests.stub_llm``) in their own processes, then drives ``--sessions`` sessions
+with ``--concurrency`` users, each turn going to the next session in round
+robin. Compares one ``TravelioChatbot`` per session, each with its own
+connection pools and all kept in memory, against ``ChatSessionService``
+sharing one pool per upstream and keeping at most ``--max-sessions``
+resident, spilling the rest to SQLite. Reports turns/s, turn latency and the
+sockets and sessions held at the end of the run.
+
+Usage:
+  python scripts/bench_session_service.py [--sessions 2000] [--concurrency 200] [--rounds 3] [--max-sessions 500]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from load_test_server import seed, start_server, wait_until_up
+
+from app.client.chatbot import TravelioChatbot
+from app.client.metrics import percentile
+from app.client.session_service import ChatSessionService
+
+SCRIPT = [
+    "find phuket (destination)",
+    "Which attractions should we see first?",
+    "What should we pack for the trip?",
+]
+
+
+def open_sockets() -> int:
+    """Count the sockets this process holds open (Linux only)."""
+    fds = "/proc/self/fd"
+    if not os.path.isdir(fds):
+        return -1
+    count = 0
+    for fd in os.listdir(fds):
+        try:
+            count += os.readlink(os.path.join(fds, fd)).startswith("socket:")
+        except OSError:
+            pass
+    return count
+
+
+async def wait_until_llm_up(client: httpx.AsyncClient, url: str, timeout: float = 30.0):
+    """Poll the stub LLM until it answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.post(url, json={"contents": []})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Stub LLM did not start")
+
+
+class PerSessionChatbots:
+    """Baseline: a chatbot with its own clients per session, never evicted."""
+
+    def __init__(self, mcp_url: str):
+        self.mcp_url = mcp_url
+        self.sessions = {}
+        self.locks = {}
+
+    async def process_command(self, session_id: str, message: str) -> str:
+        if session_id not in self.sessions:
+            self.sessions[session_id] = TravelioChatbot(self.mcp_url)
+            self.locks[session_id] = asyncio.Lock()
+        async with self.locks[session_id]:
+            return await self.sessions[session_id].process_command(message)
+
+    async def close(self):
+        for chatbot in self.sessions.values():
+            await chatbot.close()
+
+
+async def drive(host, args):
+    """Run every session's scripted turns with a fixed number of concurrent users."""
+    turns = asyncio.Queue()
+    for round in range(args.rounds):
+        for session in range(args.sessions):
+            turns.put_nowait((f"session-{session}", SCRIPT[round % len(SCRIPT)]))
+    latencies = []
+    failures = 0
+
+    async def user():
+        nonlocal failures
+        while not turns.empty():
+            session_id, message = turns.get_nowait()
+            start = time.perf_counter()
+            try:
+                await host.process_command(session_id, message)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+    return time.perf_counter() - start, sorted(latencies), failures
+
+
+async def run(args, tmp: str):
+    database_path = os.path.join(tmp, "catalog.db")
+    seed(database_path, args.attractions)
+    process = start_server(args.workers, args.port, database_path)
+    llm = subprocess.Popen([
+        sys.executable, "-m", "tests.stub_llm", "--port", str(args.llm_port), "--chunk-delay", "0",
+        "--base-latency", str(args.base_latency), "--per-token-latency", str(args.per_token_latency)
+    ])
+    os.environ["GEMINI_API_URL"] = f"http://127.0.0.1:{args.llm_port}/v1beta/models/stub:generateContent"
+
+    mcp_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=mcp_url, timeout=60.0) as client:
+            await wait_until_up(client)
+            await wait_until_llm_up(client, os.environ["GEMINI_API_URL"])
+
+        hosts = (
+            ("per-session clients", lambda: PerSessionChatbots(mcp_url)),
+            (f"service max={args.max_sessions}", lambda: ChatSessionService(
+                mcp_url,
+                max_sessions=args.max_sessions,
+                spill_path=os.path.join(tmp, "sessions.sqlite"),
+                max_connections=args.max_connections,
+                max_concurrent_turns=args.max_turns
+            )),
+        )
+        print(f"sessions={args.sessions} concurrency={args.concurrency} turns={args.sessions * args.rounds}")
+        for label, make_host in hosts:
+            host = make_host()
+            sockets_before = open_sockets()
+            try:
+                elapsed, latencies, failures = await drive(host, args)
+                sockets = open_sockets() - sockets_before
+                resident = len(host.sessions)
+            finally:
+                await host.close()
+            print(f"{label}:")
+            print(f"  {len(latencies) / elapsed:8.1f} turns/s   p50 {percentile(latencies, 0.5) * 1000:7.1f} ms   "
+                  f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms   failed {failures}")
+            print(f"  sockets held {sockets}   sessions resident {resident}")
+    finally:
+        for server in (llm, process):
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-turns", type=int, default=50)
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--base-latency", type=float, default=0.2)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--llm-port", type=int, default=8093)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(args, tmp))
+
+
+if __name__ == "__main__":
+    main()
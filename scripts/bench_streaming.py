@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark time to first token of streamed versus complete LLM replies.
+
+Starts the stub LLM (``tests.stub_llm``) on a local port with a delay
+per generated chunk, then sends the same messages through
+``GeminiClient.send_message``, which returns once the reply is complete, and
+``GeminiClient.stream_message``, which yields chunks as they arrive.
+
+Usage:
+  python scripts/bench_streaming.py [--messages 20] [--chunk-delay 0.02] [--port 8092]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import uvicorn
+
+from app.client.gemini_client import GeminiClient
+from tests.stub_llm import create_stub_llm_app
+
+
+async def measure(client: GeminiClient, stream: bool):
+    """Send one message; return seconds to the first text and to the complete reply."""
+    start = time.perf_counter()
+    if not stream:
+        await client.send_message("Plan a relaxed day in Phuket with temples and markets.")
+        total = time.perf_counter() - start
+        return total, total
+
+    first = None
+    async for _ in client.stream_message("Plan a relaxed day in Phuket with temples and markets."):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def run(args):
+    app = create_stub_llm_app(args.base_latency, args.per_token_latency, args.reply_chars, args.chunk_chars, args.chunk_delay)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    url = f"http://127.0.0.1:{args.port}/v1beta/models/stub:generateContent"
+    try:
+        for stream in (False, True):
+            client = GeminiClient(api_url=url)
+            results = [await measure(client, stream) for _ in range(args.messages)]
+            await client.close()
+            ttft = statistics.median(r[0] for r in results) * 1000
+            total = statistics.median(r[1] for r in results) * 1000
+            print(f"{'stream_message' if stream else 'send_message':15s} first text {ttft:7.1f} ms   complete {total:7.1f} ms")
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--reply-chars", type=int, default=600)
+    parser.add_argument("--chunk-chars", type=int, default=40)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8092)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Load test the chatbot end to end against the MCP server and a stub LLM.
+
+Seeds a synthetic catalog, starts ``main.py`` on it, starts the stub LLM
+(``tests.stub_llm``) in process and runs many concurrent
+``TravelioChatbot`` sessions through a scripted conversation: search a
+destination, ask about attractions and hotels, plan an itinerary, then a
+free question. Reports turn throughput, time to first chunk and turn latency
+percentiles, and failed turns. The stub's latency distribution, token
+throughput and error rate shape the LLM hop.
+
+Usage:
+  python scripts/load_test_chatbot.py [--sessions 100] [--rounds 1] [--latency-distribution lognormal]
+                                      [--tokens-per-second 200] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+import uvicorn
+
+from load_test_server import seed, start_server, wait_until_up
+
+from app.client.chatbot import TravelioChatbot
+from app.client.metrics import percentile
+from tests.stub_llm import ERROR_STATUSES, LATENCY_DISTRIBUTIONS, create_stub_llm_app
+
+SCRIPT = [
+    "find phuket (destination)",
+    "Which attractions should we see first?",
+    "Are there good hotels near the beach?",
+    "Please create an itinerary for 3 days",
+    "What should we pack for the trip?",
+]
+
+# Replies the chatbot gives instead of raising when a tool or the LLM fails
+FAILURE_PREFIXES = ("Sorry", "Error")
+
+
+async def run_session(mcp_url: str, rounds: int, results: dict):
+    """Run the scripted conversation; record per-turn latencies and failures."""
+    chatbot = TravelioChatbot(mcp_url)
+    try:
+        for _ in range(rounds):
+            for message in SCRIPT:
+                start = time.perf_counter()
+                first = None
+                reply = []
+                try:
+                    async for chunk in chatbot.stream_command(message):
+                        if first is None:
+                            first = time.perf_counter() - start
+                        reply.append(chunk)
+                except Exception:
+                    results["failures"] += 1
+                    continue
+                if "".join(reply).startswith(FAILURE_PREFIXES):
+                    results["failures"] += 1
+                    continue
+                results["first_chunk"].append(first)
+                results["latencies"].append(time.perf_counter() - start)
+    finally:
+        await chatbot.close()
+
+
+async def run(args, database_path: str):
+    process = start_server(args.workers, args.port, database_path)
+    app = create_stub_llm_app(
+        args.base_latency, args.per_token_latency,
+        chunk_delay=args.chunk_delay,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    llm = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.llm_port, log_level="warning"))
+    serving = asyncio.create_task(llm.serve())
+    os.environ["GEMINI_API_URL"] = f"http://127.0.0.1:{args.llm_port}/v1beta/models/stub:generateContent"
+
+    mcp_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=mcp_url, timeout=60.0) as client:
+            await wait_until_up(client)
+        while not llm.started:
+            await asyncio.sleep(0.01)
+
+        results = {"latencies": [], "first_chunk": [], "failures": 0}
+        start = time.perf_counter()
+        await asyncio.gather(*(run_session(mcp_url, args.rounds, results) for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        llm.should_exit = True
+        await serving
+        process.terminate()
+        process.wait()
+
+    turns = args.sessions * args.rounds * len(SCRIPT)
+    latencies = sorted(results["latencies"])
+    first_chunk = sorted(results["first_chunk"])
+    print(f"sessions={args.sessions} turns={turns} in {elapsed:.1f}s: {turns / elapsed:8.1f} turns/s")
+    for label, values in (("first chunk", first_chunk), ("turn", latencies)):
+        print(f"  {label:11s} p50 {percentile(values, 0.5) * 1000:7.1f} ms   "
+              f"p95 {percentile(values, 0.95) * 1000:7.1f} ms   p99 {percentile(values, 0.99) * 1000:7.1f} ms")
+    print(f"  failed turns {results['failures']}   LLM calls {len(app.state.requests) + app.state.errors}   "
+          f"injected LLM errors {app.state.errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--base-latency", type=float, default=0.2)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, choices=sorted(ERROR_STATUSES), default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--llm-port", type=int, default=8092)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "catalog.db")
+        seed(database_path, args.attractions)
+        asyncio.run(run(args, database_path))
+
+
+if __name__ == "__main__":
+    main()
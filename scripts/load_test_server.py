@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Load test the production server entry point with different worker counts.
+
+Seeds a synthetic catalog into a SQLite file, starts ``main.py`` once per
+worker count with ``DATABASE_URI`` pointed at it, and drives a fixed number
+of concurrent clients against ``POST /tool/<tool>`` for a fixed duration.
+``cluster_attractions`` runs K-means per call, so it is CPU bound and shows
+throughput scaling with worker processes.
+
+Usage:
+  python scripts/load_test_server.py [--workers 1 2 4] [--concurrency 32] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Destination, Attraction
+
+
+def seed(path: str, attractions: int):
+    """Create a SQLite catalog with one destination and its attractions."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Destination(id=1, name="Phuket", country="Thailand", latitude=7.95, longitude=98.33))
+        session.add_all(
+            Attraction(
+                id=i + 1,
+                name=f"Attraction {i}",
+                destination_id=1,
+                category=("Beach", "Temple", "Museum")[i % 3],
+                latitude=7.8 + (i % 17) * 0.02,
+                longitude=98.2 + (i % 13) * 0.02,
+                rating=(i % 50) / 10,
+                is_must_visit=i % 7 == 0,
+            )
+            for i in range(attractions)
+        )
+        session.commit()
+    engine.dispose()
+
+
+def start_server(workers: int, port: int, database_path: str) -> subprocess.Popen:
+    """Start main.py with the given number of workers."""
+    env = dict(
+        os.environ,
+        DATABASE_URI=f"sqlite+aiosqlite:///{database_path}",
+        SERVER_HOST="127.0.0.1",
+        SERVER_PORT=str(port),
+        SERVER_WORKERS=str(workers),
+    )
+    return subprocess.Popen([sys.executable, "main.py"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0):
+    """Poll the server until it answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.post("/tool/get_destinations", json={})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+async def drive(client: httpx.AsyncClient, tool: str, arguments: dict, concurrency: int, duration: float):
+    """Run concurrent clients for a duration; return latencies and error count."""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            response = await client.post(f"/tool/{tool}", json=arguments)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run(args, database_path: str):
+    arguments = {"attraction_ids": list(range(1, args.attractions + 1)), "num_days": 5}
+    print(f"tool={args.tool} concurrency={args.concurrency} duration={args.duration}s")
+
+    for workers in args.workers:
+        process = start_server(workers, args.port, database_path)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60.0) as client:
+                await wait_until_up(client)
+                # Warm every worker's caches before measuring
+                await drive(client, args.tool, arguments, args.concurrency, 1.0)
+                latencies, errors = await drive(client, args.tool, arguments, args.concurrency, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(f"  workers={workers}: {len(latencies) / args.duration:8.1f} req/s   "
+              f"p50 {p50:6.1f} ms   p99 {p99:6.1f} ms   errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tool", default="cluster_attractions")
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "catalog.db")
+        seed(database_path, args.attractions)
+        asyncio.run(run(args, database_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Print per-request timelines from a span file written with TRACE_EXPORT_PATH.
+
+Each trace is printed as an indented tree of spans with their offset from
+the start of the request and their duration, slowest traces first.
+
+Usage:
+  python scripts/trace_timeline.py trace.jsonl [--tool create_itinerary] [--limit 5]
+"""
+import argparse
+import json
+from collections import defaultdict
+
+
+def load_traces(path: str):
+    """Group spans by trace ID."""
+    traces = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def print_trace(spans):
+    """Print one trace as an indented tree."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"]].append(span)
+    roots = children[None]
+    origin = min(span["start"] for span in spans)
+
+    def walk(span, depth):
+        offset_ms = (span["start"] - origin) * 1000
+        label = span["name"]
+        if span["kind"] == "sql":
+            label = "sql: " + " ".join(span["attributes"].get("statement", "").split())[:80]
+        error = f"  !! {span['error']}" if span["error"] else ""
+        print(f"{offset_ms:9.1f} ms {span['duration_ms']:9.1f} ms  {'  ' * depth}{label}{error}")
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start"]):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--tool", help="Only show traces rooted at this tool")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    traces = []
+    for spans in load_traces(args.path).values():
+        roots = [span for span in spans if span["parent_id"] is None]
+        if not roots or (args.tool and roots[0]["name"] != args.tool):
+            continue
+        traces.append((roots[0]["duration_ms"], spans))
+
+    print(f"{'offset':>12} {'duration':>12}  span")
+    for _, spans in sorted(traces, key=lambda t: -t[0])[:args.limit]:
+        print_trace(spans)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.mcp.admission import AdmissionController, PriorityLimiter, ToolRejected
+
+def controller(**overrides):
+    options = dict(max_concurrency=1, tool_limits={"plan": 1}, default_tool_limit=5, max_queue=10, queue_timeout=1.0)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+async def hold(admission, tool, read_only, started, release, order):
+    async with admission.admit(tool, read_only):
+        order.append(tool)
+        started.set()
+        await release.wait()
+
+@pytest.mark.asyncio
+async def test_reads_are_admitted_before_queued_writes():
+    """Test a waiting read takes the next global slot ahead of an earlier write."""
+    admission = controller(tool_limits={})
+    order = []
+    release = asyncio.Event()
+    release.set()
+    first_started, first_release = asyncio.Event(), asyncio.Event()
+
+    first = asyncio.create_task(hold(admission, "plan", False, first_started, first_release, order))
+    await first_started.wait()
+    write = asyncio.create_task(hold(admission, "plan", False, asyncio.Event(), release, order))
+    await asyncio.sleep(0)
+    read = asyncio.create_task(hold(admission, "get_itinerary", True, asyncio.Event(), release, order))
+    await asyncio.sleep(0)
+    assert admission.waiting == {"plan": 1, "get_itinerary": 1}
+
+    first_release.set()
+    await asyncio.gather(first, write, read)
+
+    assert order == ["plan", "get_itinerary", "plan"]
+    assert admission.global_limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_saturated_tool_is_rejected():
+    """Test fast rejection without queuing and rejection on a full queue."""
+    admission = controller(max_concurrency=5, queue_timeout=0)
+    started, release = asyncio.Event(), asyncio.Event()
+    task = asyncio.create_task(hold(admission, "plan", False, started, release, []))
+    await started.wait()
+
+    with pytest.raises(ToolRejected) as excinfo:
+        async with admission.admit("plan"):
+            pass
+    assert excinfo.value.reason == "timeout"
+
+    # Other tools still have their own slots
+    async with admission.admit("get_hotels", read_only=True):
+        pass
+
+    full = controller(max_concurrency=5, max_queue=0)
+    with pytest.raises(ToolRejected) as excinfo:
+        async with full.admit("get_hotels"):
+            pass
+    assert excinfo.value.reason == "queue_full"
+
+    release.set()
+    await task
+    assert admission.rejections == {("plan", "timeout"): 1}
+    assert 'travelio_admission_rejections_total{tool="plan",reason="timeout"} 1' in admission.render()
+
+@pytest.mark.asyncio
+async def test_limiter_timeout_and_cancellation_free_slots():
+    """Test waiters that give up never leak or swallow slots."""
+    limiter = PriorityLimiter(1)
+    await limiter.acquire()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.acquire(timeout=0.01)
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    assert limiter.active == 0
+    await asyncio.wait_for(limiter.acquire(), 0.1)
+    assert limiter.active == 1
@@ -0,0 +1,129 @@
+import asyncio
+import httpx
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from app.client.mcp_client import TravelioMCPClient
+from app.mcp import server
+from app.mcp.wrapper import InFlightTracker, cancel_on_disconnect
+
+MCP_HEADERS = {"Accept": "application/json, text/event-stream"}
+
+def test_asgi_app_serves_tools_and_mcp():
+    """Test the ASGI app serves the REST tool routes and streamable HTTP MCP."""
+    mock_destinations = [{"id": 1, "name": "Paris", "country": "France"}]
+
+    with patch.object(server.destination_service, 'get_destinations',
+                      new=AsyncMock(return_value=mock_destinations)), \
+         TestClient(server.asgi_app) as client:
+        # REST route used by TravelioMCPClient
+        response = client.post("/tool/get_destinations", json={"search_term": "Paris"})
+        assert response.status_code == 200
+        assert response.json() == mock_destinations
+
+        assert client.post("/tool/unknown", json={}).status_code == 404
+        assert client.post("/tool/get_itinerary", json={"wrong": 1}).status_code == 422
+
+        # Tool schemas, used by the chatbot for function calling
+        listed = {t["name"]: t for t in client.get("/tools").json()}
+        assert set(listed) == set(server.tools)
+        assert listed["get_attractions"]["inputSchema"]["required"] == ["destination_id"]
+
+        # MCP protocol over streamable HTTP, without a session
+        response = client.post("/mcp", headers=MCP_HEADERS, json={
+            "jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}
+        })
+        assert response.status_code == 200
+        tool_names = {t["name"] for t in response.json()["result"]["tools"]}
+        assert tool_names == set(server.tools)
+
+        # Tool results are sent as compact JSON text
+        response = client.post("/mcp", headers=MCP_HEADERS, json={
+            "jsonrpc": "2.0", "id": 2, "method": "tools/call",
+            "params": {"name": "get_destinations", "arguments": {"search_term": "Paris"}}
+        })
+        content = response.json()["result"]["content"]
+        assert content == [{"type": "text", "text": '[{"id":1,"name":"Paris","country":"France"}]'}]
+        assert server.in_flight.active == 0
+
+@pytest.mark.asyncio
+async def test_in_flight_tracker_drains():
+    """Test draining waits for tracked calls and gives up after the timeout."""
+    tracker = InFlightTracker()
+    release = asyncio.Event()
+
+    async def call():
+        async with tracker.track():
+            await release.wait()
+
+    task = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    assert tracker.active == 1
+    assert await tracker.drain(0.01) is False
+
+    release.set()
+    assert await tracker.drain(1.0) is True
+    await task
+    assert tracker.active == 0
+
+@pytest.mark.asyncio
+async def test_tool_route_enforces_client_timeout():
+    """Test the X-Timeout-Seconds header becomes the tool call's deadline."""
+    async def slow_destinations(search_term):
+        await asyncio.sleep(5)
+
+    transport = httpx.ASGITransport(app=server.asgi_app)
+    with patch.object(server.destination_service, 'get_destinations', new=slow_destinations):
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            response = await client.post("/tool/get_destinations", json={}, headers={"X-Timeout-Seconds": "0.05"})
+
+    assert response.status_code == 504
+    assert server.in_flight.active == 0
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_tool_call():
+    """Test a client disconnect cancels the running tool call."""
+    cancelled = asyncio.Event()
+
+    async def call():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancel_on_disconnect(SimpleNamespace(receive=receive), call())
+    assert cancelled.is_set()
+
+@pytest.mark.asyncio
+async def test_tool_errors_map_to_client_errors(catalog_db):
+    """Test invalid arguments are 422, missing records 404 and bad values 400, each with its detail."""
+    transport = httpx.ASGITransport(app=server.asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/tool/get_itinerary", json={"itinerary_id": "abc"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["itinerary_id"]
+
+        response = await client.post("/tool/get_itinerary", json={"itinerary_id": 999})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Itinerary with ID 999 not found"
+
+        response = await client.post("/tool/create_itinerary", json={
+            "destination_id": 1, "num_days": 2, "start_date": "next week"
+        })
+        assert response.status_code == 400
+        assert "next week" in response.json()["detail"]
+
+        response = await client.post("/tool/get_attractions", json={"destination_id": 1, "limit": 5})
+        assert response.status_code == 422
+
+    client = TravelioMCPClient("http://test", transport=transport)
+    with pytest.raises(httpx.HTTPStatusError, match="Itinerary with ID 999 not found"):
+        await client.get_itinerary(999)
+    await client.close()
@@ -0,0 +1,63 @@
+import json
+import time
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.db.models import Attraction
+from app.mcp import server
+from app.services.catalog_cache import CatalogCache
+
+@pytest.mark.asyncio
+async def test_catalog_tools_return_not_modified_until_catalog_changes(catalog_db):
+    """Test a matching version skips the payload and a catalog write changes the version."""
+    assert len(await server.get_destinations()) == 2
+
+    first = await server.get_destinations(if_none_match="")
+    assert len(first["data"]) == 2
+
+    unchanged = await server.get_destinations(if_none_match=first["version"])
+    assert unchanged == {"version": first["version"], "not_modified": True}
+
+    async with async_sessionmaker(catalog_db)() as session:
+        session.add(Attraction(id=6, name="Phi Phi Islands", destination_id=2, category="Beach",
+                               latitude=7.74, longitude=98.77, rating=4.9))
+        await session.commit()
+
+    changed = await server.get_attractions(2, if_none_match=first["version"])
+    assert changed["version"] != first["version"]
+    assert sorted(a["id"] for a in changed["data"]) == [5, 6]
+
+@pytest.mark.asyncio
+async def test_catalog_version_holds_across_time_and_workers(catalog_db, monkeypatch):
+    """Test an unchanged catalog keeps its version past the ranking TTL and in other processes."""
+    first = await server.get_hotels(1, if_none_match="")
+
+    later = time.time() + 10 * settings.CATALOG_CACHE_TTL_SECONDS
+    monkeypatch.setattr(time, "time", lambda: later)
+    unchanged = await server.get_hotels(1, if_none_match=first["version"])
+
+    assert unchanged == {"version": first["version"], "not_modified": True}
+    # A cache of another worker reads the same committed generation
+    assert await CatalogCache().version() == first["version"]
+
+@pytest.mark.asyncio
+async def test_get_itinerary_not_modified_skips_loading(catalog_db, monkeypatch):
+    """Test an unchanged itinerary is answered from its update time alone."""
+    created = await server.create_itinerary(destination_id=1, num_days=1, start_date="2024-01-01")
+
+    first = await server.get_itinerary(created["id"], if_none_match="")
+    assert first["data"]["id"] == created["id"]
+    # The service result stays JSON-native, dates and times as ISO strings
+    assert first["data"]["start_date"] == "2024-01-01"
+    assert first["data"]["days"][0]["date"] == "2024-01-01"
+    assert json.loads(json.dumps(first["data"])) == first["data"]
+
+    async def fail(itinerary_id):
+        raise AssertionError("itinerary was loaded")
+
+    monkeypatch.setattr(server.itinerary_service, "get_itinerary", fail)
+    result = await server.get_itinerary(created["id"], if_none_match=first["version"])
+
+    assert result == {"version": first["version"], "not_modified": True}
+    with pytest.raises(ValueError):
+        await server.get_itinerary(999, if_none_match=first["version"])
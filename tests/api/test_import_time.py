@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def import_times(module: str) -> dict:
+    """Import a module in a fresh interpreter; return cumulative import microseconds by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+@pytest.mark.parametrize("module, lazy", [
+    ("app.mcp.server", ["sklearn", "numpy", "scipy", "google.generativeai"]),
+    ("app.client.chatbot", ["httpx", "dotenv", "google.generativeai"]),
+])
+def test_heavy_dependencies_are_imported_lazily(module, lazy):
+    """Test cold start does not import dependencies only needed on first use."""
+    times = import_times(module)
+
+    imported = [name for name in lazy if name in times]
+    assert not imported, f"{module} imported {imported} in {times[module] / 1e6:.2f}s"
+
+def test_clusterer_imports_sklearn_on_first_use():
+    """Test clustering still works once sklearn is imported lazily."""
+    from app.core.clustering import AttractionClusterer
+
+    attractions = [
+        {"id": 1, "latitude": 7.90, "longitude": 98.29},
+        {"id": 2, "latitude": 7.91, "longitude": 98.30},
+        {"id": 3, "latitude": 8.50, "longitude": 99.00},
+    ]
+    clusters = AttractionClusterer().cluster_attractions(attractions, 2)
+
+    assert sorted(len(group) for group in clusters.values()) == [1, 2]
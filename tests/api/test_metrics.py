@@ -0,0 +1,81 @@
+import httpx
+import pytest
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.mcp import server
+from app.mcp.metrics import Histogram, ToolMetrics
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram buckets are cumulative with +Inf equal to the count."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+
+    lines = histogram.render("latency", 'tool="t"')
+
+    assert lines[:3] == [
+        'latency_bucket{tool="t",le="0.1"} 1',
+        'latency_bucket{tool="t",le="1.0"} 3',
+        'latency_bucket{tool="t",le="+Inf"} 4',
+    ]
+    assert lines[-1] == 'latency_count{tool="t"} 4'
+
+def test_track_call_counts_errors_and_phases():
+    """Test phases are attributed to the enclosing tool call only."""
+    metrics = ToolMetrics()
+
+    with metrics.track_call("plan"):
+        with metrics.phase("planning"):
+            pass
+    with pytest.raises(ValueError):
+        with metrics.track_call("plan"):
+            raise ValueError("boom")
+    with metrics.phase("planning"):
+        pass
+
+    assert metrics.calls == {"plan": 2}
+    assert metrics.errors == {"plan": 1}
+    assert metrics.latency[("plan", "total")].count == 2
+    assert metrics.latency[("plan", "planning")].count == 1
+
+def test_failed_statement_does_not_leak_start_time():
+    """Test a statement that raises still pops its start time and counts as DB time."""
+    metrics = ToolMetrics()
+    engine = create_engine("sqlite://")
+    metrics.attach_db_timing(engine)
+
+    with engine.connect() as conn:
+        with metrics.track_call("lookup"):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+        assert conn.info["query_start"] == []
+
+    assert metrics.latency[("lookup", "db")].count == 1
+    engine.dispose()
+
+@pytest.mark.asyncio
+async def test_tool_phases_and_metrics_endpoint(catalog_db):
+    """Test create_itinerary reports DB, clustering and planning time on /metrics."""
+    metrics = ToolMetrics()
+    metrics.attach_db_timing(catalog_db.sync_engine)
+
+    with patch.object(server, "tool_metrics", metrics), \
+         patch.object(server.itinerary_service, "save_itinerary", new=AsyncMock(return_value=1)):
+        await server.create_itinerary(destination_id=1, num_days=2, start_date="2023-08-01")
+
+        transport = httpx.ASGITransport(app=server.asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            response = await client.get("/metrics")
+
+    assert {phase for tool, phase in metrics.latency if tool == "create_itinerary"} == {
+        "total", "db", "clustering", "planning"
+    }
+    assert metrics.latency[("create_itinerary", "db")].sum > 0
+    assert response.status_code == 200
+    assert 'travelio_tool_calls_total{tool="create_itinerary"} 1' in response.text
+    assert 'phase="clustering",le="+Inf"} 1' in response.text
+    assert "travelio_db_pool_checked_out 0" in response.text
+    assert "# TYPE travelio_sql_compile_cache_hits_total counter" in response.text
+    assert "travelio_sql_compile_cache_hit_ratio " in response.text
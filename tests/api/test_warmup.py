@@ -0,0 +1,49 @@
+import httpx
+import pytest
+from app.mcp import server
+from app.mcp.warmup import Warmup
+from app.services.catalog_cache import catalog_cache
+
+@pytest.mark.asyncio
+async def test_failed_stage_is_recorded_and_still_ready():
+    """Test a failing stage does not block readiness or later stages."""
+    warmup = Warmup()
+    ran = []
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def fine():
+        ran.append("fine")
+
+    await warmup.run([("broken", broken), ("fine", fine)])
+
+    assert warmup.ready
+    assert ran == ["fine"]
+    assert warmup.errors == {"broken": "RuntimeError: boom"}
+    assert set(warmup.durations) == {"broken", "fine"}
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_caches_and_reports_ready(catalog_db, monkeypatch):
+    """Test /ready returns 503 until warm-up has loaded the hot destinations."""
+    monkeypatch.setattr(server, "async_engine", catalog_db)
+    monkeypatch.setattr(server, "warmup", Warmup())
+    monkeypatch.setattr(server.destination_service, "_search_index", None)
+
+    transport = httpx.ASGITransport(app=server.asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+        await server.warm_up()
+
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        report = response.json()
+
+    assert report["errors"] == {}
+    assert set(report["stages"]) == {"pool", "catalog", "planning", "statements"}
+    assert catalog_cache.get_ranking(1) is not None
+    assert catalog_cache.get_ranking(2) is not None
+    assert server.destination_service._search_index is not None
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from app.client.chatbot import TravelioChatbot
+from app.client.mcp_client import TravelioMCPClient
+
+DESTINATIONS = {"phuket": {"id": 1, "name": "Phuket"}, "krabi": {"id": 2, "name": "Krabi"}}
+
+class StubServer:
+    """Stub MCP server that holds catalog calls until released and tracks their concurrency."""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.release = asyncio.Event()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        tool = request.url.path.rsplit("/", 1)[-1]
+        arguments = json.loads(request.content)
+        self.calls.append((tool, arguments.get("destination_id")))
+        if tool == "get_destinations":
+            return httpx.Response(200, json=[DESTINATIONS[arguments["search_term"]]])
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        return httpx.Response(200, json=[{"id": arguments["destination_id"] * 10, "name": tool}])
+
+@pytest.fixture
+def chatbot(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    server = StubServer()
+    bot = TravelioChatbot()
+    bot.mcp_client = TravelioMCPClient("http://stub", transport=httpx.MockTransport(server.handle))
+    bot.claude_client.send_message = AsyncMock(return_value="reply")
+    bot.server = server
+    return bot
+
+@pytest.mark.asyncio
+async def test_selecting_destination_prefetches_attractions_and_hotels_concurrently(chatbot):
+    """Test attractions and hotels load in parallel right after a destination is selected."""
+    await chatbot.process_command("find phuket (destination)")
+    await asyncio.sleep(0.01)
+
+    assert chatbot.server.max_active == 2
+    chatbot.server.release.set()
+
+    assert await chatbot.process_command("show me attractions") == "reply"
+    assert await chatbot.process_command("any hotels?") == "reply"
+    assert chatbot.current_attractions == [{"id": 10, "name": "get_attractions"}]
+    assert chatbot.current_hotels == [{"id": 10, "name": "get_hotels"}]
+    assert [call[0] for call in chatbot.server.calls].count("get_attractions") == 1
+    await chatbot.close()
+
+@pytest.mark.asyncio
+async def test_switching_destination_cancels_prefetch(chatbot):
+    """Test a prefetch for a destination the user moved away from is cancelled."""
+    await chatbot.process_command("find phuket (destination)")
+    first = chatbot._prefetch
+    await asyncio.sleep(0.01)
+
+    await chatbot.process_command("find krabi (destination)")
+    await asyncio.sleep(0.01)
+    assert first.cancelled()
+
+    chatbot.server.release.set()
+    await chatbot.process_command("show me attractions")
+    assert chatbot.current_attractions == [{"id": 20, "name": "get_attractions"}]
+    await chatbot.close()
+
+@pytest.mark.asyncio
+async def test_stream_command_yields_reply_chunks(chatbot):
+    """Test stream_command passes Gemini's chunks through and plain replies as one chunk."""
+    async def stream_message(message, context=None):
+        for chunk in ("Phuket ", "is ", "lovely"):
+            yield chunk
+
+    chatbot.claude_client.stream_message = stream_message
+
+    assert [chunk async for chunk in chatbot.stream_command("tell me something")] == ["Phuket ", "is ", "lovely"]
+    assert [chunk async for chunk in chatbot.stream_command("/reset")] == ["Conversation has been reset."]
+    await chatbot.close()
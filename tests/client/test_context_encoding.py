@@ -0,0 +1,76 @@
+import json
+from app.client.context_encoding import ContextEncoder, encode_context
+from app.core.clustering import AttractionClusterer
+from app.core.itinerary_planner import ItineraryPlanner
+
+def test_records_become_tables_with_constant_columns_hoisted():
+    """Test a list of records is one header plus a row each, without nulls or dropped fields."""
+    context = {
+        "destination": {"id": 1, "name": "Phuket", "image_url": "https://example.com/1.jpg"},
+        "hotels": [
+            {"id": 1, "name": "Patong Resort", "destination_id": 1, "rating": 4.25, "notes": None, "latitude": 7.9},
+            {"id": 2, "name": "Old Town | Inn", "destination_id": 1, "rating": 4.6, "notes": "quiet", "latitude": 7.8},
+        ],
+    }
+
+    assert encode_context(context).splitlines() == [
+        "destination:",
+        "  id: 1",
+        "  name: Phuket",
+        "hotels[2]{id|name|rating|notes}: destination_id=1",
+        "  1|Patong Resort|4.25|",
+        '  2|"Old Town | Inn"|4.6|quiet',
+    ]
+
+def test_fields_repeating_the_parent_are_dropped():
+    """Test nested records with lists are written one by one, without their parent's values."""
+    context = {"itinerary": {"hotel_id": 2, "days": [
+        {"day_number": 1, "hotel_id": 2, "activities": [{"title": "Beach", "start_location": {"latitude": 7.9}}]},
+    ]}}
+
+    assert ContextEncoder().encode(context).splitlines() == [
+        "itinerary:",
+        "  hotel_id: 2",
+        "  days[0]:",
+        "    day_number: 1",
+        "    activities[1]{title}:",
+        "      Beach",
+    ]
+
+def test_ids_matching_the_parent_are_kept():
+    """Test only inherited keys are dropped, so records keep ids that collide with their parent's."""
+    context = {"itinerary": {"id": 3, "destination_id": 1, "destination": {"id": 3, "name": "Phuket"}, "days": [
+        {"id": 3, "destination_id": 1, "activities": [{"id": 3, "title": "Beach"}, {"id": 4, "title": "Temple"}]},
+    ]}}
+
+    assert ContextEncoder().encode(context).splitlines() == [
+        "itinerary:",
+        "  id: 3",
+        "  destination_id: 1",
+        "  destination:",
+        "    id: 3",
+        "    name: Phuket",
+        "  days[0]:",
+        "    id: 3",
+        "    activities[2]{id|title}:",
+        "      3|Beach",
+        "      4|Temple",
+    ]
+
+def test_planner_itinerary_shrinks_by_more_than_half():
+    """Test a planned itinerary encodes far smaller than indented JSON and keeps its content."""
+    attractions = [
+        {"id": i, "name": f"Attraction {i}", "description": "A place to visit", "category": "Beach",
+         "latitude": 7.8 + i * 0.01, "longitude": 98.3 + i * 0.013, "visit_duration_minutes": 90}
+        for i in range(9)
+    ]
+    clustered = AttractionClusterer().cluster_attractions(attractions, 3)
+    itinerary = ItineraryPlanner().create_itinerary(1, "2024-01-01", 3, clustered, hotel_id=2)
+    context = {"itinerary": itinerary}
+
+    encoded = encode_context(context)
+
+    assert len(encoded) < 0.5 * len(json.dumps(context, indent=2))
+    for day in itinerary["days"]:
+        for activity in day["activities"]:
+            assert activity["title"] in encoded
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.client.chatbot import TravelioChatbot
+from app.client.function_calling import function_declaration
+from app.client.gemini_client import GeminiClient
+from app.client.mcp_client import TravelioMCPClient
+from tests.stub_llm import create_stub_llm_app
+
+TOOLS = [
+    {
+        "name": "get_hotels",
+        "description": "Get hotels in a destination area.\n\nArgs:\n    destination_id: ID of the destination\n"
+                       "    filters: Optional filters to apply\n    if_none_match: Optional version from a previous\n"
+                       "        result\n",
+        "inputSchema": {
+            "type": "object",
+            "title": "get_hotelsArguments",
+            "properties": {
+                "destination_id": {"title": "Destination Id", "type": "integer"},
+                "filters": {"additionalProperties": True, "default": {}, "title": "Filters", "type": "object"},
+                "if_none_match": {"anyOf": [{"type": "string"}, {"type": "null"}], "default": None},
+            },
+            "required": ["destination_id"],
+        },
+    },
+    {
+        "name": "get_destinations",
+        "description": "Get all destinations or search by name.\n\nArgs:\n    search_term: Optional search term\n",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"search_term": {"anyOf": [{"type": "string"}, {"type": "null"}], "default": None}},
+        },
+    },
+]
+
+HOTELS = {"name": "get_hotels", "args": {"destination_id": 1}}
+SEARCH = {"name": "get_destinations", "args": {"search_term": "phuket"}}
+
+def make_client(monkeypatch, function_calls):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    app = create_stub_llm_app(base_latency=0, per_token_latency=0, reply_chars=40, function_calls=function_calls)
+    client = GeminiClient(
+        api_url="http://stub/v1beta/models/stub:generateContent",
+        transport=httpx.ASGITransport(app=app)
+    )
+    return client, app
+
+class SlowTools:
+    """Tools that take a while and track how many run at once."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.fail = fail
+
+    async def __call__(self, name, arguments):
+        self.calls.append(name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.active -= 1
+        if name in self.fail:
+            raise RuntimeError("tool failed")
+        return [{"id": 1, "name": name}]
+
+def test_declarations_follow_tool_schemas():
+    """Test declarations keep typed parameters with their docstring descriptions, minus protocol ones."""
+    hotels, destinations = (function_declaration(tool) for tool in TOOLS)
+
+    assert hotels == {
+        "name": "get_hotels",
+        "description": "Get hotels in a destination area.",
+        "parameters": {
+            "type": "object",
+            "properties": {"destination_id": {"type": "integer", "description": "ID of the destination"}},
+            "required": ["destination_id"],
+        },
+    }
+    assert destinations["parameters"]["properties"]["search_term"] == {
+        "type": "string", "nullable": True, "description": "Optional search term"
+    }
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrent, max_active", [(True, 2), (False, 1)])
+async def test_calls_of_one_response_run_concurrently(monkeypatch, concurrent, max_active):
+    """Test the tool calls of one model response run at once and the turn is timed."""
+    client, app = make_client(monkeypatch, [[HOTELS, SEARCH]])
+    tools = SlowTools()
+    functions = [function_declaration(tool) for tool in TOOLS]
+
+    reply = await client.send_message_with_tools("Hotels in Phuket?", functions, tools, concurrent=concurrent)
+    await client.close()
+
+    assert len(reply) == 40
+    assert sorted(tools.calls) == ["get_destinations", "get_hotels"]
+    assert tools.max_active == max_active
+    assert [turn["role"] for turn in client.history.turns] == ["user", "model"]
+
+    summary = client.last_turn.summary()
+    assert (summary["llm_calls"], summary["tool_calls"], summary["tool_errors"]) == (2, 2, 0)
+    assert summary["tool_call_ms"] >= 100
+    assert summary["tool_ms"] < 90 if concurrent else summary["tool_ms"] >= 100
+    assert summary["total_ms"] >= summary["llm_ms"] + summary["tool_ms"]
+
+@pytest.mark.asyncio
+async def test_tool_call_budget_ends_the_turn(monkeypatch):
+    """Test calls beyond the budget are refused and the model must answer without tools."""
+    client, app = make_client(monkeypatch, [[HOTELS, SEARCH, HOTELS], [SEARCH]])
+    tools = SlowTools()
+    functions = [function_declaration(tool) for tool in TOOLS]
+
+    reply = await client.send_message_with_tools("Hotels?", functions, tools, max_tool_calls=2)
+    await client.close()
+
+    assert reply
+    assert len(tools.calls) == 2
+    summary = client.last_turn.summary()
+    assert (summary["llm_calls"], summary["tool_calls"], summary["skipped_calls"]) == (2, 2, 1)
+
+@pytest.mark.asyncio
+async def test_failed_and_unknown_tools_are_reported_to_the_model(monkeypatch):
+    """Test tool failures become error responses instead of failing the turn."""
+    client, app = make_client(monkeypatch, [[HOTELS, {"name": "drop_tables", "args": {}}]])
+    tools = SlowTools(fail={"get_hotels"})
+    functions = [function_declaration(tool) for tool in TOOLS]
+
+    assert await client.send_message_with_tools("Hotels?", functions, tools)
+    await client.close()
+
+    assert tools.calls == ["get_hotels"]
+    assert client.last_turn.summary()["tool_errors"] == 2
+
+@pytest.mark.asyncio
+async def test_chatbot_answers_with_mcp_tools(monkeypatch):
+    """Test the chatbot declares the server's tools and runs the calls on the MCP server."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("GEMINI_API_URL", "http://stub/v1beta/models/stub:generateContent")
+    requests = []
+
+    def handle_mcp(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/tools":
+            return httpx.Response(200, json=TOOLS)
+        arguments = json.loads(request.content)
+        return httpx.Response(200, json=[{"id": arguments["destination_id"] * 10, "name": "Beach Resort"}])
+
+    mcp_client = TravelioMCPClient("http://mcp", transport=httpx.MockTransport(handle_mcp))
+    llm = create_stub_llm_app(base_latency=0, per_token_latency=0, reply_chars=40, function_calls=[[HOTELS]])
+    llm_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=llm))
+    chatbot = TravelioChatbot(mcp_client=mcp_client, llm_http_client=llm_client, function_calling=True)
+
+    assert len(await chatbot.process_command("Which hotels are in Phuket?")) == 40
+    assert await chatbot.process_command("And again?")
+    await chatbot.close()
+    await mcp_client.close()
+    await llm_client.aclose()
+
+    assert requests == ["/tools", "/tool/get_hotels", "/tool/get_hotels"]
+    assert chatbot.current_hotels == [{"id": 10, "name": "Beach Resort"}]
+
+@pytest.mark.asyncio
+async def test_tool_selecting_new_destination_clears_its_data(monkeypatch):
+    """Test get_destinations finding another destination drops the previous one's attractions and hotels."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    destinations = {"phuket": {"id": 1, "name": "Phuket"}, "krabi": {"id": 2, "name": "Krabi"}}
+
+    def handle_mcp(request: httpx.Request) -> httpx.Response:
+        arguments = json.loads(request.content)
+        if request.url.path == "/tool/get_destinations":
+            return httpx.Response(200, json=[destinations[arguments["search_term"]]])
+        return httpx.Response(200, json=[{"id": arguments["destination_id"] * 10, "name": "Beach Resort"}])
+
+    mcp_client = TravelioMCPClient("http://mcp", transport=httpx.MockTransport(handle_mcp))
+    chatbot = TravelioChatbot(mcp_client=mcp_client, function_calling=True)
+
+    await chatbot._call_tool("get_destinations", {"search_term": "phuket"})
+    await chatbot._call_tool("get_attractions", {"destination_id": 1})
+    await chatbot._call_tool("get_hotels", {"destination_id": 1})
+    await chatbot._call_tool("get_destinations", {"search_term": "phuket"})
+    assert chatbot.current_hotels == [{"id": 10, "name": "Beach Resort"}]
+
+    await chatbot._call_tool("get_destinations", {"search_term": "krabi"})
+    await chatbot.close()
+    await mcp_client.close()
+
+    assert chatbot.current_destination == {"id": 2, "name": "Krabi"}
+    assert chatbot.current_attractions is None
+    assert chatbot.current_hotels is None
+
+@pytest.mark.asyncio
+async def test_data_of_new_destination_loaded_first_in_a_round_is_kept(monkeypatch):
+    """Test a destination switch finishing after its own attractions arrived keeps them."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    destinations = {"phuket": {"id": 1, "name": "Phuket"}, "krabi": {"id": 2, "name": "Krabi"}}
+
+    async def handle_mcp(request: httpx.Request) -> httpx.Response:
+        arguments = json.loads(request.content)
+        if request.url.path == "/tool/get_destinations":
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=[destinations[arguments["search_term"]]])
+        destination_id = arguments["destination_id"]
+        return httpx.Response(200, json=[{"id": destination_id * 10, "name": "Sight", "destination_id": destination_id}])
+
+    mcp_client = TravelioMCPClient("http://mcp", transport=httpx.MockTransport(handle_mcp))
+    chatbot = TravelioChatbot(mcp_client=mcp_client, function_calling=True)
+    await chatbot._call_tool("get_destinations", {"search_term": "phuket"})
+    await chatbot._call_tool("get_hotels", {"destination_id": 1})
+
+    # One round of calls, as Gemini's function calls are run
+    await asyncio.gather(
+        chatbot._call_tool("get_destinations", {"search_term": "krabi"}),
+        chatbot._call_tool("get_attractions", {"destination_id": 2})
+    )
+    await chatbot.close()
+    await mcp_client.close()
+
+    assert chatbot.current_destination == {"id": 2, "name": "Krabi"}
+    assert chatbot.current_attractions == [{"id": 20, "name": "Sight", "destination_id": 2}]
+    assert chatbot.current_hotels is None
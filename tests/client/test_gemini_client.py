@@ -0,0 +1,36 @@
+import httpx
+import pytest
+from app.client.gemini_client import GeminiClient
+from tests.stub_llm import create_stub_llm_app
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    app = create_stub_llm_app(base_latency=0, per_token_latency=0, reply_chars=100, chunk_chars=30)
+    client = GeminiClient(
+        api_url="http://stub/v1beta/models/stub:generateContent",
+        transport=httpx.ASGITransport(app=app)
+    )
+    return client
+
+@pytest.mark.asyncio
+async def test_stream_message_yields_chunks_and_records_reply(stub_client):
+    """Test streamed chunks add up to the full reply, which joins the history."""
+    chunks = [chunk async for chunk in stub_client.stream_message("Plan a day in Phuket")]
+    complete = await stub_client.send_message("Plan another day")
+    await stub_client.close()
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    assert "".join(chunks) == complete
+    assert [turn["role"] for turn in stub_client.history.turns] == ["user", "model", "user", "model"]
+    assert stub_client.history.turns[1]["parts"][0]["text"] == complete
+
+@pytest.mark.asyncio
+async def test_stream_stopped_early_keeps_partial_reply(stub_client):
+    """Test a reply the reader stopped early keeps the part that was shown."""
+    stream = stub_client.stream_message("Plan a day in Phuket")
+    first = await anext(stream)
+    await stream.aclose()
+    await stub_client.close()
+
+    assert stub_client.history.turns[-1] == {"role": "model", "parts": [{"text": first}]}
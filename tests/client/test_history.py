@@ -0,0 +1,47 @@
+import httpx
+import pytest
+from app.client.gemini_client import GeminiClient
+from app.client.history import ConversationHistory, estimate_tokens
+from tests.stub_llm import create_stub_llm_app
+
+def test_history_folds_old_turns_into_summary_within_budget():
+    """Test old turns move to a bounded summary and the verbatim turns start with the user."""
+    history = ConversationHistory(max_tokens=100, summary_max_tokens=60)
+    for turn in range(20):
+        history.add("user", f"Question {turn}. " + "x" * 100)
+        history.add("model", f"Answer {turn}. " + "y" * 100)
+
+    assert history._tokens <= 100
+    assert history.turns[0]["role"] == "user"
+    assert history.turns[-1]["parts"][0]["text"].startswith("Answer 19.")
+    assert estimate_tokens(history.summary_text()) <= 60
+    assert history.summary[-1].startswith("- Assistant: Answer")
+
+def test_unbounded_history_keeps_every_turn():
+    """Test without a budget every turn is kept verbatim."""
+    history = ConversationHistory(max_tokens=None)
+    for turn in range(50):
+        history.add("user", "x" * 400)
+
+    assert len(history.turns) == 50
+    assert history.summary_text() == ""
+
+@pytest.mark.asyncio
+async def test_gemini_client_request_size_stays_bounded(monkeypatch):
+    """Test a long session against the stub LLM sends bounded requests with the summary."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    app = create_stub_llm_app(base_latency=0, per_token_latency=0)
+    client = GeminiClient(
+        api_url="http://stub/v1beta/models/stub:generateContent",
+        history_max_tokens=1000,
+        transport=httpx.ASGITransport(app=app)
+    )
+
+    for turn in range(40):
+        reply = await client.send_message(f"Message {turn}: tell me more about Phuket.", {"turn": turn})
+    await client.close()
+
+    sizes = [size for size, _ in app.state.requests]
+    assert reply.startswith("Here is a suggestion")
+    assert max(sizes[20:]) < 2 * sizes[10]
+    assert client.history.summary
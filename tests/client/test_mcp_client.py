@@ -0,0 +1,148 @@
+import json
+import time
+import httpx
+import pytest
+from types import SimpleNamespace
+from app.client.cache import ToolCache
+from app.client.mcp_client import TravelioMCPClient
+from app.mcp import server
+
+def stub_server(failures, failure):
+    """Build a stub MCP server that fails the first calls, then echoes the tool name."""
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if len(requests) <= failures:
+            if isinstance(failure, int):
+                return httpx.Response(failure, headers={"Retry-After": "0"})
+            raise failure("stub failure", request=request)
+        return httpx.Response(200, json={"tool": request.url.path.rsplit("/", 1)[-1]})
+
+    return httpx.MockTransport(handle), requests
+
+def make_client(transport) -> TravelioMCPClient:
+    return TravelioMCPClient("http://stub", transport=transport, backoff_base=0.0, max_retries=2)
+
+@pytest.mark.asyncio
+async def test_idempotent_tool_retries_until_success():
+    """Test read tools are retried on 503 and transport errors, and metrics count the retries."""
+    transport, requests = stub_server(2, 503)
+    client = make_client(transport)
+
+    assert await client.get_destinations() == {"tool": "get_destinations"}
+    assert len(requests) == 3
+
+    summary = client.metrics.summary()["get_destinations"]
+    assert (summary["calls"], summary["errors"], summary["retries"]) == (1, 0, 2)
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded():
+    """Test a read tool gives up after max_retries and records the error."""
+    transport, requests = stub_server(10, httpx.ReadError)
+    client = make_client(transport)
+
+    with pytest.raises(httpx.ReadError):
+        await client.get_itinerary(1)
+    assert len(requests) == 3
+    assert client.metrics.errors["get_itinerary"] == 1
+    await client.close()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure, attempts", [(503, 1), (httpx.ReadError, 1), (httpx.ConnectError, 2)])
+async def test_create_itinerary_only_retried_before_sending(failure, attempts):
+    """Test a write is only retried when the connection failed, as the server never saw it."""
+    transport, requests = stub_server(1, failure)
+    client = make_client(transport)
+
+    if attempts == 1:
+        with pytest.raises(httpx.HTTPError):
+            await client.create_itinerary(1, 2, "2024-01-01")
+    else:
+        assert await client.create_itinerary(1, 2, "2024-01-01") == {"tool": "create_itinerary"}
+    assert len(requests) == attempts
+    await client.close()
+
+def test_backoff_is_jittered_and_honours_retry_after():
+    """Test backoff stays within the exponential bound and waits at least Retry-After."""
+    client = TravelioMCPClient(backoff_base=0.1, backoff_max=1.0)
+
+    delays = [client._backoff(2) for _ in range(100)]
+    assert all(0 <= delay <= 0.4 for delay in delays)
+    assert len(set(delays)) > 1
+    assert client._backoff(0, "0.5") >= 0.5
+    assert client._backoff(0, "60") == 1.0
+
+def versioned_server(versions):
+    """Build a stub MCP server answering conditional calls with the current version in versions[0]."""
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        arguments = json.loads(request.content)
+        requests.append(arguments)
+        if arguments.get("if_none_match") == versions[0]:
+            return httpx.Response(200, json={"version": versions[0], "not_modified": True})
+        return httpx.Response(200, json={"version": versions[0], "data": [{"id": 1, "version": versions[0]}]})
+
+    return httpx.MockTransport(handle), requests
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_results_and_revalidates_stale_ones():
+    """Test fresh hits skip the server and stale entries are revalidated by version."""
+    versions = ["v1"]
+    transport, requests = versioned_server(versions)
+    client = TravelioMCPClient("http://stub", transport=transport, cache_ttl_seconds=60)
+
+    first = await client.get_attractions(1)
+    assert await client.get_attractions(1) == first
+    assert requests == [{"destination_id": 1, "if_none_match": ""}]
+
+    client.cache.ttl_seconds = 0
+    assert await client.get_attractions(1) == first
+    assert requests[-1]["if_none_match"] == "v1"
+
+    versions[0] = "v2"
+    assert await client.get_attractions(1) == [{"id": 1, "version": "v2"}]
+    assert (client.cache.hits, client.cache.revalidations, client.cache.misses) == (1, 1, 2)
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_expired_catalog_result_revalidates_as_not_modified(catalog_db, monkeypatch):
+    """Test a catalog result past the client TTL is revalidated by the server without resending it."""
+    client = TravelioMCPClient("http://localhost", cache_ttl_seconds=300,
+                               transport=httpx.ASGITransport(app=server.asgi_app))
+    hotels = await client.get_hotels(1)
+
+    # Well past the client TTL and the server's ranking TTL
+    later = SimpleNamespace(monotonic=lambda: time.monotonic() + 3600, time=lambda: time.time() + 3600)
+    monkeypatch.setattr("app.client.cache.time", later)
+    monkeypatch.setattr("app.services.catalog_cache.time", later)
+    assert await client.get_hotels(1) == hotels
+    await client.close()
+
+    assert (client.cache.misses, client.cache.revalidations, client.cache.hits) == (1, 1, 0)
+
+@pytest.mark.asyncio
+async def test_cache_is_opt_in_and_skips_writes():
+    """Test without a TTL, or for non-read tools, calls go straight to the server."""
+    transport, requests = versioned_server(["v1"])
+    client = TravelioMCPClient("http://stub", transport=transport)
+
+    await client.get_hotels(1)
+    await client.get_hotels(1)
+    assert client.cache is None
+    assert requests == [{"destination_id": 1}, {"destination_id": 1}]
+    await client.close()
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache keeps at most max_entries, dropping the least recently used."""
+    cache = ToolCache(ttl_seconds=60, max_entries=2)
+    for destination_id in (1, 2):
+        cache.put(cache.key("get_hotels", {"destination_id": destination_id}), "v", destination_id)
+    cache.get(cache.key("get_hotels", {"destination_id": 1}))
+    cache.put(cache.key("get_hotels", {"destination_id": 3}), "v", 3)
+
+    assert len(cache) == 2
+    assert cache.get(cache.key("get_hotels", {"destination_id": 2})) is None
+    assert cache.get(cache.key("get_hotels", {"destination_id": 1}))[2] == 1
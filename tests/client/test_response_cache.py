@@ -0,0 +1,108 @@
+import httpx
+import pytest
+from app.client.gemini_client import GeminiClient
+from app.client.response_cache import ResponseCache, normalize_message
+from tests.stub_llm import create_stub_llm_app
+
+CONTEXT = "destination:\n  name: Phuket"
+
+def test_normalized_messages_share_a_key():
+    """Test case, whitespace and trailing punctuation do not change the key."""
+    assert normalize_message("  What to  SEE in Phuket?? ") == "what to see in phuket"
+    assert ResponseCache.key("system", "What to see in Phuket?", CONTEXT, {}) == \
+        ResponseCache.key("system", "what to see in  phuket", CONTEXT, {})
+
+def test_context_and_parameters_change_the_key():
+    """Test a different context or model misses the cache."""
+    key = ResponseCache.key("system", "What to see?", CONTEXT, {"model": "a"})
+
+    assert key != ResponseCache.key("system", "What to see?", "destination:\n  name: Bali", {"model": "a"})
+    assert key != ResponseCache.key("system", "What to see?", CONTEXT, {"model": "b"})
+    assert key != ResponseCache.key("other", "What to see?", CONTEXT, {"model": "a"})
+
+@pytest.mark.asyncio
+async def test_expired_replies_miss(monkeypatch):
+    """Test replies are served until the TTL passes."""
+    now = [1000.0]
+    monkeypatch.setattr("app.client.response_cache.time.time", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=60)
+    await cache.put("key", "reply")
+
+    assert await cache.get("key") == "reply"
+    now[0] += 61
+    assert await cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate() == 0.5
+
+@pytest.mark.asyncio
+async def test_least_recently_used_reply_is_evicted():
+    """Test the cache keeps at most max_entries replies."""
+    cache = ResponseCache(max_entries=2)
+    await cache.put("a", "1")
+    await cache.put("b", "2")
+    await cache.get("a")
+    await cache.put("c", "3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "1"
+    assert await cache.get("c") == "3"
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_restart(tmp_path):
+    """Test replies persisted to SQLite are served by a new cache."""
+    path = str(tmp_path / "replies.sqlite")
+    cache = ResponseCache(path=path)
+    await cache.put("key", "reply")
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    assert await reopened.get("key") == "reply"
+    reopened.close()
+
+@pytest.mark.asyncio
+async def test_disk_store_trims_oldest_once_over_capacity(tmp_path, monkeypatch):
+    """Test the disk store keeps the newest max_entries replies and replacing one does not trim."""
+    now = [1000.0]
+    monkeypatch.setattr("app.client.response_cache.time.time", lambda: now[0])
+    path = str(tmp_path / "replies.sqlite")
+    cache = ResponseCache(max_entries=2, path=path)
+    for key in ("a", "b", "b"):
+        now[0] += 1
+        await cache.put(key, key)
+    assert cache._rows == 2
+
+    now[0] += 1
+    await cache.put("c", "c")
+    cache.close()
+
+    reopened = ResponseCache(max_entries=2, path=path)
+    assert reopened._rows == 2
+    assert await reopened.get("a") is None
+    assert await reopened.get("b") == "b"
+    assert await reopened.get("c") == "c"
+    reopened.close()
+
+@pytest.mark.asyncio
+async def test_repeated_question_skips_the_llm(monkeypatch):
+    """Test a repeated question is answered from the cache and still joins the history."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    app = create_stub_llm_app(base_latency=0, per_token_latency=0, reply_chars=100)
+    cache = ResponseCache()
+    client = GeminiClient(
+        api_url="http://stub/v1beta/models/stub:generateContent",
+        response_cache=cache,
+        transport=httpx.ASGITransport(app=app)
+    )
+    context = {"destination": {"id": 1, "name": "Phuket"}}
+
+    first = await client.send_message("What should we see?", context)
+    second = await client.send_message("what should we see", context)
+    streamed = [chunk async for chunk in client.stream_message("What should we see?", context)]
+    await client.send_message("What should we see?", {"destination": {"id": 2, "name": "Bali"}})
+    await client.close()
+
+    assert second == first
+    assert streamed == [first]
+    assert len(app.state.requests) == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert [turn["role"] for turn in client.history.turns[-4:]] == ["user", "model", "user", "model"]
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.client.response_cache import ResponseCache
+from app.client.session_service import ChatSessionService, create_session_app
+from tests.stub_llm import create_stub_llm_app
+
+DESTINATIONS = {"phuket": {"id": 1, "name": "Phuket"}, "krabi": {"id": 2, "name": "Krabi"}}
+
+def handle_mcp(request: httpx.Request) -> httpx.Response:
+    tool = request.url.path.rsplit("/", 1)[-1]
+    arguments = json.loads(request.content)
+    if tool == "get_destinations":
+        data = [DESTINATIONS[arguments["search_term"]]]
+    else:
+        data = [{"id": arguments["destination_id"] * 10, "name": tool}]
+    # The service caches catalog reads, which are conditional calls
+    return httpx.Response(200, json={"version": "v1", "data": data})
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("GEMINI_API_URL", "http://stub/v1beta/models/stub:generateContent")
+    llm = create_stub_llm_app(base_latency=0, per_token_latency=0, reply_chars=50)
+
+    def make(**kwargs):
+        service = ChatSessionService(
+            "http://mcp",
+            mcp_transport=httpx.MockTransport(handle_mcp),
+            llm_transport=httpx.ASGITransport(app=llm),
+            **kwargs
+        )
+        service.llm = llm
+        return service
+
+    return make
+
+@pytest.mark.asyncio
+async def test_sessions_keep_separate_state_over_shared_pools(make_service):
+    """Test each session has its own destination and history but shares the clients."""
+    service = make_service()
+    await service.process_command("a", "find phuket (destination)")
+    await service.process_command("b", "find krabi (destination)")
+
+    a, b = service.sessions["a"].chatbot, service.sessions["b"].chatbot
+    assert a.current_destination["name"] == "Phuket"
+    assert b.current_destination["name"] == "Krabi"
+    assert len(a.claude_client.history.turns) == 2
+    assert a.mcp_client is b.mcp_client is service.mcp_client
+    assert a.claude_client.client is b.claude_client.client is service.llm_client
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_evicted_session_is_restored_from_spill_store(make_service, tmp_path):
+    """Test the least recently used session is spilled to disk and resumes where it left off."""
+    service = make_service(max_sessions=1, spill_path=str(tmp_path / "sessions.sqlite"))
+    await service.process_command("a", "find phuket (destination)")
+    await service.process_command("b", "find krabi (destination)")
+
+    assert list(service.sessions) == ["b"]
+    assert service.stats() == {"resident": 1, "spilled": 1, "created": 2, "evicted": 1, "restored": 0}
+
+    await service.process_command("a", "show me attractions")
+    a = service.sessions["a"].chatbot
+    assert a.current_destination["name"] == "Phuket"
+    assert a.current_attractions == [{"id": 10, "name": "get_attractions"}]
+    assert len(a.claude_client.history.turns) == 4
+    assert service.restored == 1
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_close_closes_shared_response_cache(make_service, tmp_path):
+    """Test closing the service closes the disk store of the response cache its sessions share."""
+    cache = ResponseCache(path=str(tmp_path / "replies.sqlite"))
+    service = make_service(response_cache=cache)
+    await service.process_command("a", "What should we pack?")
+    await service.process_command("b", "What should we pack?")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await service.close()
+    assert cache._db is None
+
+@pytest.mark.asyncio
+async def test_evicted_session_without_store_starts_over(make_service):
+    """Test eviction without a spill store drops the session's state."""
+    service = make_service(max_sessions=1)
+    await service.process_command("a", "find phuket (destination)")
+    await service.process_command("b", "find krabi (destination)")
+    await service.process_command("a", "hello")
+
+    assert service.sessions["a"].chatbot.current_destination is None
+    assert service.created == 3
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_busy_sessions_are_not_evicted(make_service):
+    """Test sessions with turns in flight stay resident until their turns finish."""
+    service = make_service(max_sessions=1)
+    replies = await asyncio.gather(*(
+        service.process_command(session_id, "find phuket (destination)") for session_id in ("a", "b", "c", "a")
+    ))
+
+    assert all(replies)
+    assert len(service.sessions) == 1
+    assert service.evicted == 2
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_http_app_streams_replies(make_service):
+    """Test the HTTP endpoints chat, report stats and end sessions."""
+    service = make_service()
+    app = create_session_app(service)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://service") as client:
+        response = await client.post("/sessions/a/messages", json={"message": "find phuket (destination)"})
+        assert response.status_code == 200
+        assert len(response.text) == 50
+        assert (await client.get("/stats")).json()["resident"] == 1
+
+        await client.delete("/sessions/a")
+        assert (await client.get("/stats")).json()["resident"] == 0
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_ending_a_busy_session_closes_it_after_its_turn(make_service, tmp_path):
+    """Test ending a session mid-turn forgets it at once but closes it only once the turn finishes."""
+    service = make_service(spill_path=str(tmp_path / "sessions.sqlite"))
+    turn = service.stream_command("a", "find phuket (destination)")
+    await turn.__anext__()
+    chatbot = service.sessions["a"].chatbot
+    closed = []
+    original_close = chatbot.close
+
+    async def close():
+        closed.append(True)
+        await original_close()
+
+    chatbot.close = close
+    await service.end_session("a")
+    assert "a" not in service.sessions
+    assert not closed
+
+    assert [chunk async for chunk in turn]
+    assert closed == [True]
+    assert "a" not in service.sessions
+    await service.close()
+
+@pytest.mark.asyncio
+async def test_spilled_session_asked_for_twice_at_once_is_restored_once(make_service, tmp_path):
+    """Test concurrent turns of a spilled session share one restored session and its state."""
+    service = make_service(max_sessions=1, spill_path=str(tmp_path / "sessions.sqlite"))
+    await service.process_command("a", "find phuket (destination)")
+    await service.process_command("b", "find krabi (destination)")
+    await asyncio.gather(
+        service.process_command("a", "show me attractions"),
+        service.process_command("a", "hello")
+    )
+
+    a = service.sessions["a"].chatbot
+    assert a.current_destination["name"] == "Phuket"
+    assert len(a.claude_client.history.turns) == 6
+    assert (service.created, service.restored) == (2, 1)
+    await service.end_session("a")
+    await service.end_session("b")
+    assert service.stats()["spilled"] == 0
+    await service.close()
@@ -0,0 +1,67 @@
+import random
+import httpx
+import pytest
+from app.client.gemini_client import GeminiClient
+from tests.stub_llm import create_stub_llm_app, sample_latency
+
+def make_client(app):
+    return GeminiClient(
+        api_url="http://stub/v1beta/models/stub:generateContent",
+        transport=httpx.ASGITransport(app=app)
+    )
+
+@pytest.mark.parametrize("distribution", ["fixed", "uniform", "exponential", "lognormal"])
+def test_sampled_latencies_center_on_mean(distribution):
+    """Test every distribution draws non-negative latencies around the mean."""
+    rng = random.Random(1)
+    samples = sorted(sample_latency(distribution, 0.1, 0.5, rng) for _ in range(2000))
+
+    assert samples[0] >= 0
+    assert 0.05 < samples[len(samples) // 2] < 0.15
+
+def test_unknown_distribution_is_rejected():
+    """Test a misspelled distribution fails at start-up, not on the first call."""
+    with pytest.raises(ValueError):
+        create_stub_llm_app(latency_distribution="normal")
+
+@pytest.mark.asyncio
+async def test_injected_errors_look_like_gemini(monkeypatch):
+    """Test injected errors carry Gemini's error body and Retry-After on 429."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    app = create_stub_llm_app(base_latency=0, per_token_latency=0, error_rate=1.0, error_status=429)
+    client = make_client(app)
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        await client.send_message("Plan a day in Phuket")
+    with pytest.raises(httpx.HTTPStatusError):
+        [chunk async for chunk in client.stream_message("Plan a day in Phuket")]
+    await client.close()
+
+    response = raised.value.response
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["error"]["status"] == "RESOURCE_EXHAUSTED"
+    assert app.state.errors == 2
+    assert app.state.requests == []
+
+@pytest.mark.asyncio
+async def test_error_rate_is_reproducible_with_seed(monkeypatch):
+    """Test the same seed fails the same calls."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+
+    async def outcomes():
+        app = create_stub_llm_app(base_latency=0, per_token_latency=0, error_rate=0.5, seed=7)
+        client = make_client(app)
+        results = []
+        for _ in range(20):
+            try:
+                await client.send_message("Plan a day in Phuket")
+                results.append(True)
+            except httpx.HTTPStatusError:
+                results.append(False)
+        await client.close()
+        return results
+
+    first = await outcomes()
+    assert first == await outcomes()
+    assert True in first and False in first
@@ -0,0 +1,60 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import Destination, Attraction, Hotel
+from app.services.catalog_cache import catalog_cache
+
+SERVICE_MODULES = [
+    "app.services.destination_service",
+    "app.services.attraction_service",
+    "app.services.hotel_service",
+    "app.services.itinerary_service",
+    "app.services.catalog_cache",
+]
+
+
+@pytest_asyncio.fixture
+async def catalog_db(monkeypatch):
+    """In-memory SQLite catalog wired into every service's session factory."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add_all([
+            Destination(id=1, name="Phuket", country="Thailand", latitude=7.95, longitude=98.33, popularity_score=9.2),
+            Destination(id=2, name="Krabi", country="Thailand", latitude=8.08, longitude=98.90, popularity_score=8.7),
+        ])
+        session.add_all([
+            Attraction(id=1, name="Patong Beach", destination_id=1, category="Beach", latitude=7.90, longitude=98.29,
+                       rating=4.3, price_range=1, is_must_visit=True),
+            Attraction(id=2, name="Big Buddha", destination_id=1, category="Temple", latitude=7.83, longitude=98.31,
+                       rating=4.7, price_range=1, is_must_visit=True),
+            Attraction(id=3, name="Phuket Old Town", destination_id=1, category="Cultural", latitude=7.88, longitude=98.39,
+                       rating=4.5, price_range=2, is_must_visit=False),
+            Attraction(id=4, name="Simon Cabaret", destination_id=1, category="Entertainment", latitude=7.89, longitude=98.29,
+                       rating=4.1, price_range=4, is_must_visit=False),
+            Attraction(id=5, name="Railay Beach", destination_id=2, category="Beach", latitude=8.01, longitude=98.84,
+                       rating=4.8, price_range=1, is_must_visit=True),
+        ])
+        session.add_all([
+            Hotel(id=1, name="Patong Resort", destination_id=1, address="1 Beach Road", latitude=7.90, longitude=98.30,
+                  rating=4.2, price_per_night=90.0, has_pool=True),
+            Hotel(id=2, name="Old Town Inn", destination_id=1, address="2 Thalang Road", latitude=7.88, longitude=98.39,
+                  rating=4.6, price_per_night=60.0, has_restaurant=True),
+            Hotel(id=3, name="Railay Lodge", destination_id=2, address="3 Railay", latitude=8.01, longitude=98.84,
+                  rating=4.4, price_per_night=150.0, has_pool=True, has_spa=True),
+        ])
+        await session.commit()
+    
+    for module in SERVICE_MODULES:
+        monkeypatch.setattr(f"{module}.AsyncSessionLocal", session_factory)
+    catalog_cache.invalidate()
+    
+    yield engine
+    
+    catalog_cache.invalidate()
+    await engine.dispose()
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from types import SimpleNamespace
+
+from app.core.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+    run_in_executor,
+    run_with_deadline,
+)
+from app.db.session import apply_statement_timeout
+
+
+def test_nested_scopes_take_the_earlier_deadline():
+    """Test inner scopes are bounded by outer deadlines and cancellation."""
+    with deadline_scope(10.0) as outer:
+        with deadline_scope(60.0) as inner:
+            assert inner.remaining() <= 10.0
+            outer.cancel()
+            with pytest.raises(DeadlineExceeded):
+                check_deadline()
+    
+    assert current_deadline() is None
+    check_deadline()
+
+
+@pytest.mark.asyncio
+async def test_executor_work_stops_after_the_deadline():
+    """Test the caller gives up at the deadline and the thread stops at its next check."""
+    stopped = threading.Event()
+    
+    def stages():
+        while True:
+            time.sleep(0.01)
+            try:
+                check_deadline()
+            except DeadlineExceeded:
+                stopped.set()
+                raise
+    
+    with pytest.raises(DeadlineExceeded):
+        with deadline_scope(0.05):
+            await run_in_executor(stages)
+    
+    assert await asyncio.to_thread(stopped.wait, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_skips_the_call():
+    """Test an expired deadline raises without running the awaitable."""
+    ran = []
+    
+    async def call():
+        ran.append(True)
+    
+    with deadline_scope(0.0):
+        with pytest.raises(DeadlineExceeded):
+            await run_with_deadline(call())
+    
+    assert ran == []
+
+
+def test_statement_timeout_follows_deadline():
+    """Test PostgreSQL transactions get the remaining budget as statement_timeout."""
+    executed = []
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), exec_driver_sql=executed.append)
+    
+    apply_statement_timeout(None, None, connection)
+    with deadline_scope(2.0):
+        apply_statement_timeout(None, None, connection)
+    with deadline_scope(0.0):
+        with pytest.raises(DeadlineExceeded):
+            apply_statement_timeout(None, None, connection)
+    
+    assert len(executed) == 1
+    timeout_ms = int(executed[0].rsplit(" ", 1)[1])
+    assert executed[0].startswith("SET LOCAL statement_timeout = ")
+    assert 1900 <= timeout_ms <= 2000
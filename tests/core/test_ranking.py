@@ -0,0 +1,49 @@
+from app.core.ranking import AttractionRanking
+
+
+def attraction(id, category, rating, must_visit=False):
+    return {"id": id, "category": category, "rating": rating, "is_must_visit": must_visit}
+
+
+def test_top_is_ranked_prefix():
+    """Test attractions are ranked must-visit first, then by rating."""
+    ranking = AttractionRanking([
+        attraction(1, "Beach", 4.9),
+        attraction(2, "Temple", 4.1, must_visit=True),
+        attraction(3, "Beach", 4.5, must_visit=True),
+    ])
+    
+    assert [a["id"] for a in ranking.top(2)] == [3, 2]
+    assert [a["id"] for a in ranking.top(10)] == [3, 2, 1]
+
+
+def test_upsert_and_remove_keep_order():
+    """Test incremental writes move entries without re-sorting."""
+    ranking = AttractionRanking([attraction(1, "Beach", 4.0), attraction(2, "Temple", 4.5)])
+    
+    ranking.upsert(attraction(3, "Museum", 4.2))
+    ranking.upsert(attraction(1, "Beach", 4.8))
+    
+    assert [a["id"] for a in ranking.top(3)] == [1, 2, 3]
+    assert ranking.get(1)["rating"] == 4.8
+    assert ranking.remove(2) is True
+    assert ranking.remove(2) is False
+    assert 2 not in ranking
+    assert len(ranking) == 2
+
+
+def test_top_diverse_round_robins_categories():
+    """Test the diverse variant spreads picks across categories."""
+    ranking = AttractionRanking([
+        attraction(1, "Beach", 4.9),
+        attraction(2, "Beach", 4.8),
+        attraction(3, "Beach", 4.7),
+        attraction(4, "Temple", 4.2),
+        attraction(5, "Museum", 4.0),
+    ])
+    
+    assert [a["id"] for a in ranking.top_diverse(4)] == [1, 4, 5, 2]
+    assert [a["id"] for a in ranking.top_diverse(5, max_per_category=1)] == [1, 4, 5]
+    
+    ranking.remove(4)
+    assert [a["id"] for a in ranking.top_diverse(3)] == [1, 5, 2]
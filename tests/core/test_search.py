@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.search import TrigramIndex, trigrams
+
+DESTINATIONS = [
+    {"id": 1, "name": "Phuket", "country": "Thailand", "popularity_score": 9.2},
+    {"id": 2, "name": "Krabi", "country": "Thailand", "popularity_score": 8.7},
+    {"id": 3, "name": "Paris", "country": "France", "popularity_score": 9.5},
+    {"id": 4, "name": "Phu Quoc", "country": "Vietnam", "popularity_score": 7.9},
+]
+
+
+@pytest.fixture
+def index():
+    return TrigramIndex(DESTINATIONS, fields=("name", "country"), rank_field="popularity_score")
+
+
+def test_trigrams_pad_words():
+    """Test trigrams are built per word with pg_trgm-style padding."""
+    assert trigrams("Ko Tao") == {"  k", " ko", "ko ", "  t", " ta", "tao", "ao "}
+
+
+def test_search_tolerates_typos(index):
+    """Test misspelled names still find the destination."""
+    assert [d["id"] for _, d in index.search("Phukte")][0] == 1
+    assert [d["id"] for _, d in index.search("krabbi")] == [2]
+
+
+def test_search_matches_substrings_of_any_field(index):
+    """Test substring matches on names and countries, like the old ILIKE search."""
+    assert [d["id"] for _, d in index.search("aris")] == [3]
+    assert {d["id"] for _, d in index.search("thai")} == {1, 2}
+
+
+def test_search_ranks_by_similarity_then_popularity(index):
+    """Test equally good matches are ordered by popularity score."""
+    results = index.search("thailand")
+    
+    assert [d["id"] for _, d in results] == [1, 2]
+    assert all(score == 1.0 for score, _ in results)
+
+
+def test_search_without_match(index):
+    """Test unrelated and empty terms return nothing."""
+    assert index.search("zzzz") == []
+    assert index.search("  ") == []
@@ -0,0 +1,30 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.core.serialization import dumps, loads
+
+
+def test_dumps_handles_tool_result_types():
+    """Test dates, times, int keys, numpy scalars and decimals serialize natively."""
+    result = {
+        0: [{"id": np.int64(1), "rating": np.float64(4.5)}],
+        "start_date": date(2023, 8, 1),
+        "start_time": time(9, 30),
+        "updated_at": datetime(2023, 8, 1, 10, 0, 0),
+        "price": Decimal("12.50"),
+    }
+    
+    assert dumps(result) == (
+        b'{"0":[{"id":1,"rating":4.5}],"start_date":"2023-08-01","start_time":"09:30:00",'
+        b'"updated_at":"2023-08-01T10:00:00","price":12.5}'
+    )
+    assert loads(dumps(result))["start_time"] == time(9, 30).isoformat()
+
+
+def test_dumps_rejects_unknown_types():
+    """Test unsupported objects raise TypeError."""
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.core.tracing import JsonLinesExporter, Tracer, tracer
+from app.mcp import server
+
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_and_export_per_root(tmp_path):
+    """Test spans link to their parents and are written when the root finishes."""
+    path = tmp_path / "trace.jsonl"
+    local = Tracer(JsonLinesExporter(str(path)))
+    
+    @local.traced()
+    async def service():
+        with local.span("stage", "cpu"):
+            pass
+    
+    with local.span("tool", "tool", user=1):
+        await service()
+        assert not path.exists()
+    with pytest.raises(ValueError):
+        with local.span("failing", "tool"):
+            raise ValueError("boom")
+    local.exporter.flush()
+    
+    spans = read_spans(path)
+    by_name = {span["name"]: span for span in spans}
+    
+    assert [span["name"] for span in spans] == ["stage", "test_spans_nest_and_export_per_root.<locals>.service", "tool", "failing"]
+    assert by_name["stage"]["parent_id"] == by_name["test_spans_nest_and_export_per_root.<locals>.service"]["span_id"]
+    assert by_name["tool"]["parent_id"] is None
+    assert by_name["tool"]["attributes"] == {"user": 1}
+    assert len({by_name["stage"]["trace_id"], by_name["tool"]["trace_id"]}) == 1
+    assert by_name["failing"]["trace_id"] != by_name["tool"]["trace_id"]
+    assert by_name["failing"]["error"] == "ValueError: boom"
+
+
+@pytest.mark.asyncio
+async def test_interleaved_traces_are_written_together(tmp_path):
+    """Test concurrent requests' spans are grouped per trace in the file."""
+    path = tmp_path / "trace.jsonl"
+    local = Tracer(JsonLinesExporter(str(path)))
+    
+    async def request(name):
+        with local.span(name, "tool"):
+            for _ in range(3):
+                with local.span("step"):
+                    await asyncio.sleep(0)
+    
+    await asyncio.gather(request("a"), request("b"))
+    local.exporter.flush()
+    
+    trace_ids = [span["trace_id"] for span in read_spans(path)]
+    assert len(trace_ids) == 8
+    assert trace_ids == sorted(trace_ids, key=trace_ids.index)
+    assert len(set(trace_ids)) == 2
+
+
+def test_disabled_tracer_is_noop():
+    """Test a tracer without exporter creates no spans."""
+    local = Tracer()
+    
+    with local.span("tool") as span:
+        assert span is None
+    assert local.traced()(lambda: 42)() == 42
+
+
+@pytest.mark.asyncio
+async def test_create_itinerary_timeline(catalog_db, tmp_path, monkeypatch):
+    """Test a tool call is traced down to service methods, SQL statements and CPU stages."""
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracer, "exporter", JsonLinesExporter(str(path)))
+    tracer.attach_sql(catalog_db.sync_engine)
+    
+    with patch.object(server.itinerary_service, "save_itinerary", new=AsyncMock(return_value=1)):
+        await server.create_itinerary(destination_id=1, num_days=2, start_date="2023-08-01")
+    tracer.exporter.flush()
+    
+    spans = read_spans(path)
+    by_id = {span["span_id"]: span for span in spans}
+    
+    def parent_name(span):
+        return by_id[span["parent_id"]]["name"] if span["parent_id"] else None
+    
+    root = [span for span in spans if span["parent_id"] is None]
+    assert [(span["name"], span["kind"]) for span in root] == [("create_itinerary", "tool")]
+    assert {span["trace_id"] for span in spans} == {root[0]["trace_id"]}
+    
+    names = {(span["name"], parent_name(span)) for span in spans}
+    assert ("AttractionService.get_top_attractions", "create_itinerary") in names
+    assert ("AttractionService.get_attractions", "AttractionService.get_top_attractions") in names
+    assert ("sql", "AttractionService.get_attractions") in names
+    assert ("sql", "HotelService.get_hotels_near_point") in names
+    assert ("clustering", "create_itinerary") in names
+    assert ("ItineraryPlanner._create_day_activities", "planning") in names
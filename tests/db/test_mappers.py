@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Destination, Attraction, Hotel
+from app.db.mappers import RowMapper, attraction_mapper, hotel_mapper, destination_mapper
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with a small catalog."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Destination(id=1, name="Phuket", country="Thailand", latitude=7.95, longitude=98.33, popularity_score=9.2))
+        session.add(Attraction(
+            id=1, name="Patong Beach", destination_id=1, category="Beach",
+            latitude=7.90, longitude=98.29, rating=4.3, opening_hours={"monday": {"open": "00:00"}},
+            is_must_visit=True
+        ))
+        session.add(Hotel(
+            id=1, name="Beach Resort", destination_id=1, address="1 Beach Road",
+            latitude=7.89, longitude=98.30, rating=4.5, price_per_night=120.0, amenities=["pool"]
+        ))
+        session.commit()
+        yield session
+
+
+def test_row_mapper_maps_by_position():
+    """Test the generated mapper builds dicts keyed by column name."""
+    mapper = RowMapper(Destination.id, Destination.name)
+    
+    assert mapper.keys == ("id", "name")
+    assert mapper((1, "Phuket")) == {"id": 1, "name": "Phuket"}
+    assert mapper.map_all([(1, "Phuket"), (2, "Krabi")])[1] == {"id": 2, "name": "Krabi"}
+
+
+@pytest.mark.parametrize("mapper, model", [
+    (destination_mapper, Destination),
+    (attraction_mapper, Attraction),
+    (hotel_mapper, Hotel),
+])
+def test_mapper_matches_orm_attributes(session, mapper, model):
+    """Test mapped rows carry the same values as the hydrated ORM instances."""
+    row = session.execute(mapper.select()).first()
+    instance = session.execute(select(model)).scalars().first()
+    
+    mapped = mapper(row)
+    
+    assert mapped == {key: getattr(instance, key) for key in mapper.keys}
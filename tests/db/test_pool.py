@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import TimedAsyncQueuePool, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_timed_pool_reports_usage_and_waits(tmp_path):
+    """Test the pool reports checked-out connections and checkout wait time."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=TimedAsyncQueuePool, pool_size=2)
+    
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+        assert stats["overflow"] == 0
+    
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts_total"] == 1
+    assert stats["wait_seconds_total"] >= 0
+    
+    await engine.dispose()
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+from app.services.attraction_service import AttractionService
+from app.services.hotel_service import HotelService
+from app.services.itinerary_service import ItineraryService
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def migrated_engine(tmp_path, monkeypatch):
+    """SQLite database upgraded to head through the Alembic migrations."""
+    url = f"sqlite:///{tmp_path / 'travel.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    command.upgrade(config, "head")
+    
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+def explain(engine, statement, **params) -> str:
+    """Return SQLite's query plan for a statement as a single string."""
+    compiled = statement.params(**params).compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_match_models(migrated_engine):
+    """Test the migrated schema, indexes included, matches the model metadata."""
+    with migrated_engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    
+    assert diff == []
+
+
+@pytest.mark.parametrize("build, params, index", [
+    (AttractionService._build_attractions_query, {"destination_id": 1}, "ix_attraction_destination_must_visit_rating"),
+    (HotelService._build_hotels_query, {"destination_id": 1}, "ix_hotel_destination_rating"),
+    (ItineraryService._build_itinerary_query, {"itinerary_id": 1}, "ix_itineraryday_itinerary_id"),
+    (ItineraryService._build_itinerary_query, {"itinerary_id": 1}, "ix_itineraryactivity_day_id"),
+])
+def test_service_queries_use_indexes(migrated_engine, build, params, index):
+    """Test each service query shape is planned through its composite index."""
+    plan = explain(migrated_engine, build(()), **params)
+    
+    assert index in plan, plan
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.statements import StatementRegistry, CompileCacheStats
+
+
+def test_registry_builds_once_per_shape():
+    """Test a statement is built on the first lookup and reused afterwards."""
+    registry = StatementRegistry()
+    built = []
+    
+    def build(shape):
+        built.append(shape)
+        return text("SELECT 1")
+    
+    first = registry.get("q", ("a",), build)
+    second = registry.get("q", ("a",), build)
+    registry.get("q", ("a", "b"), build)
+    
+    assert first is second
+    assert built == [("a",), ("a", "b")]
+    assert registry.stats() == {"statements": 2, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+
+def test_compile_cache_stats_counts_hits():
+    """Test the engine listener records compiled-cache hits on re-execution."""
+    engine = create_engine("sqlite://")
+    stats = CompileCacheStats()
+    stats.attach(engine)
+    statement = StatementRegistry().get("one", (), lambda shape: text("SELECT :value").bindparams(value=1))
+    
+    with engine.connect() as conn:
+        for value in range(3):
+            conn.execute(statement, {"value": value})
+    
+    assert stats.misses == 1
+    assert stats.hits == 2
+    assert stats.stats()["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_statement_built_by_another_thread_counts_as_hit():
+    """Test a lookup waiting while another thread builds the statement is not counted as a miss."""
+    registry = StatementRegistry()
+    statement = text("SELECT 1")
+    waiting = []
+    
+    def build(shape):
+        other = threading.Thread(target=lambda: waiting.append(registry.get("q", shape, build)))
+        other.start()
+        # Let the other lookup miss the dictionary and block on the lock
+        time.sleep(0.05)
+        waiting.append(other)
+        return statement
+    
+    assert registry.get("q", (), build) is statement
+    waiting[0].join()
+    
+    assert waiting[1] is statement
+    assert (registry.misses, registry.hits) == (1, 1)
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.models import Attraction
+from app.db.statements import statement_registry
+from app.services.attraction_service import AttractionService
+from app.services.catalog_cache import catalog_cache
+
+
+@pytest.mark.asyncio
+async def test_attraction_filters_use_bound_shapes(catalog_db):
+    """Test filtered attraction queries with parameters bound per call."""
+    service = AttractionService()
+    
+    beaches = await service.get_attractions(1, {"category": "Beach"})
+    cheap = await service.get_attractions(1, {"category": ["Beach", "Temple", "Cultural"], "max_price_range": 1})
+    must_visit = await service.get_attractions(1, {"must_visit": True})
+    top = await service.get_top_attractions(1, limit=2)
+    
+    assert [a["name"] for a in beaches] == ["Patong Beach"]
+    assert [a["name"] for a in cheap] == ["Big Buddha", "Patong Beach"]
+    assert {a["id"] for a in must_visit} == {1, 2}
+    assert [a["id"] for a in top] == [2, 1]
+    assert ("attractions", ("category", "max_price_range")) in dict(statement_registry.items())
+
+
+@pytest.mark.asyncio
+async def test_top_attractions_follow_committed_writes(catalog_db):
+    """Test the materialized ranking is updated in place by committed writes."""
+    service = AttractionService()
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    
+    assert [a["id"] for a in await service.get_top_attractions(1, limit=3)] == [2, 1, 3]
+    
+    async with session_factory() as session:
+        session.add(Attraction(id=6, name="Promthep Cape", destination_id=1, category="Viewpoint",
+                               latitude=7.76, longitude=98.30, rating=4.9, is_must_visit=True))
+        old_town = await session.get(Attraction, 3)
+        old_town.is_must_visit = True
+        await session.delete(await session.get(Attraction, 1))
+        await session.commit()
+    
+    async with session_factory() as session:
+        await session.delete(await session.get(Attraction, 2))
+        await session.rollback()
+    
+    assert catalog_cache.get_ranking(1) is not None
+    assert [a["id"] for a in await service.get_top_attractions(1, limit=3)] == [6, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_diverse_top_attractions(catalog_db):
+    """Test the diverse variant takes one attraction per category before repeating."""
+    service = AttractionService()
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(Attraction(id=6, name="Wat Chalong", destination_id=1, category="Temple",
+                               latitude=7.84, longitude=98.34, rating=4.6, is_must_visit=True))
+        await session.commit()
+    
+    top = await service.get_top_attractions(1, limit=3)
+    diverse = await service.get_top_attractions(1, limit=3, diverse=True)
+    
+    assert [a["id"] for a in top] == [2, 6, 1]
+    assert [a["id"] for a in diverse] == [2, 1, 3]
+    
+    diverse[0]["name"] = "changed"
+    assert (await service.get_top_attractions(1, limit=1))[0]["name"] == "Big Buddha"
+
+
+@pytest.mark.asyncio
+async def test_moved_attraction_leaves_old_destination_ranking(catalog_db):
+    """Test changing an attraction's destination updates the rankings of both destinations."""
+    service = AttractionService()
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    
+    assert [a["id"] for a in await service.get_top_attractions(1, limit=5)] == [2, 1, 3, 4]
+    assert [a["id"] for a in await service.get_top_attractions(2, limit=5)] == [5]
+    
+    async with session_factory() as session:
+        big_buddha = await session.get(Attraction, 2)
+        big_buddha.destination_id = 2
+        await session.commit()
+    
+    assert [a["id"] for a in await service.get_top_attractions(1, limit=5)] == [1, 3, 4]
+    assert [a["id"] for a in await service.get_top_attractions(2, limit=5)] == [5, 2]
+
+
+@pytest.mark.asyncio
+async def test_cached_attractions_are_not_shared_with_callers(catalog_db):
+    """Test changing a returned attraction's nested values leaves the cached ranking intact."""
+    service = AttractionService()
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    async with session_factory() as session:
+        (await session.get(Attraction, 2)).opening_hours = {"monday": {"open": "08:00", "close": "17:00"}}
+        await session.commit()
+    
+    top = await service.get_top_attractions(1, limit=1)
+    top[0]["opening_hours"]["monday"]["open"] = "00:00"
+    by_id = await service.get_attractions_by_ids([2], destination_id=1)
+    by_id[0]["opening_hours"].clear()
+    
+    assert (await service.get_top_attractions(1, limit=1))[0]["opening_hours"] == {
+        "monday": {"open": "08:00", "close": "17:00"}
+    }
@@ -1,6 +1,9 @@
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.search import TrigramIndex
+from app.db.models import Destination
 from app.services.destination_service import DestinationService
 
 @pytest.mark.asyncio
@@ -8,36 +11,18 @@ async def test_get_destinations():
     """Test getting all destinations."""
     # Mock the database session
     mock_session = MagicMock(spec=AsyncSession)
+    mock_session.__aenter__.return_value = mock_session
     mock_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_result.scalars.return_value = mock_scalars
     
-    # Mock destination objects
-    mock_dest1 = MagicMock()
-    mock_dest1.id = 1
-    mock_dest1.name = "Paris"
-    mock_dest1.country = "France"
-    mock_dest1.description = "City of Lights"
-    mock_dest1.latitude = 48.8566
-    mock_dest1.longitude = 2.3522
-    mock_dest1.image_url = "paris.jpg"
-    mock_dest1.popularity_score = 9.5
-    
-    mock_dest2 = MagicMock()
-    mock_dest2.id = 2
-    mock_dest2.name = "London"
-    mock_dest2.country = "UK"
-    mock_dest2.description = "Big Ben and more"
-    mock_dest2.latitude = 51.5074
-    mock_dest2.longitude = -0.1278
-    mock_dest2.image_url = "london.jpg"
-    mock_dest2.popularity_score = 9.0
-    
-    mock_scalars.all.return_value = [mock_dest1, mock_dest2]
+    # Mock destination rows (columns in mapper order)
+    mock_result.all.return_value = [
+        (1, "Paris", "France", "City of Lights", 48.8566, 2.3522, "paris.jpg", 9.5),
+        (2, "London", "UK", "Big Ben and more", 51.5074, -0.1278, "london.jpg", 9.0),
+    ]
     mock_session.execute.return_value = mock_result
     
-    # Mock the get_db function
-    with patch('app.services.destination_service.get_db', return_value=iter([mock_session])):
+    # Mock the session factory
+    with patch('app.services.destination_service.AsyncSessionLocal', return_value=mock_session):
         # Call the service method
         service = DestinationService()
         destinations = await service.get_destinations()
@@ -54,26 +39,18 @@ async def test_get_destination():
     """Test getting a single destination by ID."""
     # Mock the database session
     mock_session = MagicMock(spec=AsyncSession)
+    mock_session.__aenter__.return_value = mock_session
     mock_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_result.scalars.return_value = mock_scalars
     
-    # Mock destination object
-    mock_dest = MagicMock()
-    mock_dest.id = 1
-    mock_dest.name = "Paris"
-    mock_dest.country = "France"
-    mock_dest.description = "City of Lights"
-    mock_dest.latitude = 48.8566
-    mock_dest.longitude = 2.3522
-    mock_dest.image_url = "paris.jpg"
-    mock_dest.popularity_score = 9.5
+    # Mock destination row (columns in mapper order)
+    mock_result.first.return_value = (
+        1, "Paris", "France", "City of Lights", 48.8566, 2.3522, "paris.jpg", 9.5
+    )
     
-    mock_scalars.first.return_value = mock_dest
     mock_session.execute.return_value = mock_result
     
-    # Mock the get_db function
-    with patch('app.services.destination_service.get_db', return_value=iter([mock_session])):
+    # Mock the session factory
+    with patch('app.services.destination_service.AsyncSessionLocal', return_value=mock_session):
         # Call the service method
         service = DestinationService()
         destination = await service.get_destination(1)
@@ -89,19 +66,73 @@ async def test_get_destination_not_found():
     """Test getting a non-existent destination by ID."""
     # Mock the database session
     mock_session = MagicMock(spec=AsyncSession)
+    mock_session.__aenter__.return_value = mock_session
     mock_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_result.scalars.return_value = mock_scalars
     
     # Mock empty result
-    mock_scalars.first.return_value = None
+    mock_result.first.return_value = None
     mock_session.execute.return_value = mock_result
     
-    # Mock the get_db function
-    with patch('app.services.destination_service.get_db', return_value=iter([mock_session])):
+    # Mock the session factory
+    with patch('app.services.destination_service.AsyncSessionLocal', return_value=mock_session):
         # Call the service method
         service = DestinationService()
         
         # Assert it raises ValueError
         with pytest.raises(ValueError, match=r"Destination with ID 999 not found"):
             await service.get_destination(999)
+
+@pytest.mark.asyncio
+async def test_search_destinations_uses_trigram_index(catalog_db):
+    """Test searching destinations with a typo through the search index."""
+    service = DestinationService()
+    
+    destinations = await service.get_destinations("Krabbi")
+    
+    assert [d["name"] for d in destinations] == ["Krabi"]
+    assert service._search_index is not None
+    
+    # Country matches are ranked by popularity score
+    destinations = await service.get_destinations("thailand")
+    assert [d["name"] for d in destinations] == ["Phuket", "Krabi"]
+
+@pytest.mark.asyncio
+async def test_committed_destination_is_searchable_immediately(catalog_db):
+    """Test committing a new destination drops the search index, so the next search finds it."""
+    service = DestinationService()
+    assert await service.get_destinations("Bali") == []
+    
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(Destination(id=3, name="Bali", country="Indonesia", latitude=-8.34, longitude=115.09,
+                                popularity_score=9.4))
+        await session.commit()
+    
+    assert service._search_index is None
+    assert [d["name"] for d in await service.get_destinations("Bali")] == ["Bali"]
+
+@pytest.mark.asyncio
+async def test_rebuild_overtaken_by_a_commit_is_not_kept(catalog_db, monkeypatch):
+    """Test a destination committed while the search index is rebuilt leaves it to be rebuilt again."""
+    service = DestinationService()
+    session_factory = async_sessionmaker(catalog_db, expire_on_commit=False)
+    build = TrigramIndex
+    
+    def build_during_commit(destinations, **kwargs):
+        # The commit lands after the rebuild has read the destinations
+        async def commit():
+            async with session_factory() as session:
+                session.add(Destination(id=3, name="Bali", country="Indonesia", latitude=-8.34, longitude=115.09,
+                                        popularity_score=9.4))
+                await session.commit()
+        
+        asyncio.run_coroutine_threadsafe(commit(), loop).result()
+        return build(destinations, **kwargs)
+    
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr("app.services.destination_service.TrigramIndex", build_during_commit)
+    assert await service.get_destinations("Bali") == []
+    assert service._search_index is None
+    
+    monkeypatch.setattr("app.services.destination_service.TrigramIndex", build)
+    assert [d["name"] for d in await service.get_destinations("Bali")] == ["Bali"]
@@ -0,0 +1,18 @@
+import pytest
+
+from app.services.hotel_service import HotelService
+
+
+@pytest.mark.asyncio
+async def test_hotel_filters_use_bound_shapes(catalog_db):
+    """Test filtered hotel queries and the shared near-point statement."""
+    service = HotelService()
+    
+    with_pool = await service.get_hotels(1, {"has_pool": True, "has_spa": False})
+    rated = await service.get_hotels(1, {"min_rating": 4.5, "max_price": 100})
+    nearby = await service.get_hotels_near_point(1, 7.90, 98.30, max_distance_km=2.0)
+    
+    assert [h["name"] for h in with_pool] == ["Patong Resort"]
+    assert [h["name"] for h in rated] == ["Old Town Inn"]
+    assert [h["id"] for h in nearby] == [1]
+    assert nearby[0]["distance_km"] < 1.0
@@ -0,0 +1,229 @@
+"""
+Local stand-in for the Gemini generateContent endpoint, for tests and benchmarks.
+
+Answers with a fixed-length reply after a delay that grows with the prompt's
+estimated tokens, like a real model's prefill, plus a delay per generated
+chunk. The base delay can be drawn from a distribution, generation can run at
+a fixed token throughput, and a share of calls can fail with Gemini's error
+responses. When a request declares tools, the stub can answer with scripted
+rounds of function calls before replying. The streaming endpoint sends each
+chunk as a server-sent event as soon as it is "generated". Records the size
+of every request. Used to benchmark and load test the chatbot without calling
+Gemini.
+
+Usage:
+  python -m tests.stub_llm [--port 8090] [--base-latency 0.05] [--per-token-latency 0.00005]
+                           [--chunk-delay 0.02] [--latency-distribution lognormal]
+                           [--latency-spread 0.5] [--tokens-per-second 200]
+                           [--error-rate 0.01] [--error-status 503] [--function-calls ROUNDS]
+
+where ROUNDS is a JSON list of rounds, each a list of calls, for example
+  '[[{"name": "get_hotels", "args": {"destination_id": 1}}]]'
+
+Then point the client at it with
+  GEMINI_API_URL=http://127.0.0.1:8090/v1beta/models/stub:generateContent
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.client.history import estimate_tokens
+
+REPLY_SENTENCE = "Here is a suggestion for your trip based on the places we discussed. "
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+ERROR_STATUSES = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+
+def sample_latency(distribution: str, mean: float, spread: float, rng: random.Random) -> float:
+    """
+    Draw a latency from a distribution.
+    
+    Args:
+        distribution: One of ``LATENCY_DISTRIBUTIONS``
+        mean: Fixed value, uniform midpoint, exponential mean or lognormal median
+        spread: Uniform half-width as a share of ``mean``, or lognormal sigma
+        rng: Random source
+        
+    Returns:
+        Latency in seconds, never negative
+    """
+    if distribution == "fixed" or mean <= 0:
+        return max(mean, 0.0)
+    if distribution == "uniform":
+        return max(rng.uniform(mean * (1 - spread), mean * (1 + spread)), 0.0)
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean)
+    if distribution == "lognormal":
+        return mean * rng.lognormvariate(0, spread)
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def create_stub_llm_app(
+    base_latency: float = 0.05,
+    per_token_latency: float = 0.00005,
+    reply_chars: int = 600,
+    chunk_chars: int = 40,
+    chunk_delay: float = 0.0,
+    latency_distribution: str = "fixed",
+    latency_spread: float = 0.5,
+    tokens_per_second: Optional[float] = None,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    function_calls: Optional[List[List[Dict]]] = None,
+    seed: Optional[int] = None
+) -> FastAPI:
+    """
+    Create the stub LLM application.
+    
+    ``app.state.requests`` collects (request bytes, estimated prompt tokens)
+    of every call; ``app.state.errors`` counts injected errors.
+    
+    Args:
+        base_latency: Seconds every call takes, or the center of its distribution
+        per_token_latency: Additional seconds per prompt token
+        reply_chars: Length of every reply
+        chunk_chars: Length of each generated chunk
+        chunk_delay: Seconds to generate each chunk
+        latency_distribution: Distribution of the base latency, one of ``LATENCY_DISTRIBUTIONS``
+        latency_spread: Spread of the distribution, see ``sample_latency``
+        tokens_per_second: Generation throughput; overrides ``chunk_delay`` if set
+        error_rate: Share of calls failing with ``error_status``
+        error_status: HTTP status of injected errors, e.g. 429 or 503
+        function_calls: Rounds of function calls ({"name", "args"}) made when a
+            request declares tools; round n is made once n rounds were answered
+        seed: Seed of the latency and error draws, for reproducible runs
+        
+    Returns:
+        FastAPI application serving ``generateContent`` and ``streamGenerateContent``
+    """
+    if latency_distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+    if error_status not in ERROR_STATUSES:
+        raise ValueError(f"Unsupported error status: {error_status}")
+    
+    app = FastAPI()
+    app.state.requests: List[Tuple[int, int]] = []
+    app.state.errors = 0
+    rng = random.Random(seed)
+    reply = (REPLY_SENTENCE * (reply_chars // len(REPLY_SENTENCE) + 1))[:reply_chars]
+    chunks = [reply[i:i + chunk_chars] for i in range(0, len(reply), chunk_chars)]
+    if tokens_per_second:
+        chunk_delays = [estimate_tokens(chunk) / tokens_per_second for chunk in chunks]
+    else:
+        chunk_delays = [chunk_delay] * len(chunks)
+    
+    async def prefill(request: Request) -> Tuple[int, Dict]:
+        """Record the request and wait as long as reading its prompt would take."""
+        body = await request.body()
+        payload = json.loads(body)
+        tokens = sum(
+            estimate_tokens(part["text"] if "text" in part else json.dumps(part))
+            for content in payload.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        app.state.requests.append((len(body), tokens))
+        latency = sample_latency(latency_distribution, base_latency, latency_spread, rng)
+        await asyncio.sleep(latency + per_token_latency * tokens)
+        return tokens, payload
+    
+    def planned_calls(payload: Dict) -> List[Dict]:
+        """Get the function calls to answer with, if the request offers tools."""
+        if not function_calls or "tools" not in payload:
+            return []
+        if payload.get("toolConfig", {}).get("functionCallingConfig", {}).get("mode") == "NONE":
+            return []
+        answered = sum(
+            1 for content in payload.get("contents", [])
+            if any("functionResponse" in part for part in content.get("parts", []))
+        )
+        return function_calls[answered] if answered < len(function_calls) else []
+    
+    def injected_error() -> Optional[JSONResponse]:
+        """Fail a share of calls the way Gemini does, before any work."""
+        if error_rate <= 0 or rng.random() >= error_rate:
+            return None
+        app.state.errors += 1
+        headers = {"Retry-After": "1"} if error_status == 429 else None
+        return JSONResponse(
+            {"error": {"code": error_status, "message": "Injected by the stub LLM", "status": ERROR_STATUSES[error_status]}},
+            status_code=error_status,
+            headers=headers
+        )
+    
+    def response(text: str, tokens: int) -> dict:
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+            "usageMetadata": {"promptTokenCount": tokens, "candidatesTokenCount": estimate_tokens(text)},
+        }
+    
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        error = injected_error()
+        if error is not None:
+            return error
+        tokens, payload = await prefill(request)
+        calls = planned_calls(payload)
+        if calls:
+            return {"candidates": [{"content": {"role": "model", "parts": [{"functionCall": call} for call in calls]}}]}
+        await asyncio.sleep(sum(chunk_delays))
+        return response(reply, tokens)
+    
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def stream_generate_content(model: str, request: Request):
+        error = injected_error()
+        if error is not None:
+            return error
+        tokens, _ = await prefill(request)
+        
+        async def events():
+            for chunk, delay in zip(chunks, chunk_delays):
+                await asyncio.sleep(delay)
+                yield f"data: {json.dumps(response(chunk, tokens))}\r\n\r\n"
+        
+        return StreamingResponse(events(), media_type="text/event-stream")
+    
+    return app
+
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--per-token-latency", type=float, default=0.00005)
+    parser.add_argument("--reply-chars", type=int, default=600)
+    parser.add_argument("--chunk-chars", type=int, default=40)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, choices=sorted(ERROR_STATUSES), default=503)
+    parser.add_argument("--function-calls", type=json.loads, help="JSON list of rounds of function calls")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    
+    app = create_stub_llm_app(
+        args.base_latency, args.per_token_latency, args.reply_chars, args.chunk_chars, args.chunk_delay,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        function_calls=args.function_calls,
+        seed=args.seed
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
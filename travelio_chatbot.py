@@ -8,6 +8,8 @@ Usage:
 Environment variables:
   CLAUDE_API_KEY - Your Anthropic Claude API key
   MCP_SERVER_URL - URL of the MCP server (default: http://localhost:8000)
+  LLM_CACHE_PATH - Optional SQLite file caching replies to repeated questions
+  CHATBOT_FUNCTION_CALLING - Set to "true" to let Gemini call the MCP tools itself
 """
 
 import asyncio
@@ -15,6 +17,7 @@ import os
 import sys
 from dotenv import load_dotenv
 from app.client.chatbot import TravelioChatbot
+from app.client.response_cache import ResponseCache
 
 # Load environment variables
 load_dotenv()
@@ -31,7 +34,13 @@ async def main():
     
     # Initialize chatbot
     print("Initializing Travelio Chatbot...")
-    chatbot = TravelioChatbot(mcp_server_url)
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    response_cache = ResponseCache(path=cache_path) if cache_path else None
+    chatbot = TravelioChatbot(
+        mcp_server_url,
+        response_cache,
+        function_calling=os.getenv("CHATBOT_FUNCTION_CALLING", "").lower() in ("1", "true", "yes")
+    )
     
     try:
         # Welcome message
@@ -45,22 +54,24 @@ async def main():
         
         # Main conversation loop
         while True:
-            # Get user input
-            user_input = input("\nYou: ").strip()
+            # Get user input off the event loop, so prefetches keep running while the user types
+            user_input = (await asyncio.to_thread(input, "\nYou: ")).strip()
             
             # Check exit commands
             if user_input.lower() in ["/quit", "/exit"]:
                 break
             
-            # Process the input
-            response = await chatbot.process_command(user_input)
-            
-            # Print the response
-            print(f"\nTravelio: {response}")
+            # Process the input, printing the response as it is generated
+            print("\nTravelio: ", end="", flush=True)
+            async for chunk in chatbot.stream_command(user_input):
+                print(chunk, end="", flush=True)
+            print()
             
     finally:
         # Clean up
         await chatbot.close()
+        if response_cache is not None:
+            response_cache.close()
         print("\nThank you for using Travelio Chatbot. Goodbye!")
 
 if __name__ == "__main__":